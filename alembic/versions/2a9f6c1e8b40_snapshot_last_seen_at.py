@@ -0,0 +1,33 @@
+"""snapshot last_seen_at
+
+Revision ID: 2a9f6c1e8b40
+Revises: d4f7b9e0a3c5
+Create Date: 2026-10-19 13:25:09.417662
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2a9f6c1e8b40'
+down_revision: Union[str, Sequence[str], None] = 'd4f7b9e0a3c5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # unchanged snapshots are no longer appended to the history - the latest row records when it was last observed
+    for table in ('post_latest', 'comment_latest'):
+        op.add_column(table, sa.Column('last_seen_at', sa.DateTime(), nullable=True))
+        op.execute(f"UPDATE {table} SET last_seen_at = measured_at")
+        op.alter_column(table, 'last_seen_at', nullable=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('comment_latest', 'last_seen_at')
+    op.drop_column('post_latest', 'last_seen_at')
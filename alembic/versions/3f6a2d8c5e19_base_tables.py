@@ -0,0 +1,129 @@
+"""base tables
+
+Revision ID: 3f6a2d8c5e19
+Revises: 43e19e5d74de
+Create Date: 2026-10-19 18:02:27.415093
+
+The initial revisions are empty - databases stamped at them got their tables from
+schema_manager.py before alembic managed the schema. This revision creates the tables
+(and the indexes of the small tables) only where they are missing, so a fresh database
+reaches head through alembic alone and existing ones are left as they are. The indexes
+of the large tables are built concurrently in d4f7b9e0a3c5.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f6a2d8c5e19'
+down_revision: Union[str, Sequence[str], None] = '43e19e5d74de'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# schema_manager.py index=True columns of the small tables (default ix_<table>_<column> names)
+INDEXES = [
+    ('ix_users_username', 'users', ['username'], True),
+    ('ix_users_email', 'users', ['email'], True),
+    ('ix_average_daily_sentiment_date', 'average_daily_sentiment', ['date'], False),
+    ('ix_average_daily_sentiment_subreddit_id', 'average_daily_sentiment', ['subreddit_id'], False),
+    ('ix_average_daily_sentiment_calculated_at', 'average_daily_sentiment', ['calculated_at'], False),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'users',
+        sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column('username', sa.String(length=100), nullable=False),
+        sa.Column('email', sa.String(length=300), nullable=False),
+        sa.Column('hashed_password', sa.String(length=255), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        if_not_exists=True,
+    )
+    op.create_table(
+        'subreddits',
+        sa.Column('id', sa.String(), primary_key=True),
+        sa.Column('name', sa.String(), nullable=False, unique=True),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('subscriber_count', sa.Integer(), nullable=True),
+        sa.Column('created_utc', sa.DateTime(), nullable=False),
+        sa.Column('fetched_at', sa.DateTime(), nullable=False),
+        if_not_exists=True,
+    )
+    op.create_table(
+        'posts',
+        sa.Column('id', sa.String(), primary_key=True),
+        sa.Column('subreddit_id', sa.String(), sa.ForeignKey('subreddits.id'), nullable=False),
+        sa.Column('author', sa.String()),
+        sa.Column('post_type', sa.String(), nullable=False),
+        sa.Column('title', sa.String(length=500), nullable=False),
+        sa.Column('selftext', sa.Text()),
+        sa.Column('url', sa.String()),
+        sa.Column('flair', sa.String()),
+        sa.Column('created_utc', sa.DateTime(), nullable=False),
+        sa.Column('fetched_at', sa.DateTime(), nullable=False),
+        if_not_exists=True,
+    )
+    op.create_table(
+        'post_sentiment_history',
+        sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column('post_id', sa.String(), sa.ForeignKey('posts.id'), nullable=False),
+        sa.Column('title_sentiment', postgresql.JSONB()),
+        sa.Column('body_sentiment', postgresql.JSONB()),
+        sa.Column('score', sa.Integer()),
+        sa.Column('upvote_ratio', sa.Float()),
+        sa.Column('controversiality', sa.Float()),
+        sa.Column('num_comments', sa.Integer()),
+        sa.Column('measured_at', sa.DateTime(), nullable=False),
+        if_not_exists=True,
+    )
+    op.create_table(
+        'comments',
+        sa.Column('id', sa.String(), primary_key=True),
+        sa.Column('post_id', sa.String(), sa.ForeignKey('posts.id'), nullable=False),
+        sa.Column('parent_comment_id', sa.String(), sa.ForeignKey('comments.id'), nullable=True),
+        sa.Column('depth', sa.Integer()),
+        sa.Column('author', sa.String()),
+        sa.Column('text', sa.Text()),
+        sa.Column('score', sa.Integer()),
+        sa.Column('created_utc', sa.DateTime(), nullable=False),
+        sa.Column('fetched_at', sa.DateTime(), nullable=False),
+        if_not_exists=True,
+    )
+    op.create_table(
+        'comment_sentiment_history',
+        sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column('comment_id', sa.String(), sa.ForeignKey('comments.id'), nullable=False),
+        sa.Column('comment_sentiment', postgresql.JSONB()),
+        sa.Column('score', sa.Integer()),
+        sa.Column('measured_at', sa.DateTime(), nullable=False),
+        if_not_exists=True,
+    )
+    op.create_table(
+        'average_daily_sentiment',
+        sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column('date', sa.DateTime(), nullable=False),
+        sa.Column('subreddit_id', sa.String(), sa.ForeignKey('subreddits.id'), nullable=False),
+        sa.Column('average_post_sentiment', sa.Float()),
+        sa.Column('average_comment_sentiment', sa.Float()),
+        sa.Column('overall_sentiment', sa.Float()),
+        sa.Column('post_count', sa.Integer()),
+        sa.Column('comment_count', sa.Integer()),
+        sa.Column('calculated_at', sa.DateTime(), nullable=False),
+        if_not_exists=True,
+    )
+
+    for name, table, columns, unique in INDEXES:
+        op.create_index(name, table, columns, unique=unique, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # no-op: the tables may predate this revision - dropping them here would drop the collected data
+    pass
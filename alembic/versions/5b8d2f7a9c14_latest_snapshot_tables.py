@@ -0,0 +1,86 @@
+"""latest snapshot tables
+
+Revision ID: 5b8d2f7a9c14
+Revises: 3f6a2d8c5e19
+Create Date: 2026-10-19 10:12:41.208311
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b8d2f7a9c14'
+down_revision: Union[str, Sequence[str], None] = '3f6a2d8c5e19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'post_latest',
+        sa.Column('post_id', sa.String(), sa.ForeignKey('posts.id'), primary_key=True),
+        sa.Column('subreddit_id', sa.String(), sa.ForeignKey('subreddits.id'), nullable=False),
+        sa.Column('title_sentiment', postgresql.JSONB()),
+        sa.Column('body_sentiment', postgresql.JSONB()),
+        sa.Column('score', sa.Integer(), nullable=False),
+        sa.Column('upvote_ratio', sa.Float()),
+        sa.Column('controversiality', sa.Float()),
+        sa.Column('num_comments', sa.Integer()),
+        sa.Column('created_utc', sa.DateTime(), nullable=False),
+        sa.Column('measured_at', sa.DateTime(), nullable=False),
+    )
+    op.create_table(
+        'comment_latest',
+        sa.Column('comment_id', sa.String(), sa.ForeignKey('comments.id'), primary_key=True),
+        sa.Column('post_id', sa.String(), sa.ForeignKey('posts.id'), nullable=False),
+        sa.Column('subreddit_id', sa.String(), sa.ForeignKey('subreddits.id'), nullable=False),
+        sa.Column('comment_sentiment', postgresql.JSONB()),
+        sa.Column('score', sa.Integer(), nullable=False),
+        sa.Column('created_utc', sa.DateTime(), nullable=False),
+        sa.Column('measured_at', sa.DateTime(), nullable=False),
+    )
+
+    # backfill from the history tables - newest snapshot per entity
+    op.execute("""
+        INSERT INTO post_latest (post_id, subreddit_id, title_sentiment, body_sentiment, score,
+                                 upvote_ratio, controversiality, num_comments, created_utc, measured_at)
+        SELECT DISTINCT ON (h.post_id)
+               h.post_id, p.subreddit_id, h.title_sentiment, h.body_sentiment, COALESCE(h.score, 0),
+               h.upvote_ratio, h.controversiality, h.num_comments, p.created_utc, h.measured_at
+        FROM post_sentiment_history h
+        JOIN posts p ON p.id = h.post_id
+        ORDER BY h.post_id, h.measured_at DESC, h.id DESC
+    """)
+    op.execute("""
+        INSERT INTO comment_latest (comment_id, post_id, subreddit_id, comment_sentiment, score, created_utc, measured_at)
+        SELECT DISTINCT ON (h.comment_id)
+               h.comment_id, c.post_id, p.subreddit_id, h.comment_sentiment, COALESCE(h.score, 0), c.created_utc, h.measured_at
+        FROM comment_sentiment_history h
+        JOIN comments c ON c.id = h.comment_id
+        JOIN posts p ON p.id = c.post_id
+        ORDER BY h.comment_id, h.measured_at DESC, h.id DESC
+    """)
+
+    op.create_index('ix_post_latest_subreddit_score', 'post_latest',
+                    ['subreddit_id', sa.text('score DESC'), sa.text('post_id DESC')])
+    op.create_index('ix_post_latest_subreddit_created', 'post_latest',
+                    ['subreddit_id', sa.text('created_utc DESC'), sa.text('post_id DESC')])
+    op.create_index('ix_comment_latest_subreddit_score', 'comment_latest',
+                    ['subreddit_id', sa.text('score DESC'), sa.text('comment_id DESC')])
+    op.create_index('ix_comment_latest_subreddit_created', 'comment_latest',
+                    ['subreddit_id', sa.text('created_utc DESC'), sa.text('comment_id DESC')])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_comment_latest_subreddit_created', table_name='comment_latest')
+    op.drop_index('ix_comment_latest_subreddit_score', table_name='comment_latest')
+    op.drop_index('ix_post_latest_subreddit_created', table_name='post_latest')
+    op.drop_index('ix_post_latest_subreddit_score', table_name='post_latest')
+    op.drop_table('comment_latest')
+    op.drop_table('post_latest')
@@ -0,0 +1,44 @@
+"""full text search
+
+Revision ID: 7c3e5a0d9f21
+Revises: 2a9f6c1e8b40
+Create Date: 2026-10-19 14:08:33.905127
+
+Adds generated tsvector columns (maintained by postgres on every insert/update) and GIN indexes.
+Adding a STORED generated column rewrites the table under an exclusive lock - on large tables
+run this in a maintenance window. The GIN indexes are built concurrently afterwards.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c3e5a0d9f21'
+down_revision: Union[str, Sequence[str], None] = '2a9f6c1e8b40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('posts', sa.Column('search_vector', postgresql.TSVECTOR(), sa.Computed(
+        "to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(selftext, ''))", persisted=True)))
+    op.add_column('comments', sa.Column('search_vector', postgresql.TSVECTOR(), sa.Computed(
+        "to_tsvector('simple', coalesce(text, ''))", persisted=True)))
+
+    with op.get_context().autocommit_block():
+        op.execute('CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_posts_search_vector ON posts USING gin (search_vector)')
+        op.execute('CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_comments_search_vector ON comments USING gin (search_vector)')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS ix_comments_search_vector')
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS ix_posts_search_vector')
+    op.drop_column('comments', 'search_vector')
+    op.drop_column('posts', 'search_vector')
@@ -0,0 +1,53 @@
+"""keyset pagination indexes
+
+Revision ID: 8e1c4a6f2d37
+Revises: 5b8d2f7a9c14
+Create Date: 2026-10-19 11:02:17.554920
+
+Runs against the live *_latest tables: adding the columns with a constant default only
+changes the catalog, the backfill commits in batches and the indexes are built
+CONCURRENTLY (src/storage/migration_helpers.py) - reads and upserts keep going meanwhile.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from src.storage.migration_helpers import backfill_in_batches, create_index_concurrently
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e1c4a6f2d37'
+down_revision: Union[str, Sequence[str], None] = '5b8d2f7a9c14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # compound score as a plain column so it can be used as a keyset sort key
+    op.add_column('post_latest', sa.Column('compound', sa.Float(), nullable=False, server_default='0'))
+    op.add_column('comment_latest', sa.Column('compound', sa.Float(), nullable=False, server_default='0'))
+
+    with op.get_context().autocommit_block():
+        # rows still at the default although their sentiment says otherwise
+        backfill_in_batches('post_latest', 'post_id',
+                            "compound = (title_sentiment->>'compound')::float",
+                            "compound = 0 AND COALESCE((title_sentiment->>'compound')::float, 0) <> 0")
+        backfill_in_batches('comment_latest', 'comment_id',
+                            "compound = (comment_sentiment->>'compound')::float",
+                            "compound = 0 AND COALESCE((comment_sentiment->>'compound')::float, 0) <> 0")
+
+        create_index_concurrently('ix_post_latest_subreddit_compound', 'post_latest',
+                                  '(subreddit_id, compound DESC, post_id DESC)')
+        create_index_concurrently('ix_comment_latest_subreddit_compound', 'comment_latest',
+                                  '(subreddit_id, compound DESC, comment_id DESC)')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS ix_comment_latest_subreddit_compound')
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS ix_post_latest_subreddit_compound')
+    op.drop_column('comment_latest', 'compound')
+    op.drop_column('post_latest', 'compound')
@@ -0,0 +1,65 @@
+"""read path indexes (concurrently)
+
+Revision ID: d4f7b9e0a3c5
+Revises: 8e1c4a6f2d37
+Create Date: 2026-10-19 12:40:55.031877
+
+Built with CREATE INDEX CONCURRENTLY so the migration can run against a live database
+without blocking the collection inserts. CONCURRENTLY cannot run inside a transaction,
+so every statement runs in an autocommit block. A build that failed halfway leaves an
+INVALID index behind - it is dropped and rebuilt on the next run.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+from src.storage.migration_helpers import create_index_concurrently
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4f7b9e0a3c5'
+down_revision: Union[str, Sequence[str], None] = '8e1c4a6f2d37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (name, table, index definition)
+# schema_manager.py index=True columns of the large tables - databases stamped at the empty initial revisions may lack them
+SCHEMA_INDEXES = [
+    ('ix_subreddits_fetched_at', 'subreddits', '(fetched_at)'),
+    ('ix_posts_subreddit_id', 'posts', '(subreddit_id)'),
+    ('ix_post_sentiment_history_post_id', 'post_sentiment_history', '(post_id)'),
+    ('ix_comments_post_id', 'comments', '(post_id)'),
+    ('ix_comments_parent_comment_id', 'comments', '(parent_comment_id)'),
+    ('ix_comments_created_utc', 'comments', '(created_utc)'),
+    ('ix_comment_sentiment_history_comment_id', 'comment_sentiment_history', '(comment_id)'),
+]
+
+# indexes for the hot query shapes - owned by this revision
+READ_PATH_INDEXES = [
+    # latest snapshot of one entity from the history tables
+    ('ix_post_sentiment_history_post_measured', 'post_sentiment_history', '(post_id, measured_at DESC)'),
+    ('ix_comment_sentiment_history_comment_measured', 'comment_sentiment_history', '(comment_id, measured_at DESC)'),
+
+    # posts of a subreddit by time, comments of a post by time
+    ('ix_posts_subreddit_created', 'posts', '(subreddit_id, created_utc)'),
+    ('ix_comments_post_created', 'comments', '(post_id, created_utc)'),
+
+    # time range scans over the append-only history tables - BRIN stays tiny since measured_at follows insert order
+    ('ix_post_sentiment_history_measured_brin', 'post_sentiment_history', 'USING brin (measured_at)'),
+    ('ix_comment_sentiment_history_measured_brin', 'comment_sentiment_history', 'USING brin (measured_at)'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, definition in SCHEMA_INDEXES + READ_PATH_INDEXES:
+            create_index_concurrently(name, table, definition)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, _, _ in reversed(READ_PATH_INDEXES):
+            op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {name}')
@@ -0,0 +1,57 @@
+# ~/reddit_sentiment_tracker/benchmarks/auth_benchmark.py
+"""
+Per-request auth overhead: JWT verification with and without the verified token cache,
+and the full get_current_user dependency. Runs in-process, no services needed.
+
+    python -m benchmarks.auth_benchmark --iterations 50000 --users 1000
+"""
+
+import argparse
+import asyncio
+import random
+from typing import List
+
+from benchmarks.common import Timer, format_summary
+from fastapi.security import HTTPAuthorizationCredentials
+from src.api import auth_service
+from src.api.auth_dependencies import get_current_user
+
+
+def bench_verify(label: str, tokens: List[str], iterations: int, cached: bool) -> None:
+    samples: List[float] = []
+    for _ in range(iterations):
+        token = random.choice(tokens)
+        if not cached:
+            auth_service.clear_token_cache()
+        with Timer(samples):
+            auth_service.verify_token(token)
+    print(format_summary(label, samples))
+
+
+async def bench_dependency(tokens: List[str], iterations: int) -> None:
+    samples: List[float] = []
+    credentials = [HTTPAuthorizationCredentials(scheme="Bearer", credentials=token) for token in tokens]
+    for _ in range(iterations):
+        auth_data = random.choice(credentials)
+        with Timer(samples):
+            await get_current_user(auth_data)
+    print(format_summary("get_current_user (cached)", samples))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=50_000)
+    parser.add_argument("--users", type=int, default=1000, help="distinct tokens in rotation")
+    args = parser.parse_args()
+
+    auth_service.jwt_settings = lambda: ("benchmark-secret-key-with-enough-length", "HS256")
+    tokens = [auth_service.create_access_token({"sub": f"user{i}", "user_id": i}) for i in range(args.users)]
+
+    bench_verify("verify_token (decode every request)", tokens, args.iterations, cached=False)
+    auth_service.clear_token_cache()
+    bench_verify("verify_token (cached)", tokens, args.iterations, cached=True)
+    asyncio.run(bench_dependency(tokens, args.iterations))
+
+
+if __name__ == "__main__":
+    main()
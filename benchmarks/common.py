@@ -0,0 +1,77 @@
+# ~/reddit_sentiment_tracker/benchmarks/common.py
+
+import sys
+import os
+import time
+import statistics
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# benchmarks are run from the project root: python -m benchmarks.<name>
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """ Nearest-rank percentile of a list of samples """
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """ Latency summary in milliseconds (samples are seconds) """
+    return {
+        "n": len(samples),
+        "mean_ms": statistics.fmean(samples) * 1000,
+        "p50_ms": percentile(samples, 50) * 1000,
+        "p95_ms": percentile(samples, 95) * 1000,
+        "p99_ms": percentile(samples, 99) * 1000,
+    }
+
+
+def format_summary(label: str, samples: List[float]) -> str:
+    """ One line latency summary for the console """
+    s = summarize(samples)
+    return (f"{label:<40} n={s['n']:<6} mean={s['mean_ms']:8.3f}ms  p50={s['p50_ms']:8.3f}ms  "
+            f"p95={s['p95_ms']:8.3f}ms  p99={s['p99_ms']:8.3f}ms")
+
+
+class Timer:
+    """ Context manager collecting wall clock durations into a list """
+    def __init__(self, samples: List[float]) -> None:
+        self.samples = samples
+
+    def __enter__(self) -> "Timer":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.samples.append(time.perf_counter() - self.start)
+
+
+async def asgi_request(app: Callable, method: str, path: str, headers: Optional[Dict[str, str]] = None,
+                       body: bytes = b"", response_headers: Optional[Dict[str, str]] = None) -> Tuple[int, bytes]:
+    """ Call an ASGI app in-process (no server, no HTTP client) - returns (status, body), fills response_headers if given """
+    path, _, query = path.partition("?")
+    scope: Dict[str, Any] = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": method, "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "",
+        "query_string": query.encode(), "server": ("benchmark", 80), "client": ("benchmark", 50000),
+        "headers": [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()],
+    }
+    status = 0
+    chunks: List[bytes] = []
+
+    async def receive() -> Dict[str, Any]:
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message: Dict[str, Any]) -> None:
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+            if response_headers is not None:
+                response_headers.update((k.decode().lower(), v.decode()) for k, v in message.get("headers", []))
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return status, b"".join(chunks)
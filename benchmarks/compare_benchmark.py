@@ -0,0 +1,124 @@
+# ~/reddit_sentiment_tracker/benchmarks/compare_benchmark.py
+"""
+Latency of comparing many subreddits: one grouped query (GET /compare) vs one aggregate query per
+subreddit, and the cached path when Redis is reachable.
+
+Needs the configured Postgres database with migrations applied. Seeds --subreddits synthetic subreddits
+with --posts posts and --comments comments each (latest snapshots only, skipped if already seeded).
+
+    python -m benchmarks.compare_benchmark --subreddits 50 --posts 20000 --comments 40000
+"""
+
+import argparse
+import asyncio
+from typing import List
+
+from benchmarks.common import Timer, format_summary
+from sqlalchemy import text
+from src.api.response_cache import cached_multi_response
+from src.storage.connection import get_write_engine
+from src.storage.crud import compare_subreddits
+from src.storage.redis_connection import init_redis, close_redis
+
+PREFIX = "bench_cmp_"
+
+
+async def seed(count: int, posts: int, comments: int) -> List[str]:
+    """ Bulk load synthetic subreddits, posts, comments and their latest snapshots with generate_series """
+    names = [f"{PREFIX}{i:03d}" for i in range(count)]
+
+    async with get_write_engine().begin() as conn:
+        existing = (await conn.execute(
+            text("SELECT count(DISTINCT subreddit_id) FROM post_latest WHERE subreddit_id LIKE :prefix"),
+            {"prefix": PREFIX + "%"}
+        )).scalar_one()
+        if existing >= count:
+            print(f"Already seeded: {existing} subreddits")
+            return names
+
+        for name in names:
+            params = {"sid": name, "posts": posts, "comments": comments}
+            await conn.execute(text("""
+                INSERT INTO subreddits (id, name, description, subscriber_count, created_utc, fetched_at)
+                VALUES (:sid, :sid, 'compare benchmark', 0, now(), now())
+                ON CONFLICT DO NOTHING
+            """), params)
+
+            await conn.execute(text("""
+                INSERT INTO posts (id, subreddit_id, author, post_type, title, selftext, url, flair, created_utc, fetched_at)
+                SELECT :sid || '_p' || g, :sid, 'bench', 'top', 'synthetic post ' || g, '', '', NULL,
+                       now() - g * interval '7 seconds', now()
+                FROM generate_series(1, :posts) AS g
+                ON CONFLICT DO NOTHING
+            """), params)
+
+            await conn.execute(text("""
+                INSERT INTO post_latest (post_id, subreddit_id, title_sentiment, body_sentiment, score, upvote_ratio,
+                                         controversiality, num_comments, compound, created_utc, measured_at, last_seen_at)
+                SELECT p.id, p.subreddit_id, '{}'::jsonb, '{}'::jsonb, (random() * 50000)::int, 0.9,
+                       random(), 0, round((random() * 2 - 1)::numeric, 4)::float, p.created_utc, now(), now()
+                FROM posts p
+                WHERE p.subreddit_id = :sid
+                ON CONFLICT DO NOTHING
+            """), params)
+
+            await conn.execute(text("""
+                INSERT INTO comments (id, post_id, parent_comment_id, depth, author, text, score, created_utc, fetched_at)
+                SELECT :sid || '_c' || g, :sid || '_p' || (1 + g % :posts), NULL, 0, 'bench', 'synthetic comment ' || g,
+                       0, now() - g * interval '3 seconds', now()
+                FROM generate_series(1, :comments) AS g
+                ON CONFLICT DO NOTHING
+            """), params)
+
+            await conn.execute(text("""
+                INSERT INTO comment_latest (comment_id, post_id, subreddit_id, comment_sentiment, score, compound,
+                                            created_utc, measured_at, last_seen_at)
+                SELECT c.id, c.post_id, :sid, '{}'::jsonb, (random() * 500)::int,
+                       round((random() * 2 - 1)::numeric, 4)::float, c.created_utc, now(), now()
+                FROM comments c
+                WHERE c.id LIKE :sid || '\\_c%'
+                ON CONFLICT DO NOTHING
+            """), params)
+
+        await conn.execute(text("ANALYZE post_latest"))
+        await conn.execute(text("ANALYZE comment_latest"))
+    print(f"Seeded {count} subreddits x {posts} posts / {comments} comments")
+    return names
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--subreddits", type=int, default=50)
+    parser.add_argument("--posts", type=int, default=20_000, help="posts per subreddit")
+    parser.add_argument("--comments", type=int, default=40_000, help="comments per subreddit")
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    names = await seed(args.subreddits, args.posts, args.comments)
+
+    samples: List[float] = []
+    for _ in range(args.iterations):
+        with Timer(samples):
+            await compare_subreddits(names)
+    print(format_summary(f"one grouped query ({len(names)} subreddits)", samples))
+
+    samples = []
+    for _ in range(args.iterations):
+        with Timer(samples):
+            for name in names:
+                await compare_subreddits([name])
+    print(format_summary(f"{len(names)} single subreddit queries", samples))
+
+    if await init_redis():
+        samples = []
+        for _ in range(args.iterations):
+            with Timer(samples):
+                await cached_multi_response("compare", names, {}, lambda: compare_subreddits(names))
+        print(format_summary("cached (first call fills the cache)", samples))
+        await close_redis()
+
+    await get_write_engine().dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
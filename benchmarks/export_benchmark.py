@@ -0,0 +1,86 @@
+# ~/reddit_sentiment_tracker/benchmarks/export_benchmark.py
+"""
+Throughput and memory of the streaming bulk export over millions of rows.
+
+Needs the configured Postgres database with migrations applied. Seeds the keyset benchmark subreddit
+(--rows posts with latest snapshots) plus --history snapshots per post, then exports each dataset
+through the same path as GET /export (server-side cursor -> encoder) and discards the bytes.
+Peak RSS should stay flat whatever the row count.
+
+    python -m benchmarks.export_benchmark --rows 1000000 --history 3
+"""
+
+import argparse
+import asyncio
+import resource
+import time
+
+from benchmarks.keyset_pagination_benchmark import seed, SUBREDDIT_ID
+from sqlalchemy import text
+from src.storage.connection import get_write_engine
+from src.storage.crud import stream_export, export_columns
+from src.utils.export_formats import encode_export
+
+
+async def seed_history(per_post: int) -> None:
+    """ per_post sentiment history snapshots for every benchmark post (skipped if already seeded) """
+    async with get_write_engine().begin() as conn:
+        existing = (await conn.execute(text("""
+            SELECT count(*) FROM post_sentiment_history h JOIN posts p ON p.id = h.post_id WHERE p.subreddit_id = :sid
+        """), {"sid": SUBREDDIT_ID})).scalar_one()
+        if existing:
+            print(f"History already seeded: {existing} rows")
+            return
+
+        await conn.execute(text("""
+            INSERT INTO post_sentiment_history (post_id, title_sentiment, body_sentiment, score, upvote_ratio,
+                                                controversiality, num_comments, measured_at)
+            SELECT pl.post_id, pl.title_sentiment, pl.body_sentiment, pl.score - n, 0.9, 0.0, 0, now() - n * interval '1 hour'
+            FROM post_latest pl, generate_series(1, :per_post) AS n
+            WHERE pl.subreddit_id = :sid
+        """), {"sid": SUBREDDIT_ID, "per_post": per_post})
+    print(f"Seeded {per_post} history snapshots per post")
+
+
+def peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024      # kilobytes on Linux
+
+
+async def bench_export(dataset: str, export_format: str) -> None:
+    rows = 0
+    size = 0
+    rss_before = peak_rss_mb()
+    started = time.perf_counter()
+
+    async def counted():
+        nonlocal rows
+        async for batch in stream_export(SUBREDDIT_ID, dataset):
+            rows += len(batch)
+            yield batch
+
+    async for chunk in encode_export(counted(), export_columns(dataset), export_format):
+        size += len(chunk)
+
+    elapsed = time.perf_counter() - started
+    print(f"{dataset + ' ' + export_format:<24} rows={rows:<9} {size / 1e6:8.1f}MB  {elapsed:6.2f}s  "
+          f"{rows / elapsed:9.0f} rows/s  peak RSS {peak_rss_mb():.0f}MB (+{peak_rss_mb() - rss_before:.0f}MB)")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--history", type=int, default=3, help="history snapshots per post")
+    args = parser.parse_args()
+
+    await seed(args.rows)
+    await seed_history(args.history)
+
+    for dataset in ("posts", "post_history"):
+        for export_format in ("ndjson", "csv"):
+            await bench_export(dataset, export_format)
+
+    await get_write_engine().dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,121 @@
+# ~/reddit_sentiment_tracker/benchmarks/keyset_pagination_benchmark.py
+"""
+Per-page latency of keyset pagination vs OFFSET deep into a large post_latest table.
+
+Needs the configured Postgres database (HOST_DB, NAME_DB, ... or .env) with migrations applied.
+Seeds one synthetic subreddit with --rows posts (skipped if already seeded) and walks all pages.
+
+    python -m benchmarks.keyset_pagination_benchmark --rows 1000000 --page-size 100
+"""
+
+import argparse
+import asyncio
+from typing import List
+
+from benchmarks.common import Timer, format_summary
+from sqlalchemy import text
+from src.storage.connection import get_write_engine
+from src.storage.crud import retrieve_posts_data
+
+SUBREDDIT_ID = "bench_keyset"
+SUBREDDIT_NAME = "bench_keyset"
+
+
+async def seed(rows: int) -> None:
+    """ Bulk load synthetic posts + latest snapshots with generate_series (one statement per table) """
+    async with get_write_engine().begin() as conn:
+        existing = (await conn.execute(
+            text("SELECT count(*) FROM post_latest WHERE subreddit_id = :sid"), {"sid": SUBREDDIT_ID}
+        )).scalar_one()
+        if existing >= rows:
+            print(f"Already seeded: {existing} rows")
+            return
+
+        await conn.execute(text("""
+            INSERT INTO subreddits (id, name, description, subscriber_count, created_utc, fetched_at)
+            VALUES (:sid, :name, 'keyset benchmark', 0, now(), now())
+            ON CONFLICT DO NOTHING
+        """), {"sid": SUBREDDIT_ID, "name": SUBREDDIT_NAME})
+
+        await conn.execute(text("""
+            INSERT INTO posts (id, subreddit_id, author, post_type, title, selftext, url, flair, created_utc, fetched_at)
+            SELECT 'bk_' || g, :sid, 'bench', 'top', 'synthetic post ' || g, '', '', NULL,
+                   now() - g * interval '7 seconds', now()
+            FROM generate_series(1, :rows) AS g
+            ON CONFLICT DO NOTHING
+        """), {"sid": SUBREDDIT_ID, "rows": rows})
+
+        await conn.execute(text("""
+            INSERT INTO post_latest (post_id, subreddit_id, title_sentiment, body_sentiment, score, upvote_ratio,
+                                     controversiality, num_comments, compound, created_utc, measured_at, last_seen_at)
+            SELECT p.id, p.subreddit_id, jsonb_build_object('compound', c.v), '{}'::jsonb,
+                   (random() * 50000)::int, 0.9, 0.0, 0, c.v, p.created_utc, now(), now()
+            FROM posts p
+            CROSS JOIN LATERAL (SELECT round((random() * 2 - 1)::numeric, 4)::float AS v WHERE p.id IS NOT NULL) c
+            WHERE p.subreddit_id = :sid
+            ON CONFLICT DO NOTHING
+        """), {"sid": SUBREDDIT_ID})
+
+        await conn.execute(text("ANALYZE post_latest"))
+    print(f"Seeded {rows} rows")
+
+
+async def walk_keyset(sort: str, page_size: int, checkpoints: List[int]) -> None:
+    """ Follow next-page cursors through the whole table, timing each page """
+    page, cursor = 0, None
+    window: List[float] = []
+    all_pages: List[float] = []
+
+    while True:
+        with Timer(window):
+            rows, cursor = await retrieve_posts_data(SUBREDDIT_NAME, page_size, sort, cursor)
+        page += 1
+
+        if page in checkpoints:
+            print(format_summary(f"keyset sort={sort} pages..{page}", window))
+            all_pages.extend(window)
+            window = []
+
+        if cursor is None:
+            break
+
+    all_pages.extend(window)
+    print(format_summary(f"keyset sort={sort} all {page} pages", all_pages))
+
+
+async def sample_offset(sort: str, page_size: int, checkpoints: List[int], samples: int = 5) -> None:
+    """ Same page depths with LIMIT/OFFSET for comparison """
+    for page in checkpoints:
+        timings: List[float] = []
+        for _ in range(samples):
+            async with get_write_engine().connect() as conn:
+                with Timer(timings):
+                    await conn.execute(text(f"""
+                        SELECT pl.post_id, p.title, pl.{sort}
+                        FROM post_latest pl JOIN posts p ON p.id = pl.post_id
+                        WHERE pl.subreddit_id = :sid
+                        ORDER BY pl.{sort} DESC, pl.post_id DESC
+                        LIMIT :limit OFFSET :offset
+                    """), {"sid": SUBREDDIT_ID, "limit": page_size, "offset": (page - 1) * page_size})
+        print(format_summary(f"offset sort={sort} page {page}", timings))
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--sort", choices=["created_utc", "score", "compound"], default="created_utc")
+    args = parser.parse_args()
+
+    await seed(args.rows)
+
+    total_pages = -(-args.rows // args.page_size)
+    checkpoints = sorted({10, 100, 1000, total_pages // 2, total_pages} - {0})
+
+    await walk_keyset(args.sort, args.page_size, checkpoints)
+    await sample_offset(args.sort, args.page_size, checkpoints)
+    await get_write_engine().dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,161 @@
+# ~/reddit_sentiment_tracker/benchmarks/load_test.py
+"""
+Load test of the read endpoints: --concurrency virtual users call the real app (server.py, with its
+lifespan: DB pools, Redis, rate limiting, response cache) in-process through ASGI for --duration seconds,
+each request an endpoint drawn from --mix. List pages follow the X-Next-Cursor of the user's previous
+page with probability --follow, so deep pages get load too. Reports throughput, latency percentiles
+per endpoint and the response status counts.
+
+Runs against the configured database (DATABASE_URL or the Postgres env vars) and needs JWT_KEY /
+JWT_ALGORITHM. Load data first with benchmarks/synthetic_data.py. Rate limiting is bypassed unless
+--rate-limit is given (RATE_LIMIT_Redis requests per user would end the test after a few requests);
+set RESPONSE_CACHE_ENABLED=false to measure the database instead of the cache.
+
+    python -m benchmarks.synthetic_data --subreddits 3 --posts 100000 --comments 20
+    python -m benchmarks.load_test --subreddits synth000,synth001,synth002 --concurrency 32 --duration 30
+"""
+
+import time
+import random
+import asyncio
+import argparse
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import quote
+
+from benchmarks.common import asgi_request, format_summary
+from benchmarks.synthetic_data import WORDS
+
+DEFAULT_MIX = "posts=35,comments=25,search_posts=8,search_comments=7,timeseries=10,compare=5,metadata=10"
+
+
+def parse_mix(mix: str) -> Dict[str, int]:
+    weights = {name: int(weight) for name, _, weight in (item.partition("=") for item in mix.split(","))}
+    unknown = set(weights) - set(ENDPOINTS)
+    if unknown:
+        raise SystemExit(f"Unknown endpoints in --mix: {sorted(unknown)} (known: {sorted(ENDPOINTS)})")
+    return weights
+
+
+def list_path(kind: str, subreddit: str, rng: random.Random, cursor: Optional[str]) -> str:
+    if cursor is not None:
+        return f"/{kind}/{subreddit}?limit=100&sort={cursor[0]}&cursor={quote(cursor[1])}"
+    return f"/{kind}/{subreddit}?limit={rng.choice((10, 25, 100))}&sort={rng.choice(('score', 'created_utc', 'compound'))}"
+
+
+def search_path(kind: str, subreddit: str, rng: random.Random) -> str:
+    terms = " ".join(rng.sample(WORDS, rng.randint(1, 2)))
+    return f"/search/{subreddit}/{kind}?q={quote(terms)}&limit=20"
+
+
+ENDPOINTS = {
+    "posts": None,                  # list endpoints are built by the virtual user (cursor state)
+    "comments": None,
+    "search_posts": lambda subreddit, names, rng: search_path("posts", subreddit, rng),
+    "search_comments": lambda subreddit, names, rng: search_path("comments", subreddit, rng),
+    "timeseries": lambda subreddit, names, rng: (f"/sentiment/{subreddit}/timeseries?bucket={rng.choice(('hour', 'day'))}"
+                                                 f"&source={rng.choice(('posts', 'comments'))}"),
+    "compare": lambda subreddit, names, rng: f"/compare?subreddits={','.join(rng.sample(names, min(len(names), 3)))}",
+    "metadata": lambda subreddit, names, rng: f"/subreddit_metadata/{subreddit}",
+}
+
+
+class VirtualUser:
+    """ One client: own token, own cursors, requests back to back """
+    def __init__(self, app, token: str, names: List[str], weights: Dict[str, int], follow: float, seed: int) -> None:
+        self.app = app
+        self.headers = {"Authorization": f"Bearer {token}"}
+        self.names = names
+        self.endpoints, self.weights = list(weights), list(weights.values())
+        self.follow = follow
+        self.rng = random.Random(seed)
+        self.cursors: Dict[Tuple[str, str], Tuple[str, str]] = {}       # (kind, subreddit) -> (sort, next cursor)
+
+    async def request(self) -> Tuple[str, int, float]:
+        """ One request - returns (endpoint, status, seconds) """
+        endpoint = self.rng.choices(self.endpoints, self.weights)[0]
+        subreddit = self.rng.choice(self.names)
+
+        cursor = None
+        if endpoint in ("posts", "comments"):
+            if self.rng.random() < self.follow:
+                cursor = self.cursors.get((endpoint, subreddit))
+            path = list_path(endpoint, subreddit, self.rng, cursor)
+        else:
+            path = ENDPOINTS[endpoint](subreddit, self.names, self.rng)
+
+        response_headers: Dict[str, str] = {}
+        start = time.perf_counter()
+        status, _ = await asgi_request(self.app, "GET", path, self.headers, response_headers=response_headers)
+        elapsed = time.perf_counter() - start
+
+        if endpoint in ("posts", "comments"):
+            sort = cursor[0] if cursor is not None else path.split("sort=")[1].split("&")[0]
+            next_cursor = response_headers.get("x-next-cursor")
+            if next_cursor is not None:
+                self.cursors[(endpoint, subreddit)] = (sort, next_cursor)
+            else:
+                self.cursors.pop((endpoint, subreddit), None)            # last page - start over
+            if cursor is not None:
+                endpoint += " (next page)"
+        return endpoint, status, elapsed
+
+
+async def run(users: List[VirtualUser], duration: float) -> Tuple[Dict[str, List[float]], Counter, float]:
+    """ All users until the deadline - returns latencies per endpoint, status counts and the elapsed time """
+    samples: Dict[str, List[float]] = defaultdict(list)
+    statuses: Counter = Counter()
+    started = time.perf_counter()
+    deadline = started + duration
+
+    async def loop(user: VirtualUser) -> None:
+        while time.perf_counter() < deadline:
+            endpoint, status, elapsed = await user.request()
+            samples[endpoint].append(elapsed)
+            statuses[status] += 1
+
+    await asyncio.gather(*(loop(user) for user in users))
+    return samples, statuses, time.perf_counter() - started
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--subreddits", default="synth000,synth001,synth002", help="comma separated subreddit names")
+    parser.add_argument("--concurrency", type=int, default=32, help="virtual users")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds of measured load")
+    parser.add_argument("--warmup", type=float, default=3.0, help="seconds of unmeasured load first")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="endpoint=weight,...")
+    parser.add_argument("--follow", type=float, default=0.5, help="probability of requesting the next page")
+    parser.add_argument("--rate-limit", action="store_true", help="keep the per user rate limit (429s count as responses)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    from server import app                                      # after argparse: --help needs no configuration
+    from src.api.auth_dependencies import get_current_user
+    from src.api.auth_service import create_access_token
+    from src.api.rate_limiting import rate_limit_check
+
+    if not args.rate_limit:
+        app.dependency_overrides[rate_limit_check] = get_current_user       # token still verified per request
+
+    names = [name.strip().lower() for name in args.subreddits.split(",") if name.strip()]
+    weights = parse_mix(args.mix)
+
+    async with app.router.lifespan_context(app):
+        users = [VirtualUser(app, create_access_token({"sub": f"load{i}", "user_id": 1_000_000 + i}), names, weights,
+                             args.follow, args.seed + i) for i in range(args.concurrency)]
+
+        if args.warmup > 0:
+            await run(users, args.warmup)
+        samples, statuses, elapsed = await run(users, args.duration)
+
+    total = sum(len(latencies) for latencies in samples.values())
+    print(f"{args.concurrency} virtual users, {elapsed:.1f}s, subreddits: {', '.join(names)}")
+    for endpoint in sorted(samples):
+        print(format_summary(endpoint, samples[endpoint]) + f"  {len(samples[endpoint]) / elapsed:8.1f} req/s")
+    print(format_summary("all", [s for latencies in samples.values() for s in latencies]) + f"  {total / elapsed:8.1f} req/s")
+    print("status codes: " + ", ".join(f"{status}: {count}" for status, count in sorted(statuses.items())))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
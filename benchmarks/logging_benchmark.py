@@ -0,0 +1,113 @@
+# ~/reddit_sentiment_tracker/benchmarks/logging_benchmark.py
+"""
+Logging overhead per collected post: process_post plus the per post messages of a collection
+(processed, duplicate skipped, comments inserted) under the logging setups of src/logger.py.
+The overhead is the time per post on the calling thread minus the run with logging disabled -
+what the event loop pays. "drain" is how long the listener thread needed to write out the rest.
+Handlers write into a temp dir, the console handler to /dev/null. No database, Redis or env vars needed.
+
+    python -m benchmarks.logging_benchmark --posts 20000
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Callable, List, Optional
+
+from benchmarks.common import Timer
+from src.logger import build_handlers, attach_queue_handler
+from src.utils import metrics
+from src.data_collection.post_processor import process_post
+
+LOGGER_NAME = "reddit_sentiment_tracker"
+
+
+def make_posts(count: int) -> List[SimpleNamespace]:
+    return [SimpleNamespace(
+        id=f"p{i}", author=f"user{i % 97}", created_utc=1729519800 + i, num_comments=i % 50,
+        url="https://reddit.com/r/wien", all_awardings=[], edited=False, link_flair_text="Rant",
+        title=f"foodora mal wieder {i}", selftext="foodora Fahrer rasen durch die Stadt :(",
+        score=i % 500, upvote_ratio=0.44,
+    ) for i in range(count)]
+
+
+def collect(posts: List[SimpleNamespace], level: int) -> None:
+    """ Per post work and messages of a collection run """
+    logger = logging.getLogger(LOGGER_NAME)
+    for post in posts:
+        process_post(post)
+        logger.log(level, "Processing post with the id: %s and the title: %s", post.id, post.title)
+        logger.log(level, "The Post ID: '%s' already exists. Skipped inserting", post.id)
+        logger.log(level, "Post id %s: Inserting comments and sentiments of Top Posts into DB successful", post.id)
+
+
+def configure(log_dir: Path, queued: bool, json_format: bool = False, sample_limit: int = 0) -> Optional[Callable[[], None]]:
+    """ Fresh handlers on the app logger - returns the function that stops the listener (queued setups) """
+    logger = logging.getLogger(LOGGER_NAME)
+    logger.handlers.clear()
+    logger.disabled = False
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+    handlers = build_handlers(LOGGER_NAME, json_format=json_format, log_dir=log_dir)
+    handlers[0].setStream(open(os.devnull, "w"))
+
+    if not queued:
+        for handler in handlers:
+            logger.addHandler(handler)              # the previous setup: I/O on the calling thread
+        return None
+    return attach_queue_handler(logger, handlers, sample_limit=sample_limit).stop
+
+
+def run(label: str, posts: List[SimpleNamespace], baseline: Optional[float], level: int = logging.INFO,
+        **setup) -> float:
+    with tempfile.TemporaryDirectory() as log_dir:
+        if setup.pop("disabled", False):
+            logging.getLogger(LOGGER_NAME).handlers.clear()
+            logging.getLogger(LOGGER_NAME).disabled = True
+            stop = None
+        else:
+            stop = configure(Path(log_dir), **setup)
+
+        metrics.reset()
+        samples: List[float] = []
+        with Timer(samples):
+            collect(posts, level)
+
+        drain = 0.0
+        if stop is not None:
+            started = time.perf_counter()
+            stop()
+            drain = time.perf_counter() - started
+
+    per_post = samples[0] / len(posts) * 1_000_000
+    overhead = f"overhead {per_post - baseline:7.1f}us/post" if baseline is not None else "baseline"
+    counters = metrics.snapshot()["counters"]
+    print(f"{label:<34} {per_post:8.1f}us/post  {overhead}  drain {drain * 1000:8.1f}ms  "
+          f"dropped {counters.get('logging.dropped', 0):6.0f}  suppressed {counters.get('logging.suppressed', 0):6.0f}")
+    return per_post
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--posts", type=int, default=20000)
+    args = parser.parse_args()
+
+    posts = make_posts(args.posts)
+    collect(posts[:500], logging.DEBUG)                 # warm up VADER before measuring
+
+    baseline = run("logging disabled", posts, None, disabled=True)
+    run("direct handlers (INFO per post)", posts, baseline, queued=False)
+    run("queue (INFO per post)", posts, baseline, queued=True)
+    run("queue + json (INFO per post)", posts, baseline, queued=True, json_format=True)
+    run("queue + sampling 50/s", posts, baseline, queued=True, sample_limit=50)
+    run("queue, per post at DEBUG", posts, baseline, level=logging.DEBUG, queued=True, sample_limit=50)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
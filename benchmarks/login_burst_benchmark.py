@@ -0,0 +1,140 @@
+# ~/reddit_sentiment_tracker/benchmarks/login_burst_benchmark.py
+"""
+Latency of a cheap read endpoint (/health) while a burst of logins is hashing passwords.
+
+In-process (default): the app is called through ASGI, the burst runs the login's bcrypt verification
+either inline on the event loop (previous handler) or through the password pool (current handler).
+Needs the usual env vars (.env) for importing the app, no database or Redis.
+
+Against a running server (--base-url): registers a benchmark user, fires --logins concurrent POST /login
+and polls GET /health during the burst.
+
+    python -m benchmarks.login_burst_benchmark --logins 50
+    python -m benchmarks.login_burst_benchmark --base-url http://localhost:8000 --logins 200
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Awaitable, Callable, List
+
+from benchmarks.common import asgi_request, format_summary
+from src.api.bcrypt_hashing import hash_password, verify_password
+from src.api.password_executor import run_password_task, PasswordPoolSaturatedError
+from src.config import BCRYPT_ROUNDS, PASSWORD_POOL_WORKERS, PASSWORD_POOL_QUEUE
+
+PASSWORD = "correct horse battery staple 2024"
+PROBE_INTERVAL = 0.01
+
+
+async def probe_while(probe: Callable[[], Awaitable[None]], burst: Awaitable[None]) -> List[float]:
+    """
+    Issue probe on a fixed PROBE_INTERVAL schedule until burst is done
+    Latency counts from when a probe was due: slots that passed while the event loop was blocked
+    are answered by the next probe, so the stall shows up in the samples instead of being skipped
+    """
+    samples: List[float] = []
+    burst_task = asyncio.ensure_future(burst)
+    due = time.perf_counter()
+
+    while not burst_task.done():
+        await asyncio.sleep(max(0.0, due - time.perf_counter()))
+        started = time.perf_counter()
+        await probe()
+        finished = time.perf_counter()
+
+        while True:
+            samples.append(finished - due)
+            due += PROBE_INTERVAL
+            if due > started:
+                break
+
+    await burst_task
+    return samples
+
+
+async def run_in_process(logins: int) -> None:
+    from server import app
+
+    hashed = hash_password(PASSWORD)
+
+    async def probe() -> None:
+        status, _ = await asgi_request(app, "GET", "/health")
+        assert status == 200
+
+    async def idle(seconds: float) -> None:
+        await asyncio.sleep(seconds)
+
+    async def inline_login() -> None:
+        verify_password(PASSWORD, hashed)       # blocks the event loop like the previous handler
+
+    rejected = 0
+
+    async def pooled_login() -> None:
+        nonlocal rejected
+        try:
+            await run_password_task(verify_password, PASSWORD, hashed)
+        except PasswordPoolSaturatedError:
+            rejected += 1
+
+    async def burst(login: Callable[[], Awaitable[None]]) -> None:
+        await asyncio.sleep(PROBE_INTERVAL)     # let the first probe start before the burst
+        await asyncio.gather(*(login() for _ in range(logins)))
+
+    print(f"bcrypt rounds={BCRYPT_ROUNDS}, pool workers={PASSWORD_POOL_WORKERS}, queue={PASSWORD_POOL_QUEUE}, logins={logins}")
+    print(format_summary("/health idle", await probe_while(probe, idle(1.0))))
+
+    started = time.perf_counter()
+    samples = await probe_while(probe, burst(inline_login))
+    print(format_summary("/health during inline burst", samples) + f"  burst={time.perf_counter() - started:.2f}s")
+
+    started = time.perf_counter()
+    samples = await probe_while(probe, burst(pooled_login))
+    print(format_summary("/health during pooled burst", samples) + f"  burst={time.perf_counter() - started:.2f}s  rejected(429)={rejected}")
+
+
+async def run_against_server(base_url: str, logins: int) -> None:
+    import aiohttp
+
+    credentials = {"username": "benchmark_login", "password": PASSWORD}
+
+    async with aiohttp.ClientSession(base_url) as session:
+        async with session.post("/register", json={**credentials, "email": "benchmark_login@example.com"}) as response:
+            if response.status not in (200, 400):       # 400: already registered
+                raise RuntimeError(f"Registration failed: {response.status} {await response.text()}")
+
+        async def probe() -> None:
+            async with session.get("/health") as response:
+                await response.read()
+
+        statuses: List[int] = []
+
+        async def login() -> None:
+            async with session.post("/login", json=credentials) as response:
+                statuses.append(response.status)
+
+        async def burst() -> None:
+            await asyncio.gather(*(login() for _ in range(logins)))
+
+        print(format_summary("/health idle", await probe_while(probe, asyncio.sleep(1.0))))
+
+        started = time.perf_counter()
+        samples = await probe_while(probe, burst())
+        print(format_summary("/health during login burst", samples) + f"  burst={time.perf_counter() - started:.2f}s")
+        print(f"login statuses: " + ", ".join(f"{status}: {statuses.count(status)}" for status in sorted(set(statuses))))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=50)
+    parser.add_argument("--base-url", default=None, help="benchmark a running server instead of in-process")
+    args = parser.parse_args()
+
+    if args.base_url:
+        asyncio.run(run_against_server(args.base_url, args.logins))
+    else:
+        asyncio.run(run_in_process(args.logins))
+
+
+if __name__ == "__main__":
+    main()
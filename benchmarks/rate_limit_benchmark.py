@@ -0,0 +1,100 @@
+# ~/reddit_sentiment_tracker/benchmarks/rate_limit_benchmark.py
+"""
+Per-request latency of the rate limit check: previous implementation (new client per request,
+GET + INCR/EXPIRE pipeline) vs the pooled single round-trip GCRA script. Also fires a concurrent
+burst at one user to show how many requests each variant lets through.
+
+Runs against REDIS_URL (or --redis-url), or in-process against fakeredis with --fake
+(pip install "fakeredis[lua]" - no network, so it measures client overhead and round-trip count only).
+
+    python -m benchmarks.rate_limit_benchmark --requests 5000 --concurrency 50
+    python -m benchmarks.rate_limit_benchmark --fake
+"""
+
+import argparse
+import asyncio
+import uuid
+from typing import Callable, List
+
+from benchmarks.common import Timer, format_summary
+import redis.asyncio as redis
+from src.api import rate_limiting
+from src.config import REDIS_URL, RATE_LIMIT_Redis, WINDOW_SIZE_Redis
+
+
+async def legacy_check(new_client: Callable[[], redis.Redis], user_id: str) -> bool:
+    """ Previous rate_limit_check: connect, GET, then INCR + EXPIRE, close """
+    client = new_client()
+    try:
+        key = f"rate_limit_legacy:{user_id}"
+        current = await client.get(key)
+        if current is not None and int(current) >= RATE_LIMIT_Redis:
+            return False
+
+        async with client.pipeline() as pipe:
+            pipe.incr(key)
+            pipe.expire(key, WINDOW_SIZE_Redis)
+            await pipe.execute()
+        return True
+    finally:
+        await client.aclose()
+
+
+async def gcra_check(user_id: str) -> bool:
+    allowed, _, _ = await rate_limiting.gcra_consume(user_id)
+    return allowed
+
+
+async def run_latency(label: str, check: Callable, requests: int, concurrency: int) -> None:
+    """ requests checks spread over concurrency workers, each for a fresh user (never limited) """
+    samples: List[float] = []
+    run_id = uuid.uuid4().hex[:8]
+
+    async def worker(worker_id: int) -> None:
+        for i in range(worker_id, requests, concurrency):
+            with Timer(samples):
+                await check(f"bench:{run_id}:{i}")
+
+    await asyncio.gather(*(worker(w) for w in range(concurrency)))
+    print(format_summary(label, samples))
+
+
+async def run_burst(label: str, check: Callable, burst: int) -> None:
+    """ burst concurrent checks for one user - at most RATE_LIMIT_Redis should pass """
+    user_id = f"bench_burst:{uuid.uuid4().hex[:8]}"
+    results = await asyncio.gather(*(check(user_id) for _ in range(burst)))
+    print(f"{label:<40} admitted {sum(results)}/{burst} (limit {RATE_LIMIT_Redis})")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--redis-url", default=REDIS_URL)
+    parser.add_argument("--fake", action="store_true", help="use in-process fakeredis instead of a server")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--burst", type=int, default=100)
+    args = parser.parse_args()
+
+    if args.fake:
+        import fakeredis
+        server = fakeredis.FakeServer()
+        new_client = lambda: fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+    else:
+        if not args.redis_url:
+            parser.error("REDIS_URL is not set - pass --redis-url or --fake")
+        new_client = lambda: redis.from_url(args.redis_url, decode_responses=True)
+
+    pooled = new_client()
+    rate_limiting.get_redis = lambda: pooled
+
+    await run_latency("legacy (client per request, 3 calls)", lambda u: legacy_check(new_client, u), args.requests, args.concurrency)
+    await run_latency("gcra (pooled, 1 script call)", gcra_check, args.requests, args.concurrency)
+
+    await run_burst("legacy burst", lambda u: legacy_check(new_client, u), args.burst)
+    await run_burst("gcra burst", gcra_check, args.burst)
+
+    await pooled.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
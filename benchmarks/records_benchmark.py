@@ -0,0 +1,170 @@
+# ~/reddit_sentiment_tracker/benchmarks/records_benchmark.py
+"""
+Memory of a collection run's posts and comments: the previous per-record dicts (reproduced below)
+against the slotted records of src/data_collection/records.py, built by the real process_post and
+fetch_comments from fake asyncpraw objects. Measured with tracemalloc - the fake Reddit objects
+(and so the texts themselves) exist before tracing starts, only what the collection adds is counted.
+
+ dicts, attached     - previous shape: post["comments"] = fetch_comments(...), all kept until the run ends
+ records, attached   - records kept the same way (isolates dict vs. slots)
+ records, per post   - current orchestrator: a post's comments are released after they are inserted
+
+The sentiment analysis is a stub returning fresh VADER-shaped dicts (--vader: the real analyzer, slow).
+No database, Redis or env vars needed.
+
+    python -m benchmarks.records_benchmark --posts 1000 --comments 100
+"""
+
+import gc
+import time
+import asyncio
+import argparse
+import tracemalloc
+from types import SimpleNamespace
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from src.data_collection import comment_fetcher, post_processor
+from src.data_collection.comment_fetcher import fetch_comments
+from src.data_collection.post_processor import process_post
+from src.sentiment_analysis.sentiment_analyzer import analyze_sentiment
+
+analyze: Callable[[str], Dict[str, float]] = analyze_sentiment
+
+
+def stub_sentiment(text: str) -> Dict[str, float]:
+    """ VADER-shaped scores without the analysis - new dict and floats per call, like polarity_scores() """
+    compound = (len(text) % 200) / 100 - 1
+    return {"neg": round(max(-compound, 0.0), 3), "neu": 0.5, "pos": round(max(compound, 0.0), 3), "compound": compound}
+
+
+class FakeComments(list):
+    """ submission.comments - a list with asyncpraw's replace_more() """
+    def replace_more(self, limit: int) -> None:
+        pass
+
+
+class FakeReddit:
+    """ reddit.submission(id=...) over pre-built fake comments """
+    def __init__(self, comments: Dict[str, FakeComments]) -> None:
+        self.comments = comments
+
+    async def submission(self, id: str) -> SimpleNamespace:
+        return SimpleNamespace(comments=self.comments[id])
+
+
+def make_source(posts: int, comments: int) -> tuple:
+    """ Fake asyncpraw posts and the FakeReddit serving their comments """
+    raw_posts = [SimpleNamespace(
+        id=f"p{i}", author=f"user{i % 97}", created_utc=1729519800 + i, num_comments=comments,
+        url=f"https://reddit.com/r/wien/comments/p{i}", all_awardings=[], edited=False, link_flair_text="Rant",
+        title=f"foodora mal wieder {i}", selftext=f"foodora Fahrer rasen durch die Stadt :( {i}",
+        score=i % 500, upvote_ratio=0.44,
+    ) for i in range(posts)]
+    raw_comments = {post.id: FakeComments(SimpleNamespace(
+        id=f"{post.id}c{j}", parent_id=f"t3_{post.id}", depth=0, body=f"naja, in Graz ist es auch nicht besser {j}",
+        author=f"user{j % 89}", score=j % 50, edited=False, created_utc=1729519900 + j,
+    ) for j in range(comments)) for post in raw_posts}
+    return raw_posts, FakeReddit(raw_comments)
+
+
+# previous shape, as process_post / fetch_comments built it
+
+def dict_post(post: Any) -> Optional[Dict[str, Any]]:
+    return {
+        "id": post.id,
+        "author": str(post.author) if post.author else "N/A",
+        "created_utc": datetime.fromtimestamp(post.created_utc, tz=timezone.utc),
+        "num_comments": post.num_comments,
+        "url": post.url,
+        "awards": len(post.all_awardings),
+        "edited": post.edited,
+        "flair": post.link_flair_text if post.link_flair_text else None,
+        "title": post.title,
+        "title_sentiment": analyze(post.title),
+        "selftext": post.selftext,
+        "body_sentiment": analyze(post.selftext),
+        "score": post.score,
+        "upvote_ratio": post.upvote_ratio,
+        "controversiality": (1 - post.upvote_ratio) * post.num_comments
+    }
+
+
+async def dict_comments(reddit: Any, post_id: str, REPLY_DEPTH: int, COMMENT_LIMIT: int) -> List[Dict[str, Any]]:
+    submission = await reddit.submission(id=post_id)
+    submission.comments.replace_more(limit=REPLY_DEPTH)
+    return [{
+        "id": comment.id,
+        "parent_id": comment.parent_id,
+        "depth": comment.depth,
+        "text": comment.body,
+        "author": str(comment.author) if comment.author else "[deleted]",
+        "score": comment.score,
+        "edited": comment.edited,
+        "created_utc": datetime.fromtimestamp(comment.created_utc, tz=timezone.utc),
+        "sentiment": analyze(comment.body)
+    } for comment in submission.comments[:COMMENT_LIMIT]]
+
+
+async def collect(raw_posts: List[SimpleNamespace], reddit: FakeReddit, comment_limit: int, shape: str,
+                  trace: bool) -> Dict[str, float]:
+    """ Build the run's posts and comments - traced: bytes after the posts, after the comments and peak; else seconds """
+    gc.collect()
+    if trace:
+        tracemalloc.start()
+    started = time.perf_counter()
+    kept: List[Any] = []
+    after_posts = 0
+
+    if shape == "dicts, attached":
+        posts = [dict_post(post) for post in raw_posts]
+        if trace:
+            after_posts = tracemalloc.get_traced_memory()[0]
+        for post in posts:
+            post["comments"] = await dict_comments(reddit, post["id"], 1, comment_limit)
+    else:
+        posts = [process_post(post) for post in raw_posts]
+        if trace:
+            after_posts = tracemalloc.get_traced_memory()[0]
+        for post in posts:
+            post_comments = await fetch_comments(reddit, post.id, 1, comment_limit)
+            if shape == "records, attached":
+                kept.append(post_comments)
+
+    elapsed = time.perf_counter() - started
+    if not trace:
+        return {"seconds": elapsed}
+    after_comments, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del posts, kept
+    return {"posts": after_posts, "comments": after_comments - after_posts, "peak": peak}
+
+
+def main() -> None:
+    global analyze
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--posts", type=int, default=1000)
+    parser.add_argument("--comments", type=int, default=100, help="comments per post")
+    parser.add_argument("--vader", action="store_true", help="real VADER analysis instead of the stub")
+    args = parser.parse_args()
+
+    if args.vader:
+        analyze_sentiment("warm up")            # lexicon loaded before tracing
+    else:
+        analyze = post_processor.analyze_sentiment = comment_fetcher.analyze_sentiment = stub_sentiment
+    raw_posts, reddit = make_source(args.posts, args.comments)
+    total_comments = args.posts * args.comments
+
+    print(f"{args.posts} posts x {args.comments} comments = {total_comments} comments, "
+          f"sentiment: {'VADER' if args.vader else 'stub'}")
+    print(f"{'':<20} {'B/post':>8} {'B/comment':>10} {'retained':>10} {'peak':>10} {'time':>8}   (B/comment: kept at the end)")
+    for shape in ("dicts, attached", "records, attached", "records, per post"):
+        result = asyncio.run(collect(raw_posts, reddit, args.comments, shape, trace=True))
+        result.update(asyncio.run(collect(raw_posts, reddit, args.comments, shape, trace=False)))   # timed untraced
+        retained = result["posts"] + result["comments"]
+        print(f"{shape:<20} {result['posts'] / args.posts:>8.0f} {result['comments'] / total_comments:>10.0f} "
+              f"{retained / 2**20:>8.1f}MB {result['peak'] / 2**20:>8.1f}MB {result['seconds']:>7.2f}s")
+
+
+if __name__ == "__main__":
+    main()
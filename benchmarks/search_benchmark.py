@@ -0,0 +1,117 @@
+# ~/reddit_sentiment_tracker/benchmarks/search_benchmark.py
+"""
+Latency of full text search (GIN on comments.search_vector) over a large synthetic comment corpus.
+
+Needs the configured Postgres database with migrations applied.
+Seeds one synthetic subreddit with --comments comments (skipped if already seeded).
+
+    python -m benchmarks.search_benchmark --comments 2000000
+"""
+
+import argparse
+import asyncio
+from typing import List
+
+from benchmarks.common import Timer, format_summary
+from sqlalchemy import text
+from src.storage.connection import get_write_engine
+from src.storage.crud import search_comments
+
+SUBREDDIT_ID = "bench_search"
+SUBREDDIT_NAME = "bench_search"
+POSTS = 1000
+
+# skewed vocabulary: power(random(), 3) picks the first words far more often than the last ones
+VOCABULARY = [
+    "wien", "ubahn", "wohnung", "miete", "heute", "gut", "schlecht", "wetter", "danke", "leider",
+    "essen", "kaffee", "bim", "radweg", "stau", "donauinsel", "prater", "naschmarkt", "würstelstand", "heuriger",
+    "fiaker", "opernball", "schnitzel", "melange", "beisl", "grätzl", "hackler", "sudern", "leiwand", "oida",
+]
+
+
+async def seed(comment_count: int) -> None:
+    """ Bulk load synthetic posts, comments (random text from VOCABULARY) and latest snapshots """
+    async with get_write_engine().begin() as conn:
+        existing = (await conn.execute(
+            text("SELECT count(*) FROM comment_latest WHERE subreddit_id = :sid"), {"sid": SUBREDDIT_ID}
+        )).scalar_one()
+        if existing >= comment_count:
+            print(f"Already seeded: {existing} comments")
+            return
+
+        await conn.execute(text("""
+            INSERT INTO subreddits (id, name, description, subscriber_count, created_utc, fetched_at)
+            VALUES (:sid, :name, 'search benchmark', 0, now(), now())
+            ON CONFLICT DO NOTHING
+        """), {"sid": SUBREDDIT_ID, "name": SUBREDDIT_NAME})
+
+        await conn.execute(text("""
+            INSERT INTO posts (id, subreddit_id, author, post_type, title, selftext, url, flair, created_utc, fetched_at)
+            SELECT 'bs_' || g, :sid, 'bench', 'top', 'synthetic post ' || g, '', '', NULL, now(), now()
+            FROM generate_series(1, :posts) AS g
+            ON CONFLICT DO NOTHING
+        """), {"sid": SUBREDDIT_ID, "posts": POSTS})
+
+        await conn.execute(text("""
+            INSERT INTO comments (id, post_id, parent_comment_id, depth, author, text, score, created_utc, fetched_at)
+            SELECT 'bsc_' || g, 'bs_' || (1 + g % :posts), NULL, 0, 'bench',
+                   (SELECT string_agg(w.words[1 + floor(power(random(), 3) * array_length(w.words, 1))::int], ' ')
+                    FROM generate_series(1, 12) AS n WHERE g IS NOT NULL),
+                   (random() * 500)::int, now() - g * interval '1 second', now()
+            FROM generate_series(1, :count) AS g, (SELECT CAST(:words AS text[]) AS words) AS w
+            ON CONFLICT DO NOTHING
+        """), {"posts": POSTS, "count": comment_count, "words": VOCABULARY})
+
+        await conn.execute(text("""
+            INSERT INTO comment_latest (comment_id, post_id, subreddit_id, comment_sentiment, score, compound,
+                                        created_utc, measured_at, last_seen_at)
+            SELECT c.id, c.post_id, :sid, jsonb_build_object('compound', s.v), c.score, s.v, c.created_utc, now(), now()
+            FROM comments c
+            CROSS JOIN LATERAL (SELECT round((random() * 2 - 1)::numeric, 4)::float AS v WHERE c.id IS NOT NULL) s
+            WHERE c.id LIKE 'bsc\\_%'
+            ON CONFLICT DO NOTHING
+        """), {"sid": SUBREDDIT_ID})
+
+        await conn.execute(text("ANALYZE comments"))
+        await conn.execute(text("ANALYZE comment_latest"))
+    print(f"Seeded {comment_count} comments")
+
+
+async def bench_query(search_query: str, page_size: int, repeats: int) -> None:
+    """ First page (results + summary aggregate) and second page (keyset, no summary) latency """
+    first_page: List[float] = []
+    second_page: List[float] = []
+    matches = 0
+
+    for _ in range(repeats):
+        with Timer(first_page):
+            _, summary, cursor = await search_comments(SUBREDDIT_NAME, search_query, page_size)
+        matches = summary["matches"]
+
+        if cursor is not None:
+            with Timer(second_page):
+                await search_comments(SUBREDDIT_NAME, search_query, page_size, cursor)
+
+    print(format_summary(f"'{search_query}' page 1 ({matches} matches)", first_page))
+    if second_page:
+        print(format_summary(f"'{search_query}' page 2", second_page))
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--comments", type=int, default=2_000_000)
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    await seed(args.comments)
+
+    # common word, rare word, AND of two words, phrase, exclusion
+    for search_query in ["wien", "oida", "kaffee melange", '"ubahn wohnung"', "miete -wien"]:
+        await bench_query(search_query, args.page_size, args.repeats)
+
+    await get_write_engine().dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,103 @@
+# ~/reddit_sentiment_tracker/benchmarks/serialization_benchmark.py
+"""
+Response serialization of the list endpoints: default path (response_model=List[PostsResponse] /
+List[CommentsResponse] validation + jsonable encoding) vs the fast path (FAST_JSON_RESPONSES:
+rows serialized directly, orjson if installed). Both routes run through FastAPI in-process with
+synthetic rows shaped like the crud.py output - no database, Redis or env vars needed.
+
+    python -m benchmarks.serialization_benchmark --iterations 200
+"""
+
+import argparse
+import asyncio
+import random
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+
+from benchmarks.common import asgi_request, Timer, format_summary
+from fastapi import FastAPI, Response
+from src.api import fast_json
+from src.api.models import PostsResponse, CommentsResponse
+
+
+def sentiment() -> Dict[str, float]:
+    neg, pos = round(random.random() / 2, 3), round(random.random() / 2, 3)
+    return {"neg": neg, "neu": round(1 - neg - pos, 3), "pos": pos, "compound": round(random.uniform(-1, 1), 4)}
+
+
+def make_posts(count: int) -> List[Dict[str, Any]]:
+    now = datetime.now()
+    return [{
+        "id": f"p{i}", "title": f"synthetic post title number {i} with some words", "author": f"user{i % 97}",
+        "created_utc": now - timedelta(minutes=i), "title_sentiment": sentiment(), "body_sentiment": sentiment(),
+        "score": random.randint(0, 50000), "upvote_ratio": round(random.random(), 2), "controversiality": 0.0,
+        "num_comments": random.randint(0, 900), "measured_at": now,
+    } for i in range(count)]
+
+
+def make_comments(count: int) -> List[Dict[str, Any]]:
+    now = datetime.now()
+    return [{
+        "id": f"c{i}", "author": f"user{i % 97}", "text": "synthetic comment text " * 4, "score": random.randint(-50, 900),
+        "created_utc": now - timedelta(minutes=i), "comment_sentiment": sentiment(), "measured_at": now,
+    } for i in range(count)]
+
+
+def build_app(datasets: Dict[str, List[Dict[str, Any]]]) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/default/posts/{size}", response_model=List[PostsResponse])
+    async def default_posts(size: str) -> List[Dict[str, Any]]:
+        return datasets[f"posts{size}"]
+
+    @app.get("/default/comments/{size}", response_model=List[CommentsResponse])
+    async def default_comments(size: str) -> List[Dict[str, Any]]:
+        return datasets[f"comments{size}"]
+
+    @app.get("/fast/posts/{size}", response_model=List[PostsResponse])
+    async def fast_posts(size: str, response: Response) -> Any:
+        return fast_json.fast_json_response(datasets[f"posts{size}"], response)
+
+    @app.get("/fast/comments/{size}", response_model=List[CommentsResponse])
+    async def fast_comments(size: str, response: Response) -> Any:
+        return fast_json.fast_json_response(datasets[f"comments{size}"], response)
+
+    return app
+
+
+async def bench(app: FastAPI, path: str, rows: int, iterations: int) -> bytes:
+    samples: List[float] = []
+    body = b""
+    for _ in range(iterations):
+        with Timer(samples):
+            status, body = await asgi_request(app, "GET", path)
+        assert status == 200, status
+
+    rows_per_second = rows * len(samples) / sum(samples)
+    print(format_summary(path, samples) + f"  {rows_per_second:10.0f} rows/s")
+    return body
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200, help="requests per route (10k rows: a tenth)")
+    args = parser.parse_args()
+
+    sizes = (100, 10_000)
+    datasets = {}
+    for size in sizes:
+        datasets[f"posts{size}"] = make_posts(size)
+        datasets[f"comments{size}"] = make_comments(size)
+    app = build_app(datasets)
+
+    print(f"fast path encoder: {'orjson' if fast_json.orjson is not None else 'stdlib json (orjson not installed)'}")
+    for size in sizes:
+        iterations = args.iterations if size <= 100 else max(10, args.iterations // 10)
+        for kind in ("posts", "comments"):
+            default_body = await bench(app, f"/default/{kind}/{size}", size, iterations)
+            fast_body = await bench(app, f"/fast/{kind}/{size}", size, iterations)
+            assert default_body == fast_body, f"{kind}: fast path output differs"
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
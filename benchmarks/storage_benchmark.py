@@ -0,0 +1,101 @@
+# ~/reddit_sentiment_tracker/benchmarks/storage_benchmark.py
+"""
+Ingest and read throughput of a storage backend through the crud.py API: collection batches
+(insert_top_posts + insert_post_sentiment), paged reads (retrieve_posts_data) alone and with
+--readers concurrent readers.
+
+Runs against the configured backend (DATABASE_URL or the Postgres env vars, migrations applied),
+or with --sqlite against a fresh SQLite file in a temp dir. Run both to compare the backends:
+
+    python -m benchmarks.storage_benchmark --sqlite --posts 20000
+    python -m benchmarks.storage_benchmark --posts 20000
+"""
+
+import os
+import time
+import uuid
+import asyncio
+import argparse
+import tempfile
+from datetime import datetime, timedelta
+from typing import List
+
+from benchmarks.common import Timer, format_summary
+from src.data_collection.records import PostRecord, SentimentScores
+from src.storage import connection
+from src.storage.crud import insert_subreddit_metadata, insert_top_posts, insert_post_sentiment, retrieve_posts_data
+
+
+def make_posts(run_id: str, count: int) -> List[PostRecord]:
+    """ Processed posts as the collection hands them to crud.py """
+    now = datetime.now()
+    return [PostRecord(
+        id=f"{run_id}_p{i}", author=f"user{i % 97}", created_utc=now - timedelta(seconds=7 * i),
+        num_comments=i % 50, url="https://reddit.com/r/wien", awards=0, edited=False, flair="Rant",
+        title=f"foodora mal wieder {i}",
+        title_sentiment=SentimentScores(neg=0.1, neu=0.8, pos=0.1, compound=round((i % 200) / 100 - 1, 4)),
+        selftext="foodora Fahrer rasen durch die Stadt :(",
+        body_sentiment=SentimentScores(neg=0.3, neu=0.7, pos=0.0, compound=-0.4),
+        score=i % 5000, upvote_ratio=0.9, controversiality=0.1,
+    ) for i in range(count)]
+
+
+async def ingest(posts: List[PostRecord], subreddit_id: str, batch: int) -> None:
+    samples: List[float] = []
+    started = time.perf_counter()
+    for offset in range(0, len(posts), batch):
+        with Timer(samples):
+            await insert_top_posts(posts[offset:offset + batch], subreddit_id)
+            await insert_post_sentiment(posts[offset:offset + batch], subreddit_id)
+    elapsed = time.perf_counter() - started
+    print(format_summary(f"ingest, batches of {batch}", samples) + f"  {len(posts) / elapsed:9.0f} posts/s")
+
+
+async def read_pages(name: str, pages: int, limit: int, samples: List[float]) -> int:
+    """ Page through the posts sorted by score - returns the rows read """
+    rows, cursor = 0, None
+    for _ in range(pages):
+        with Timer(samples):
+            page, cursor = await retrieve_posts_data(name, limit, "score", cursor)      # no cursor at the end: start over
+        rows += len(page)
+    return rows
+
+
+async def read(name: str, readers: int, pages: int, limit: int) -> None:
+    samples: List[float] = []
+    started = time.perf_counter()
+    rows = sum(await asyncio.gather(*(read_pages(name, pages, limit, samples) for _ in range(readers))))
+    elapsed = time.perf_counter() - started
+    print(format_summary(f"read pages of {limit}, {readers} reader/s", samples) + f"  {rows / elapsed:9.0f} rows/s")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sqlite", action="store_true", help="fresh SQLite file instead of the configured backend")
+    parser.add_argument("--posts", type=int, default=20_000)
+    parser.add_argument("--batch", type=int, default=100, help="posts per collection batch")
+    parser.add_argument("--pages", type=int, default=200, help="pages per reader")
+    parser.add_argument("--limit", type=int, default=100, help="posts per page")
+    parser.add_argument("--readers", type=int, default=8)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        if args.sqlite:
+            os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{tmp_dir}/tracker.db"
+        await connection.initialize_database()
+        print(f"Backend: {connection.get_write_engine().dialect.name}")
+
+        run_id = f"bench_storage_{uuid.uuid4().hex[:8]}"                  # fresh subreddit per run
+        await insert_subreddit_metadata({"id": run_id, "name": run_id, "description": "storage benchmark",
+                                         "subscriber_count": 0, "created_utc": datetime.now()})
+
+        await ingest(make_posts(run_id, args.posts), run_id, args.batch)
+        await read(run_id, 1, args.pages, args.limit)
+        await read(run_id, args.readers, args.pages, args.limit)
+
+        for engine in connection.created_engines():
+            await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
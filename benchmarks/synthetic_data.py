@@ -0,0 +1,217 @@
+# ~/reddit_sentiment_tracker/benchmarks/synthetic_data.py
+"""
+Bulk load synthetic subreddits into the configured database (Postgres or SQLite, see DATABASE_URL):
+posts, comment trees (replies up to --max-depth levels), and --snapshots sentiment snapshots per
+post/comment into the history tables, the last one into post_latest / comment_latest.
+
+Shaped like collected data: heavy tailed scores that grow between snapshots, a sentiment mood per
+subreddit, comments arriving after their post, words shared across subreddits for search.
+Deterministic per --seed. Subreddits are named synth000, synth001, ... - already loaded ones are skipped,
+each subreddit is loaded in one transaction.
+
+    python -m benchmarks.synthetic_data --subreddits 5 --posts 200000 --comments 20 --snapshots 4
+"""
+
+import time
+import random
+import asyncio
+import argparse
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Tuple
+
+from benchmarks import common  # noqa: F401 - project root on sys.path
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from src.storage import connection
+from src.storage.schema_manager import (subreddits, posts, comments, post_sentiment_history, post_latest,
+                                        comment_sentiment_history, comment_latest)
+
+# insert order (foreign keys): each chunk's rows are written table by table in this order
+TABLES = [posts, post_sentiment_history, post_latest, comments, comment_sentiment_history, comment_latest]
+
+WORDS = ("wien graz linz bim ubahn wohnung miete foodora radweg donauinsel schnee regen hitze prater kaffee "
+         "heuriger demo wahl stau baustelle konzert öffis würstelstand markt park fest bahnhof schule").split()
+POSITIVE = "super schön endlich danke gratuliere genial lieb großartig".split()
+NEGATIVE = "grauslich mühsam katastrophe teuer leider nervig gefährlich schlecht".split()
+FLAIRS = [None, "Rant", "Frage", "News", "Kultur", "Verkehr", "Politik"]
+
+
+def subreddit_name(index: int) -> str:
+    return f"synth{index:03d}"
+
+
+def sentiment(rng: random.Random, mood: float) -> Dict[str, float]:
+    """ VADER shaped scores around the subreddit's mood """
+    compound = max(-1.0, min(1.0, rng.gauss(mood, 0.45)))
+    pos, neg = max(compound, 0.0) * 0.6 * rng.random(), max(-compound, 0.0) * 0.6 * rng.random()
+    return {"neg": round(neg, 3), "neu": round(1 - neg - pos, 3), "pos": round(pos, 3), "compound": round(compound, 4)}
+
+
+def drift(rng: random.Random, scores: Dict[str, float]) -> Dict[str, float]:
+    """ Next snapshot of an edited text - mostly unchanged """
+    if rng.random() < 0.8:
+        return scores
+    compound = max(-1.0, min(1.0, scores["compound"] + rng.gauss(0, 0.1)))
+    return {**scores, "compound": round(compound, 4)}
+
+
+def sentence(rng: random.Random, words: int, mood: float) -> str:
+    tone = POSITIVE if rng.random() < (mood + 1) / 2 else NEGATIVE
+    return " ".join(rng.choice(tone) if rng.random() < 0.15 else rng.choice(WORDS) for _ in range(words))
+
+
+def snapshot_times(rng: random.Random, created: datetime, now: datetime, count: int) -> List[datetime]:
+    """ count measurement times between creation and now, oldest first """
+    span = max((now - created).total_seconds(), 1.0)
+    return sorted(created + timedelta(seconds=rng.uniform(0, span)) for _ in range(count))
+
+
+def comment_tree(rng: random.Random, count: int, max_depth: int) -> List[Tuple[int, int]]:
+    """ (parent index or -1, depth) per comment - parents always come first; replies favor recent comments """
+    tree: List[Tuple[int, int]] = []
+    for i in range(count):
+        if i == 0 or max_depth == 0 or rng.random() < 0.4:
+            tree.append((-1, 0))
+            continue
+        parent = max(0, i - 1 - int(rng.expovariate(0.3)))
+        depth = tree[parent][1] + 1
+        tree.append((parent, depth) if depth <= max_depth else (-1, 0))
+    return tree
+
+
+def generate_subreddit(index: int, post_count: int, comments_per_post: int, snapshots: int, days: int,
+                       max_depth: int, chunk: int, seed: int, now: datetime) -> Iterator[Dict[str, List[Dict[str, Any]]]]:
+    """ Rows of one subreddit per table name, chunk posts (and their comments) at a time """
+    rng = random.Random(seed * 1_000_003 + index)
+    subreddit_id = f"t5_{subreddit_name(index)}"
+    mood = rng.uniform(-0.4, 0.4)
+
+    for start in range(0, post_count, chunk):
+        rows: Dict[str, List[Dict[str, Any]]] = {table.name: [] for table in TABLES}
+
+        for p in range(start, min(start + chunk, post_count)):
+            post_id = f"s{index:03d}p{p}"
+            created = now - timedelta(seconds=rng.uniform(0, days * 86400))
+            comment_count = min(int(rng.expovariate(1 / comments_per_post)), comments_per_post * 20) if comments_per_post else 0
+
+            rows["posts"].append({
+                "id": post_id, "subreddit_id": subreddit_id, "author": f"user{rng.randrange(5000)}",
+                "post_type": "top" if rng.random() < 0.8 else "rising", "title": sentence(rng, rng.randint(4, 14), mood),
+                "selftext": sentence(rng, rng.randint(0, 60), mood), "url": f"https://reddit.com/r/{subreddit_name(index)}",
+                "flair": rng.choice(FLAIRS), "created_utc": created, "fetched_at": now,
+            })
+
+            # post snapshots: score grows towards the final score, sentiment mostly stable
+            final_score = int(rng.lognormvariate(3, 1.6))
+            title_sentiment, body_sentiment = sentiment(rng, mood), sentiment(rng, mood)
+            measured = snapshot_times(rng, created, now, snapshots)
+            for n, measured_at in enumerate(measured, start=1):
+                title_sentiment, body_sentiment = drift(rng, title_sentiment), drift(rng, body_sentiment)
+                rows["post_sentiment_history"].append({
+                    "post_id": post_id, "title_sentiment": title_sentiment, "body_sentiment": body_sentiment,
+                    "score": final_score * n // snapshots, "upvote_ratio": round(rng.uniform(0.5, 1.0), 2),
+                    "controversiality": round(rng.random() * 0.3, 3), "num_comments": comment_count * n // snapshots,
+                    "measured_at": measured_at,
+                })
+            last = rows["post_sentiment_history"][-1]
+            rows["post_latest"].append({
+                **{key: last[key] for key in ("post_id", "title_sentiment", "body_sentiment", "score", "upvote_ratio",
+                                              "controversiality", "num_comments", "measured_at")},
+                "subreddit_id": subreddit_id, "compound": title_sentiment["compound"], "created_utc": created,
+                "last_seen_at": now,
+            })
+
+            # comment tree: replies after their parent, all after the post
+            comment_created: List[datetime] = []
+            for c, (parent, depth) in enumerate(comment_tree(rng, comment_count, max_depth)):
+                comment_id = f"{post_id}c{c}"
+                after = comment_created[parent] if parent >= 0 else created
+                comment_created.append(min(now, after + timedelta(seconds=rng.expovariate(1 / 3600))))
+                rows["comments"].append({
+                    "id": comment_id, "post_id": post_id, "parent_comment_id": f"{post_id}c{parent}" if parent >= 0 else None,
+                    "depth": depth, "author": f"user{rng.randrange(5000)}", "text": sentence(rng, rng.randint(3, 40), mood),
+                    "score": 0, "created_utc": comment_created[c], "fetched_at": now,
+                })
+
+                comment_score = int(rng.lognormvariate(1, 1.5)) - rng.randrange(3)
+                comment_sentiment = sentiment(rng, mood)
+                for n, measured_at in enumerate(snapshot_times(rng, comment_created[c], now, snapshots), start=1):
+                    comment_sentiment = drift(rng, comment_sentiment)
+                    rows["comment_sentiment_history"].append({
+                        "comment_id": comment_id, "comment_sentiment": comment_sentiment,
+                        "score": comment_score * n // snapshots, "measured_at": measured_at,
+                    })
+                rows["comments"][-1]["score"] = comment_score
+                rows["comment_latest"].append({
+                    "comment_id": comment_id, "post_id": post_id, "subreddit_id": subreddit_id,
+                    "comment_sentiment": comment_sentiment, "score": comment_score,
+                    "compound": comment_sentiment["compound"], "created_utc": comment_created[c],
+                    "measured_at": rows["comment_sentiment_history"][-1]["measured_at"], "last_seen_at": now,
+                })
+
+        yield rows
+
+
+async def load(engine: AsyncEngine, count: int, post_count: int, comments_per_post: int, snapshots: int = 4,
+               days: int = 30, max_depth: int = 4, chunk: int = 500, seed: int = 42) -> Dict[str, int]:
+    """ Load synthetic subreddits 0..count-1 that aren't in the database yet - returns the rows written per table """
+    now = datetime.now().replace(microsecond=0)
+    written = {table.name: 0 for table in TABLES}
+
+    for index in range(count):
+        subreddit_id = f"t5_{subreddit_name(index)}"
+        started = time.perf_counter()
+
+        async with engine.begin() as conn:
+            if (await conn.execute(select(subreddits.c.id).where(subreddits.c.id == subreddit_id))).first():
+                print(f"{subreddit_name(index)}: already loaded")
+                continue
+
+            await conn.execute(subreddits.insert().values(
+                id=subreddit_id, name=subreddit_name(index), description="synthetic data", subscriber_count=post_count * 10,
+                created_utc=now - timedelta(days=3650), fetched_at=now,
+            ))
+            for rows in generate_subreddit(index, post_count, comments_per_post, snapshots, days, max_depth, chunk, seed, now):
+                for table in TABLES:
+                    if rows[table.name]:
+                        await conn.execute(table.insert(), rows[table.name])        # executemany, batched by the driver
+                        written[table.name] += len(rows[table.name])
+
+        print(f"{subreddit_name(index)}: loaded in {time.perf_counter() - started:.1f}s")
+
+    async with engine.begin() as conn:
+        for table in TABLES:
+            await conn.execute(text(f"ANALYZE {table.name}"))             # planner statistics for the new rows
+    return written
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--subreddits", type=int, default=3)
+    parser.add_argument("--posts", type=int, default=10_000, help="posts per subreddit")
+    parser.add_argument("--comments", type=int, default=10, help="mean comments per post (exponentially distributed)")
+    parser.add_argument("--snapshots", type=int, default=4, help="sentiment snapshots per post and comment")
+    parser.add_argument("--days", type=int, default=30, help="posts spread over the last N days")
+    parser.add_argument("--max-depth", type=int, default=4, help="deepest reply level")
+    parser.add_argument("--chunk", type=int, default=500, help="posts generated and inserted per batch")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    engine = connection.get_write_engine()
+    await connection.initialize_database()
+
+    started = time.perf_counter()
+    written = await load(engine, args.subreddits, args.posts, args.comments, args.snapshots, args.days,
+                         args.max_depth, args.chunk, args.seed)
+    elapsed = time.perf_counter() - started
+
+    for table, rows in written.items():
+        print(f"{table:<28} {rows:>12,} rows")
+    print(f"{sum(written.values()):,} rows in {elapsed:.1f}s ({sum(written.values()) / elapsed:,.0f} rows/s)")
+
+    for engine in connection.created_engines():
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
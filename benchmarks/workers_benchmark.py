@@ -0,0 +1,174 @@
+# ~/reddit_sentiment_tracker/benchmarks/workers_benchmark.py
+"""
+Multi-worker mode: memory per worker and throughput from 1 to N workers.
+
+memory (default): imports the app in this process and forks --workers children like gunicorn does,
+each child scores texts with VADER and checks passwords with zxcvbn, then reports RSS, PSS (shared
+pages divided among the processes using them) and USS (pages only this process uses). Compares
+preload + gc.freeze (gunicorn.conf.py), preload without freeze, and importing after fork.
+Needs the usual env vars (.env) for importing the app, no database or Redis.
+
+scaling: starts gunicorn -c gunicorn.conf.py with 1..N workers and loads --path with --concurrency
+connections for --duration seconds. Needs the database (app startup) and gunicorn.
+
+    python -m benchmarks.workers_benchmark --workers 4
+    python -m benchmarks.workers_benchmark scaling --workers 1,2,4 --path /health
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+from benchmarks.common import format_summary
+
+TEXTS = [f"Post number {i}: the weather in Vienna is {'great :)' if i % 3 else 'terrible, not good at all'}" for i in range(2000)]
+PASSWORDS = ["hunter2", "correct horse battery staple", "Tr0ub4dor&3", "wien2024!"]
+
+
+def memory_kb(pid: int) -> Dict[str, int]:
+    """ Rss / Pss / Uss of a process from /proc/<pid>/smaps_rollup (Linux) """
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup") as smaps:
+        for line in smaps:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                values[parts[0].rstrip(":")] = int(parts[1])
+    return {"rss": values["Rss"], "pss": values["Pss"],
+            "uss": values["Private_Clean"] + values["Private_Dirty"]}
+
+
+def worker(import_after_fork: bool, barrier, results, done) -> None:
+    if import_after_fork:
+        import server  # noqa: F401
+    else:
+        from src.process_lifecycle import reset_after_fork
+        reset_after_fork()
+
+    from src.api.password_validation import validate_password_strength
+    from src.sentiment_analysis.sentiment_analyzer import analyze_sentiment
+
+    for text in TEXTS:
+        analyze_sentiment(text)
+    for password in PASSWORDS:
+        try:
+            validate_password_strength(password)
+        except ValueError:
+            pass
+
+    barrier.wait()                      # all workers alive and warm - PSS splits shared pages among them
+    results.put(memory_kb(os.getpid()))
+    done.wait()
+
+
+def run_memory(mode: str, workers: int) -> None:
+    """ One scenario in a fresh interpreter so the modes don't share imports """
+    context = multiprocessing.get_context("fork")
+
+    if mode != "import-after-fork":
+        import server  # noqa: F401
+        from src.process_lifecycle import preload_shared_state
+        preload_shared_state(freeze=mode == "preload+freeze")
+
+    barrier, results, done = context.Barrier(workers + 1), context.Queue(), context.Event()
+    processes = [context.Process(target=worker, args=(mode == "import-after-fork", barrier, results, done))
+                 for _ in range(workers)]
+    for process in processes:
+        process.start()
+
+    barrier.wait()
+    per_worker = [results.get() for _ in processes]
+    master = memory_kb(os.getpid())
+    done.set()
+    for process in processes:
+        process.join()
+
+    mean = {key: sum(m[key] for m in per_worker) / workers / 1024 for key in ("rss", "pss", "uss")}
+    total_pss = (sum(m["pss"] for m in per_worker) + master["pss"]) / 1024
+    print(f"{mode:<20} workers={workers}  per worker: RSS {mean['rss']:6.1f}MB  PSS {mean['pss']:6.1f}MB  "
+          f"USS {mean['uss']:6.1f}MB   total PSS incl. master {total_pss:6.1f}MB")
+
+
+def wait_until_up(url: str, timeout: float) -> None:
+    import urllib.request
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            urllib.request.urlopen(url, timeout=1).read()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"server at {url} did not come up")
+            time.sleep(0.2)
+
+
+async def load(url: str, concurrency: int, duration: float, token: str) -> List[float]:
+    import aiohttp
+
+    samples: List[float] = []
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+    deadline = time.perf_counter() + duration
+
+    async with aiohttp.ClientSession(headers=headers) as session:
+        async def client() -> None:
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                async with session.get(url) as response:
+                    await response.read()
+                samples.append(time.perf_counter() - started)
+
+        await asyncio.gather(*(client() for _ in range(concurrency)))
+    return samples
+
+
+def tree_pss_mb(pid: int) -> float:
+    """ PSS of a gunicorn master and its workers """
+    children = subprocess.run(["pgrep", "-P", str(pid)], capture_output=True, text=True).stdout.split()
+    return sum(memory_kb(int(p))["pss"] for p in [pid, *children]) / 1024
+
+
+def run_scaling(worker_counts: List[int], path: str, concurrency: int, duration: float, port: int, token: str) -> None:
+    url = f"http://127.0.0.1:{port}{path}"
+
+    for count in worker_counts:
+        env = {**os.environ, "WEB_CONCURRENCY": str(count), "PORT": str(port)}
+        gunicorn = subprocess.Popen([sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "server:app"],
+                                    env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            wait_until_up(f"http://127.0.0.1:{port}/health", timeout=30)
+            samples = asyncio.run(load(url, concurrency, duration, token))
+            print(format_summary(f"{path} workers={count}", samples)
+                  + f"  {len(samples) / duration:8.0f} req/s  PSS {tree_pss_mb(gunicorn.pid):6.1f}MB")
+        finally:
+            gunicorn.terminate()
+            gunicorn.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", nargs="?", default="memory", choices=["memory", "scaling"])
+    parser.add_argument("--workers", default="4", help="memory: worker count, scaling: comma separated counts")
+    parser.add_argument("--mode", default=None, help=argparse.SUPPRESS)        # internal: one memory scenario
+    parser.add_argument("--path", default="/health")
+    parser.add_argument("--token", default="", help="bearer token for authenticated paths")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--port", type=int, default=8099)
+    args = parser.parse_args()
+
+    if args.command == "scaling":
+        run_scaling([int(n) for n in args.workers.split(",")], args.path, args.concurrency, args.duration, args.port, args.token)
+    elif args.mode:
+        run_memory(args.mode, int(args.workers))
+    else:
+        for mode in ("import-after-fork", "preload", "preload+freeze"):
+            subprocess.run([sys.executable, "-m", "benchmarks.workers_benchmark", "--workers", args.workers, "--mode", mode],
+                           check=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+# ~/reddit_sentiment_tracker/gunicorn.conf.py
+"""
+Multi-worker serving: gunicorn master with uvicorn workers
+
+    gunicorn -c gunicorn.conf.py server:app
+
+The app is imported once in the master (preload_app) and the read-only tables are loaded there before
+the workers are forked, so they are shared copy-on-write. Each worker creates its own DB and Redis pools.
+Pools and thread pools are per worker: total DB connections = WEB_CONCURRENCY x (pool size + overflow).
+Log files are written by one process only: with WEB_CONCURRENCY > 1 the workers log to stdout.
+"""
+
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+worker_class = "uvicorn_worker.UvicornWorker"    # uvicorn.workers is deprecated in favour of the uvicorn-worker package
+preload_app = True
+timeout = int(os.getenv("WORKER_TIMEOUT", "60"))          # seconds without heartbeat before a worker is restarted
+graceful_timeout = 30
+keepalive = 5
+
+
+def when_ready(server):
+    """ Master: app imported, workers not forked yet """
+    from src.process_lifecycle import preload_shared_state
+    preload_shared_state()
+
+
+def post_fork(server, worker):
+    """ Worker: first thing after fork - with several workers they log to stdout only (no shared log files) """
+    from src.process_lifecycle import reset_after_fork
+    reset_after_fork(file_logging=server.num_workers <= 1)
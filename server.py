@@ -1,23 +1,46 @@
 # ~/reddit_sentiment_tracker/server.py
 
 import sys
+import asyncio
 from datetime import datetime, timezone
 from contextlib import asynccontextmanager
-from typing import Any, Dict, List, AsyncGenerator
-from fastapi import FastAPI, HTTPException, Depends, Path, Query
+from typing import Any, Dict, List, Optional, Union, AsyncGenerator, AsyncIterator
+from fastapi import FastAPI, HTTPException, Depends, Path, Query, Header, Response
+from fastapi.responses import StreamingResponse, FileResponse
+from sqlalchemy.exc import IntegrityError
 from src.storage.schema_manager import users
 from src.api.models import (RegisterRequest, RegisterResponse, 
                             LoginRequest, LoginResponse,
                             MetadataResponse, PostsResponse, CommentsResponse,
-                            CollectionResponse)
-from src.api.auth_service import create_access_token
-from src.api.rate_limiting import rate_limit_check
+                            CollectionResponse, PostSearchResponse, CommentSearchResponse,
+                            TimeseriesResponse, CompareResponse)
+from src.api.auth_service import create_access_token, jwt_settings
+from src.api.rate_limiting import rate_limit_check, start_rate_limit_sync, stop_rate_limit_sync
+from src.api.live_feed import live_broker, event_stream, start_live_feed, stop_live_feed, LiveFeedFullError
+from src.api.fast_json import fast_json_response
+from src.api.request_tracing import TracingMiddleware, TracedRoute, close_trace_exporter
+from src.api.request_profiling import ProfilingMiddleware, require_profile_admin
 from src.api.bcrypt_hashing import hash_password, verify_password
+from src.api.password_executor import run_password_task, password_pool_status, shutdown_password_executor, PasswordPoolSaturatedError
 from src.api.password_validation import validate_password_strength
-from src.storage.connection import initialize_database
-from src.storage.crud import retrieve_metadata, retrieve_posts_data, retrieve_comments_data, db_session
+from src.storage.connection import initialize_database, pool_status
+from src.storage.redis_connection import init_redis, close_redis
+from src.data_collection.reddit_client import close_reddit_client
+from src.api.response_cache import (cached_response, cached_multi_response, cache_stats,
+                                   conditional_get, not_modified_response)
+from src.storage.crud import (retrieve_metadata, retrieve_posts_data, retrieve_comments_data,
+                              search_posts, search_comments, db_session,
+                              retrieve_subreddit_id, stream_export, export_columns,
+                              retrieve_sentiment_timeseries, compare_subreddits)
+from src.utils.export_formats import encode_export, EXPORT_MEDIA_TYPES
+from src.utils.pagination import InvalidCursorError
+from src.utils.timeseries import resolve_time_range, InvalidTimeRangeError
+from src.utils.profiling import list_profiles, profile_path
+from src.utils import metrics
 from src.logger import setup_logger
-from src.config import RATE_LIMIT_RISING_POSTS, RATE_LIMIT_TOP_POSTS, COMMENT_LIMIT, TOP_POSTS_TIME_FILTER, REPLY_DEPTH
+from src.config import (RATE_LIMIT_RISING_POSTS, RATE_LIMIT_TOP_POSTS, COMMENT_LIMIT, TOP_POSTS_TIME_FILTER, REPLY_DEPTH,
+                        TIMESERIES_DEFAULT_DAYS, TIMESERIES_MAX_BUCKETS, COMPARE_MAX_SUBREDDITS, FAST_JSON_RESPONSES,
+                        TRACING_ENABLED, PROFILE_ADMIN_TOKEN)
 from src.data_pipeline_orchestrator import (reddit_client, get_subreddit_metadata,
                                          subreddit_data_into_db, get_top_posts, top_posts_data_into_db,
                                          comments_top_posts_into_db, get_rising_posts, rising_posts_data_into_db,
@@ -33,7 +56,11 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     logger.info("Reddit Sentiment Tracker API starting up...")     # startup
 
     try:
+        jwt_settings()                                          # fail early if JWT_KEY / JWT_ALGORITHM are missing
         await initialize_database()
+        await init_redis()
+        start_rate_limit_sync()
+        start_live_feed()
         logger.info("Startup completed successfully")
     except Exception as e:
         logger.critical(f"Startup failed: {e}", exc_info=True)
@@ -42,6 +69,12 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     yield                                                               # app runs here between startup and shutdown
 
     logger.info("Reddit Sentiment Tracker API shutting down...")   # shutdown
+    await stop_rate_limit_sync()
+    await stop_live_feed()
+    await close_redis()
+    await close_reddit_client()
+    shutdown_password_executor()
+    close_trace_exporter()
 
 
 # creating FastAPI Instance
@@ -52,6 +85,13 @@ app = FastAPI(
     lifespan=lifespan                                                   # passing the lifespan context manager to handle startup/shutdown
 )
 
+if TRACING_ENABLED:
+    app.router.route_class = TracedRoute                                # endpoint / serialization spans - set before the routes below
+    app.add_middleware(TracingMiddleware)                               # Server-Timing header, slow request log
+
+if PROFILE_ADMIN_TOKEN:
+    app.add_middleware(ProfilingMiddleware)                             # X-Profile requests (outermost: profile includes tracing)
+
 
 @app.get(
     "/health",
@@ -70,9 +110,58 @@ async def health_check() -> dict[str, Any]:
     }
 
 
+@app.get(
+    "/metrics",
+    tags=["monitoring"],
+    summary="API Metrics",
+    description="In-process metrics: connection pool utilization, pool wait times and counters"
+)
+async def get_metrics() -> dict[str, Any]:
+    """ Metrics endpoint for monitoring the API process """
+    return {
+        "timestamp": datetime.now(timezone.utc),
+        "db_pools": pool_status(),
+        "password_pool": password_pool_status(),
+        "response_cache": cache_stats(),
+        "live_subscribers": live_broker.subscriber_count,
+        **metrics.snapshot()
+    }
+
+
+@app.get(
+    "/profiles",
+    tags=["monitoring"],
+    summary="Stored Profiles",
+    description="Profiles of requests sent with X-Profile (and of collection runs on this host), newest first - requires X-Profile-Token",
+    dependencies=[Depends(require_profile_admin)]
+)
+async def get_profiles() -> dict[str, Any]:
+    """ List the stored profiles """
+    return {"profiles": await asyncio.to_thread(list_profiles)}
+
+
+@app.get(
+    "/profiles/{profile_id}",
+    tags=["monitoring"],
+    summary="Download a Profile",
+    description="cProfile stats (.pstats: python -m pstats, snakeviz) or speedscope JSON (https://www.speedscope.app) - requires X-Profile-Token",
+    response_class=FileResponse,
+    dependencies=[Depends(require_profile_admin)]
+)
+async def download_profile(
+    profile_id: str = Path(..., max_length=100, description="X-Profile-Id of the profiled response")
+) -> FileResponse:
+    """ Download one stored profile """
+    path = profile_path(profile_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail=f"No profile '{profile_id}' (written once the profiled response is complete)")
+
+    media_type = "application/json" if path.name.endswith(".json") else "application/octet-stream"
+    return FileResponse(path, media_type=media_type, filename=path.name)
+
+
 @app.post(
     "/collect/{subreddit_name}",
-    dependencies=[Depends(rate_limit_check)],
     response_model=CollectionResponse,
     tags=["collection"],
     summary="Subreddit Data Collection",
@@ -86,7 +175,7 @@ async def collect_data(
     subreddit_name = subreddit_name.lower()
 
     try:
-        # Getting Reddit Client
+        # Getting Reddit Client - shared by all collections of this worker, closed in the lifespan (not per request)
         reddit = await reddit_client()
         if not reddit:
             logger.error(f"Failed to retrieve reddit client")
@@ -112,13 +201,14 @@ async def collect_data(
             logger.error(f"Failed to fetch top posts - skipping insertion of top posts data and top posts sentiment into DB")
         else:
             # Inserting Top Posts into DB (with Sentiment)
-            await top_posts_data_into_db(top_posts_data, subreddit_id)
+            await top_posts_data_into_db(top_posts_data, subreddit_id, subreddit_name)
             # Commments (top posts) fetching + Inserting into DB
             await comments_top_posts_into_db(
                 top_posts_data,
                 reddit,
                 REPLY_DEPTH,
-                COMMENT_LIMIT
+                COMMENT_LIMIT,
+                subreddit_name
             )
 
         # Rising Posts fetching
@@ -131,13 +221,14 @@ async def collect_data(
             logger.error(f"Failed to fetch rising posts skipping insertion of rising posts data and rising posts sentiment into DB")
         else:
             # Inserting Rising Posts into DB (with Sentiment)
-            await rising_posts_data_into_db(rising_posts_data, subreddit_id)
+            await rising_posts_data_into_db(rising_posts_data, subreddit_id, subreddit_name)
             # Rising Posts Comments fetching + Inserting into Db (with Sentiment)
             await comments_rising_posts_into_db(
                 rising_posts_data,
                 reddit,
                 REPLY_DEPTH,
-                COMMENT_LIMIT
+                COMMENT_LIMIT,
+                subreddit_name
             )
 
         return CollectionResponse(
@@ -151,28 +242,34 @@ async def collect_data(
     except (ValueError, Exception) as e:
         logger.error(f"Data Collection: Pipeline failed for subreddit '{subreddit_name}': {e}", exc_info=True)
         raise HTTPException(status_code=500, detail="Internal server error during Collection of Data")
-    finally:
-        if reddit:
-            await reddit.close()
 
 
 @app.get(
     "/subreddit_metadata/{subreddit_name}", 
-    dependencies=[Depends(rate_limit_check)],
     response_model=MetadataResponse,
     tags=["subreddits"],
     summary="Get Subreddit Metadata",
     description="Retrieve comprehensive Metadata for a specific Subreddit such as the description, subscriber count, date of creation"
 )
 async def get_subreddit_metadata(
+    response: Response,
     subreddit_name: str = Path(..., min_length=2, max_length=21, description="Subreddit name (2-21 characters)"),
+    if_none_match: Optional[str] = Header(None, description="ETag of a previous response - answered with 304 if unchanged"),
     user_id: str = Depends(rate_limit_check)
-) -> MetadataResponse:
+) -> Union[MetadataResponse, Response]:
     """ Get Subreddit Metadata (name, description, subscriber count, created at) endpoint """
     subreddit_name = subreddit_name.lower()
 
     try:
-        subreddit_metadata = await retrieve_metadata(subreddit_name)
+        generation, current_etag = await conditional_get("subreddit_metadata", subreddit_name, {}, if_none_match, response)
+        if current_etag is not None:
+            return not_modified_response(current_etag)
+
+        subreddit_metadata = await cached_response(
+            "subreddit_metadata", subreddit_name, {},
+            lambda: retrieve_metadata(subreddit_name),
+            generation
+        )
 
         if subreddit_metadata is None:
             logger.warning(f"No data for '{subreddit_name}' in DB found")
@@ -194,32 +291,52 @@ async def get_subreddit_metadata(
 
 @app.get(
     "/posts/{subreddit_name}", 
-    dependencies=[Depends(rate_limit_check)],
     response_model=List[PostsResponse],
     tags=["posts"],
     summary="Get Posts Data with corresponding Sentiments",
     description="Retrieve comprehensive data for Posts of a specific Subreddit such as author, title, upvote ratio, number of comments, post sentiment, controversiality"
 )
 async def get_posts(
+    response: Response,
     subreddit_name: str = Path(..., min_length=2, max_length=21, description="Subreddit name (2-21 characters)"),
     limit: int = Query(5, ge=1, le=100),
+    sort: str = Query("score", pattern="^(created_utc|score|compound)$", description="Sort key (descending): created_utc, score or compound"),
+    cursor: Optional[str] = Query(None, max_length=512, description="Opaque next page token from the X-Next-Cursor header of the previous page"),
+    if_none_match: Optional[str] = Header(None, description="ETag of a previous response - answered with 304 if unchanged"),
     user_id: str = Depends(rate_limit_check)
-) -> List[Dict[str, Any]]:
+) -> Union[List[Dict[str, Any]], Response]:
     """ Get Posts data with Sentiments endpoint """
     subreddit_name = subreddit_name.lower()
 
     try:
-        posts_data = await retrieve_posts_data(subreddit_name, limit)
+        params = {"limit": limit, "sort": sort, "cursor": cursor}
+        generation, current_etag = await conditional_get("posts", subreddit_name, params, if_none_match, response)
+        if current_etag is not None:
+            return not_modified_response(current_etag)       # no query, no serialization
+
+        async def load_posts_page() -> Dict[str, Any]:
+            items, next_cursor = await retrieve_posts_data(subreddit_name, limit, sort, cursor)
+            return {"items": items, "next_cursor": next_cursor}
+
+        page = await cached_response("posts", subreddit_name, params, load_posts_page, generation)
+        posts_data, next_cursor = page["items"], page["next_cursor"]
 
         if posts_data is None:
             logger.warning(f"No Posts Data for '{subreddit_name}' in DB found")
             raise HTTPException(status_code=404, detail=f"No database entry for posts of subreddit: '{subreddit_name}' found")
 
+        if next_cursor is not None:
+            response.headers["X-Next-Cursor"] = next_cursor
+
         logger.info(f"Posts data for Subreddit '{subreddit_name}' successfully retrieved")
+        if FAST_JSON_RESPONSES:
+            return fast_json_response(posts_data, response)     # rows already match PostsResponse
         return posts_data
 
     except HTTPException:
         raise
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error retrieving Posts Data of Subreddit '{subreddit_name}': {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
@@ -227,37 +344,298 @@ async def get_posts(
 
 @app.get(
     "/comments/{subreddit_name}", 
-    dependencies=[Depends(rate_limit_check)],
     response_model=List[CommentsResponse],
     tags=["comments"],
     summary="Get Comments data with corresponding Sentiments",
     description="Retrieve comprehensive data for Comments of a specific Post from a specific Subreddit such as author, comment sentiment, comment score, date of creation"
 )
 async def get_comments(
+    response: Response,
     subreddit_name: str = Path(..., min_length=2, max_length=21, description="Subreddit name (2-21 characters)"),
     limit: int = Query(5, ge=1, le=100),
-    user_id: str= Depends(rate_limit_check)
-) -> List[Dict[str, Any]]:
+    sort: str = Query("score", pattern="^(created_utc|score|compound)$", description="Sort key (descending): created_utc, score or compound"),
+    cursor: Optional[str] = Query(None, max_length=512, description="Opaque next page token from the X-Next-Cursor header of the previous page"),
+    if_none_match: Optional[str] = Header(None, description="ETag of a previous response - answered with 304 if unchanged"),
+    user_id: str = Depends(rate_limit_check)
+) -> Union[List[Dict[str, Any]], Response]:
     """ Get Comments with Sentiments endpoint """
     subreddit_name = subreddit_name.lower()
 
     try:
-        comments_data = await retrieve_comments_data(subreddit_name, limit)
+        params = {"limit": limit, "sort": sort, "cursor": cursor}
+        generation, current_etag = await conditional_get("comments", subreddit_name, params, if_none_match, response)
+        if current_etag is not None:
+            return not_modified_response(current_etag)       # no query, no serialization
+
+        async def load_comments_page() -> Dict[str, Any]:
+            items, next_cursor = await retrieve_comments_data(subreddit_name, limit, sort, cursor)
+            return {"items": items, "next_cursor": next_cursor}
+
+        page = await cached_response("comments", subreddit_name, params, load_comments_page, generation)
+        comments_data, next_cursor = page["items"], page["next_cursor"]
 
         if comments_data is None:
             logger.warning(f"No Comments data for Subreddit '{subreddit_name}' found")
             raise HTTPException(status_code=404, detail=f"No database entry for comments of subreddit: '{subreddit_name}' found")
 
+        if next_cursor is not None:
+            response.headers["X-Next-Cursor"] = next_cursor
+
         logger.info(f"Comments data for Subreddit '{subreddit_name}' successfully retrieved")
+        if FAST_JSON_RESPONSES:
+            return fast_json_response(comments_data, response)  # rows already match CommentsResponse
         return comments_data
 
     except HTTPException:
         raise
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error retrieving Comments data of Subreddit '{subreddit_name}': {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
+@app.get(
+    "/search/{subreddit_name}/posts",
+    response_model=PostSearchResponse,
+    tags=["search"],
+    summary="Full text search over Posts with Sentiment summary",
+    description="Search post titles and bodies of a Subreddit (websearch syntax: words, \"phrases\", OR, -exclude). Returns matches with their latest sentiment, newest first, and a sentiment summary of all matches"
+)
+async def search_subreddit_posts(
+    subreddit_name: str = Path(..., min_length=2, max_length=21, description="Subreddit name (2-21 characters)"),
+    q: str = Query(..., min_length=2, max_length=200, description="Search query"),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, max_length=512, description="Opaque next page token (next_cursor of the previous page)"),
+    user_id: str = Depends(rate_limit_check)
+) -> PostSearchResponse:
+    """ Full text search over Posts endpoint """
+    subreddit_name = subreddit_name.lower()
+
+    try:
+        items, summary, next_cursor = await search_posts(subreddit_name, q, limit, cursor)
+
+        logger.info(f"Post search '{q}' in Subreddit '{subreddit_name}' returned {len(items)} matches")
+        # rows and summary are dicts from crud.py - validated into the response model
+        return PostSearchResponse.model_validate({
+            "status": "success", "query": q, "summary": summary, "items": items, "next_cursor": next_cursor
+        })
+
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error searching Posts of Subreddit '{subreddit_name}': {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+
+@app.get(
+    "/search/{subreddit_name}/comments",
+    response_model=CommentSearchResponse,
+    tags=["search"],
+    summary="Full text search over Comments with Sentiment summary",
+    description="Search comment texts of a Subreddit (websearch syntax: words, \"phrases\", OR, -exclude). Returns matches with their latest sentiment, newest first, and a sentiment summary of all matches"
+)
+async def search_subreddit_comments(
+    subreddit_name: str = Path(..., min_length=2, max_length=21, description="Subreddit name (2-21 characters)"),
+    q: str = Query(..., min_length=2, max_length=200, description="Search query"),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, max_length=512, description="Opaque next page token (next_cursor of the previous page)"),
+    user_id: str = Depends(rate_limit_check)
+) -> CommentSearchResponse:
+    """ Full text search over Comments endpoint """
+    subreddit_name = subreddit_name.lower()
+
+    try:
+        items, summary, next_cursor = await search_comments(subreddit_name, q, limit, cursor)
+
+        logger.info(f"Comment search '{q}' in Subreddit '{subreddit_name}' returned {len(items)} matches")
+        # rows and summary are dicts from crud.py - validated into the response model
+        return CommentSearchResponse.model_validate({
+            "status": "success", "query": q, "summary": summary, "items": items, "next_cursor": next_cursor
+        })
+
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error searching Comments of Subreddit '{subreddit_name}': {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+
+@app.get(
+    "/sentiment/{subreddit_name}/timeseries",
+    response_model=TimeseriesResponse,
+    tags=["sentiment"],
+    summary="Sentiment over time",
+    description="Per hour/day bucket: number of posts or comments observed, mean, score weighted mean and quartiles of their compound score at the end of the bucket, as column arrays - unchanged snapshots are carried forward until the post/comment changes or was last seen"
+)
+async def get_sentiment_timeseries(
+    response: Response,
+    subreddit_name: str = Path(..., min_length=2, max_length=21, description="Subreddit name (2-21 characters)"),
+    bucket: str = Query("day", pattern="^(hour|day)$", description="Bucket size: hour or day"),
+    source: str = Query("posts", pattern="^(posts|comments)$", description="posts (title sentiment) or comments"),
+    start: Optional[datetime] = Query(None, alias="from", description=f"Range start (ISO 8601), default: {TIMESERIES_DEFAULT_DAYS} days before 'to'"),
+    end: Optional[datetime] = Query(None, alias="to", description="Range end (ISO 8601), default: now"),
+    if_none_match: Optional[str] = Header(None, description="ETag of a previous response - answered with 304 if unchanged"),
+    user_id: str = Depends(rate_limit_check)
+) -> Union[TimeseriesResponse, Response]:
+    """ Sentiment time series endpoint """
+    subreddit_name = subreddit_name.lower()
+
+    try:
+        range_start, range_end = resolve_time_range(start, end, bucket, TIMESERIES_DEFAULT_DAYS, TIMESERIES_MAX_BUCKETS)
+    except InvalidTimeRangeError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        # raw query values as cache key - an open range ("to" = now) is served from cache until new data arrives
+        params = {"bucket": bucket, "source": source, "from": start, "to": end}
+        generation, current_etag = await conditional_get("timeseries", subreddit_name, params, if_none_match, response)
+        if current_etag is not None:
+            return not_modified_response(current_etag)
+
+        async def load_timeseries() -> Optional[Dict[str, Any]]:
+            columns = await retrieve_sentiment_timeseries(subreddit_name, source, bucket, range_start, range_end)
+            if columns is None:
+                return None
+            return {"start": range_start, "end": range_end, **columns}
+
+        series = await cached_response("timeseries", subreddit_name, params, load_timeseries, generation)
+
+        if series is None:
+            raise HTTPException(status_code=404, detail=f"No database entry for subreddit: '{subreddit_name}'")
+
+        return TimeseriesResponse(
+            status="success",
+            subreddit=subreddit_name,
+            source=source,
+            bucket=bucket,
+            start=series["start"],
+            end=series["end"],
+            buckets=series["bucket"],
+            count=series["count"],
+            mean=series["mean"],
+            weighted_mean=series["weighted_mean"],
+            p25=series["p25"],
+            median=series["median"],
+            p75=series["p75"]
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error retrieving sentiment time series of Subreddit '{subreddit_name}': {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+
+@app.get(
+    "/stream/{subreddit_name}",
+    tags=["sentiment"],
+    summary="Live sentiment feed",
+    description="Server-Sent Events: newly written posts/comments of a Subreddit with their sentiment and rolling aggregates, as the collection pipeline stores them",
+    response_class=StreamingResponse
+)
+async def stream_subreddit(
+    subreddit_name: str = Path(..., min_length=2, max_length=21, description="Subreddit name (2-21 characters)"),
+    user_id: str = Depends(rate_limit_check)
+) -> StreamingResponse:
+    """ Live feed endpoint - one rate limited request per connection """
+    subreddit_name = subreddit_name.lower()
+
+    # subscribed before the 200 is sent - the stream's finally unsubscribes (a body that never starts is dropped on overflow)
+    try:
+        subscriber = live_broker.subscribe(subreddit_name)
+    except LiveFeedFullError:
+        raise HTTPException(status_code=503, detail="Too many live streams open, try again later")
+
+    logger.info(f"User {user_id} opened the live feed of 'r/{subreddit_name}'")
+    return StreamingResponse(
+        event_stream(subreddit_name, subscriber),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}     # no proxy buffering
+    )
+
+
+@app.get(
+    "/compare",
+    response_model=CompareResponse,
+    tags=["sentiment"],
+    summary="Compare Subreddits side by side",
+    description=f"Sentiment aggregates (mean/median compound, positive/negative share, volume, controversiality) of up to {COMPARE_MAX_SUBREDDITS} Subreddits, computed in one query"
+)
+async def compare_subreddit_sentiment(
+    subreddits: List[str] = Query(..., description="Subreddit names - repeated (?subreddits=a&subreddits=b) or comma separated"),
+    user_id: str = Depends(rate_limit_check)
+) -> CompareResponse:
+    """ Cross subreddit comparison endpoint """
+    # flatten comma separated values, keep the requested order, drop duplicates
+    names = list(dict.fromkeys(
+        name.strip().lower() for value in subreddits for name in value.split(",") if name.strip()
+    ))
+
+    invalid = [name for name in names if not 2 <= len(name) <= 21]
+    if invalid:
+        raise HTTPException(status_code=400, detail=f"Invalid subreddit names (2-21 characters): {invalid}")
+    if not names or len(names) > COMPARE_MAX_SUBREDDITS:
+        raise HTTPException(status_code=400, detail=f"Between 1 and {COMPARE_MAX_SUBREDDITS} subreddits can be compared")
+
+    try:
+        comparison = await cached_multi_response("compare", names, {}, lambda: compare_subreddits(names))
+
+        by_name = {row["name"]: row for row in comparison}
+        logger.info(f"Compared {len(by_name)} Subreddits")
+
+        return CompareResponse.model_validate({
+            "status": "success",
+            "subreddits": [by_name[name] for name in names if name in by_name],     # rows from crud.py
+            "missing": [name for name in names if name not in by_name]
+        })
+
+    except Exception as e:
+        logger.error(f"Error comparing Subreddits {names}: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+
+@app.get(
+    "/export/{subreddit_name}/{dataset}",
+    tags=["export"],
+    summary="Bulk export of a Subreddit's data",
+    description="Stream the complete dataset of a Subreddit (posts, comments, post_history, comment_history) as NDJSON or CSV - no row limit, rows are streamed from a server-side cursor"
+)
+async def export_subreddit_data(
+    subreddit_name: str = Path(..., min_length=2, max_length=21, description="Subreddit name (2-21 characters)"),
+    dataset: str = Path(..., pattern="^(posts|comments|post_history|comment_history)$", description="posts, comments, post_history or comment_history"),
+    export_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$", description="ndjson or csv"),
+    user_id: str = Depends(rate_limit_check)
+) -> StreamingResponse:
+    """ Bulk export endpoint - constant memory regardless of the export size """
+    subreddit_name = subreddit_name.lower()
+
+    try:
+        subreddit_id = await retrieve_subreddit_id(subreddit_name)
+    except Exception as e:
+        logger.error(f"Error starting export of Subreddit '{subreddit_name}': {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+    if subreddit_id is None:
+        raise HTTPException(status_code=404, detail=f"No database entry for subreddit: '{subreddit_name}'")
+
+    async def export_body() -> AsyncIterator[bytes]:
+        # status and headers are already sent - a failure can only abort the stream
+        try:
+            async for chunk in encode_export(stream_export(subreddit_id, dataset), export_columns(dataset), export_format):
+                yield chunk
+        except Exception as e:
+            logger.error(f"Export '{dataset}' of Subreddit '{subreddit_name}' aborted: {e}", exc_info=True)
+            raise
+
+    logger.info(f"Export '{dataset}' ({export_format}) of Subreddit '{subreddit_name}' started")
+    return StreamingResponse(
+        export_body(),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{subreddit_name}_{dataset}.{export_format}"'}
+    )
+
+
 @app.post(
     "/register", 
     response_model=RegisterResponse,
@@ -284,25 +662,38 @@ async def register(request: RegisterRequest) -> RegisterResponse:
                 logger.warning(f"Registration failed: Email '{request.email}' already exists")
                 raise HTTPException(status_code=400, detail="Email already exists")
 
-            # password strength validation
-            validate_password_strength(request.password)
-
-            # hashing request.password with bcrypt
-            hashed_pw = hash_password(request.password)
-
-            # User Creation (if there are no duplicates) + DB insertion
-            await conn.execute(users.insert().values(
-                username=request.username,
-                email=request.email,
-                hashed_password=hashed_pw
-            ))
-
-            logger.info(f"User '{request.username}' with email '{request.email}' successfully created.")
-
-            return RegisterResponse(status="success")
+        # CPU heavy - in the password pool, without holding a DB connection
+        # password strength validation
+        try:
+            await run_password_task(validate_password_strength, request.password)
+        except ValueError as e:
+            logger.warning(f"Registration failed for '{request.username}': {e}")
+            raise HTTPException(status_code=400, detail=str(e))
+
+        # hashing request.password with bcrypt
+        hashed_pw = await run_password_task(hash_password, request.password)
+
+        try:
+            async with db_session() as conn:
+                # User Creation (if there are no duplicates) + DB insertion
+                await conn.execute(users.insert().values(
+                    username=request.username,
+                    email=request.email,
+                    hashed_password=hashed_pw
+                ))
+        except IntegrityError:
+            # a concurrent registration took the username or email after the check above (unique indexes)
+            logger.warning(f"Registration failed: Username '{request.username}' or email '{request.email}' already exists")
+            raise HTTPException(status_code=400, detail="Username or email already exists")
+
+        logger.info(f"User '{request.username}' with email '{request.email}' successfully created.")
+
+        return RegisterResponse(status="success")
 
     except HTTPException:
         raise
+    except PasswordPoolSaturatedError:
+        raise HTTPException(status_code=429, detail="Too many concurrent registrations, retry shortly", headers={"Retry-After": "1"})
     except Exception as e:
         logger.error(f"Registration failed: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
@@ -324,33 +715,35 @@ async def login(request: LoginRequest) -> LoginResponse:
                 users.select().where(users.c.username == request.username)
             )).first()
 
-            # throw Error if username does not exist
-            if not existing_user:
-                logger.warning(f"Login failed: Username '{request.username}' does not exist")
-                raise HTTPException(status_code=400, detail="Username does not exists")
+        # throw Error if username does not exist
+        if not existing_user:
+            logger.warning(f"Login failed: Username '{request.username}' does not exist")
+            raise HTTPException(status_code=400, detail="Username does not exists")
 
-            # extract hashed_password from existing user result
-            hashed_password = existing_user.hashed_password
+        # extract hashed_password from existing user result
+        hashed_password = existing_user.hashed_password
 
-            # verifying hashed_password
-            if verify_password(request.password, hashed_password):
-                logger.info("The password is correct")
+        # verifying hashed_password (password pool, DB connection already released)
+        if await run_password_task(verify_password, request.password, hashed_password):
+            logger.info("The password is correct")
 
-                # creating JWT Token with data
-                data = {"sub": existing_user.username, "user_id": existing_user.id}
-                jwt_token = create_access_token(data=data, expires_delta=None)
+            # creating JWT Token with data
+            data = {"sub": existing_user.username, "user_id": existing_user.id}
+            jwt_token = create_access_token(data=data, expires_delta=None)
 
-                return LoginResponse(
-                    status="success",
-                    access_token=jwt_token,
-                    token_type="bearer"
-                )
+            return LoginResponse(
+                status="success",
+                access_token=jwt_token,
+                token_type="bearer"
+            )
 
-            else:
-                logger.warning(f"Invalid password for user: '{request.username}'. Login failed")
-                raise HTTPException(status_code=400, detail="Invalid password")
+        else:
+            logger.warning(f"Invalid password for user: '{request.username}'. Login failed")
+            raise HTTPException(status_code=400, detail="Invalid password")
     except HTTPException:
         raise
+    except PasswordPoolSaturatedError:
+        raise HTTPException(status_code=429, detail="Too many concurrent logins, retry shortly", headers={"Retry-After": "1"})
     except Exception as e:
         logger.error(f"Login failed: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail="Internal server error during login")
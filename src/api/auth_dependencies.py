@@ -3,6 +3,7 @@
 from fastapi import HTTPException, Depends
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from .auth_service import verify_token
+from ..utils.tracing import span
 
 # Endpoint Protection logic
 security = HTTPBearer()         # creating a "bearer token" checker
@@ -15,7 +16,8 @@ async def get_current_user(auth_data: HTTPAuthorizationCredentials = Depends(sec
 
     token = auth_data.credentials    # assigning the actual JWT string to token
 
-    payload = verify_token(token)     # decoding and verifying token
+    with span("auth"):
+        payload = verify_token(token)     # decoding and verifying token
 
     if not payload:
         raise HTTPException(401, "Invalid token")
@@ -2,8 +2,11 @@
 
 import os
 import jwt
+import time
 import logging
-from typing import Optional
+from functools import lru_cache
+from collections import OrderedDict
+from typing import Optional, Tuple
 from dotenv import load_dotenv
 from datetime import datetime, timedelta, timezone
 
@@ -15,6 +18,10 @@ load_dotenv()
 SECRET_KEY = os.getenv("JWT_KEY")
 JWT_ALGORITHM = os.getenv("JWT_ALGORITHM")      # encryption algorithm
 ACCESS_TOKEN_EXPIRE_MINUTES = 30        # token validity period
+TOKEN_CACHE_SIZE = int(os.getenv("JWT_CACHE_SIZE", "10000"))     # verified tokens kept in memory (0 disables)
+
+# verified token -> (payload, exp) - least recently used first
+_verified_tokens: "OrderedDict[str, Tuple[dict, float]]" = OrderedDict()
 
 
 def check_secret_key_existence() -> str:
@@ -35,9 +42,15 @@ def check_jwt_algorithm_existence() -> str:
         raise ValueError("JWT_ALGORITHM variable is required")
 
 
+@lru_cache(maxsize=None)
+def jwt_settings() -> Tuple[str, str]:
+    """ (secret key, algorithm) - checked once, called at startup so missing configuration fails early """
+    return check_secret_key_existence(), check_jwt_algorithm_existence()
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """ Creating new JWT access token """
-    SECRET_KEY = check_secret_key_existence()
+    SECRET_KEY, JWT_ALGORITHM = jwt_settings()
 
     try:
         # creating a copy of the data - avoid modifying original data
@@ -69,15 +82,29 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
 
 
 def verify_token(token: str) -> Optional[dict]:
-    """ Verifies JWT token and returns the payload if valid """
-    SECRET_KEY = check_secret_key_existence()
-    JWT_ALGORITHM = check_jwt_algorithm_existence()
+    """
+    Verifies JWT token and returns the payload if valid
+    Verified tokens are cached until their exp - a cache hit skips decoding and the signature check
+    """
+    cached = _verified_tokens.get(token)
+    if cached is not None:
+        payload, expires_at = cached
+        if time.time() < expires_at:
+            _verified_tokens.move_to_end(token)
+            return payload
+
+        del _verified_tokens[token]
+        logger.error(f"JWT token is Invalid. Expired Signature Error")
+        return None
+
+    SECRET_KEY, JWT_ALGORITHM = jwt_settings()
 
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[JWT_ALGORITHM])
 
-        logger.info("JWT token verified")
+        logger.debug("JWT token verified")
 
+        _remember_token(token, payload)
         return payload
 
     except jwt.ExpiredSignatureError:
@@ -86,3 +113,19 @@ def verify_token(token: str) -> Optional[dict]:
     except jwt.InvalidTokenError:
         logger.error(f"JWT token is Invalid. Invalid Token Error")
         return None     # token is invalid
+
+
+def _remember_token(token: str, payload: dict) -> None:
+    """ Cache a verified token - only tokens with exp, so no entry outlives its token """
+    expires_at = payload.get("exp")
+    if TOKEN_CACHE_SIZE <= 0 or not isinstance(expires_at, (int, float)):
+        return
+
+    _verified_tokens[token] = (payload, float(expires_at))
+    if len(_verified_tokens) > TOKEN_CACHE_SIZE:
+        _verified_tokens.popitem(last=False)        # evict least recently used
+
+
+def clear_token_cache() -> None:
+    """ Forget all verified tokens (e.g. after rotating JWT_KEY) """
+    _verified_tokens.clear()
@@ -1,12 +1,13 @@
 # ~/reddit_sentiment_tracker/src/api/bcrypt_hashing.py
 
 import bcrypt
+from src.config import BCRYPT_ROUNDS
 
 def hash_password(password: str) -> str:
     """ Hashes password and returns it as hashed_password - typecasts bytearray into bytes (bcrypt expect bytes) """
 
-    # generating salt
-    salt = bcrypt.gensalt()
+    # generating salt - cost factor from BCRYPT_ROUNDS (verification reads it from the stored hash)
+    salt = bcrypt.gensalt(rounds=BCRYPT_ROUNDS)
     # encoding password to bytes
     password_bytes = password.encode('utf-8')
     # hashing password
@@ -0,0 +1,47 @@
+# ~/reddit_sentiment_tracker/src/api/fast_json.py
+
+import json
+import logging
+from datetime import datetime
+from typing import Any, Dict
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from src.utils.tracing import span
+
+try:
+    import orjson           # in requirements.txt - stdlib fallback for installs without it
+except ImportError:
+    orjson = None           # type: ignore[assignment]
+
+logger = logging.getLogger("reddit_sentiment_tracker")
+
+# Fast response path of the list endpoints (FAST_JSON_RESPONSES=true): the rows built in crud.py already
+# have the types of the response models (they come straight from typed columns), so they are serialized
+# directly instead of being validated against List[...Response] and walked by jsonable_encoder first.
+# The output is byte for byte what the default path returns: compact, UTF-8, ISO datetimes.
+
+
+def _json_default(value: Any) -> str:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """ JSON bytes of content - orjson if installed, else the stdlib encoder """
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":"), default=_json_default).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """ JSONResponse rendered with dumps() """
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def fast_json_response(content: Any, response: Response) -> FastJSONResponse:
+    """ Pre-validated content as response, with the headers already set on the endpoint's response (ETag, cursor) """
+    headers: Dict[str, str] = {key: value for key, value in response.headers.items() if key != "content-length"}
+    with span("serialize"):                         # rendered here, inside the endpoint
+        return FastJSONResponse(content, headers=headers)
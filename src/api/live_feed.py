@@ -0,0 +1,287 @@
+# ~/reddit_sentiment_tracker/src/api/live_feed.py
+
+import json
+import asyncio
+import logging
+from collections import deque
+from datetime import datetime
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Set
+from redis.exceptions import RedisError
+from src.config import (REDIS_URL, LIVE_QUEUE_SIZE, LIVE_MAX_SUBSCRIBERS, LIVE_HEARTBEAT, LIVE_ROLLING_WINDOW,
+                        LIVE_RECONNECT_DELAY, SENTIMENT_POSITIVE_THRESHOLD, SENTIMENT_NEGATIVE_THRESHOLD)
+from src.storage.redis_connection import get_redis
+from src.utils import metrics
+
+logger = logging.getLogger("reddit_sentiment_tracker")
+
+# The collection pipeline publishes the snapshots it wrote to the Redis channel "live:<subreddit>".
+# Every API process runs one pattern subscription and fans the events out to its own SSE clients
+# through per-subscriber bounded queues. Fan-out never waits: a subscriber whose queue is full is
+# dropped (its stream ends with a "dropped" event) so a slow client can't hold up the others or the
+# publisher. Without Redis, events are delivered to the subscribers of the publishing process only.
+
+CHANNEL_PREFIX = "live:"
+
+
+class LiveFeedFullError(Exception):
+    """ Raised when a process already serves LIVE_MAX_SUBSCRIBERS streams """
+
+
+class RollingSentiment:
+    """ Compound aggregates over the latest window_size posts or comments of a subreddit """
+    __slots__ = ("values", "total", "positive", "negative")
+
+    def __init__(self, window_size: int) -> None:
+        self.values: Deque[float] = deque(maxlen=window_size)
+        self.total = 0.0
+        self.positive = 0
+        self.negative = 0
+
+    def _count(self, compound: float, sign: int) -> None:
+        self.total += sign * compound
+        if compound >= SENTIMENT_POSITIVE_THRESHOLD:
+            self.positive += sign
+        elif compound <= SENTIMENT_NEGATIVE_THRESHOLD:
+            self.negative += sign
+
+    def add(self, compound: float) -> None:
+        if len(self.values) == self.values.maxlen:
+            self._count(self.values[0], -1)        # evicted by the append below
+        self.values.append(compound)
+        self._count(compound, 1)
+
+    def summary(self) -> Dict[str, Any]:
+        count = len(self.values)
+        return {
+            "count": count,
+            "mean_compound": round(self.total / count, 4) if count else None,
+            "positive_share": round(self.positive / count, 4) if count else 0.0,
+            "negative_share": round(self.negative / count, 4) if count else 0.0,
+        }
+
+
+EMPTY_SUMMARY = {"count": 0, "mean_compound": None, "positive_share": 0.0, "negative_share": 0.0}
+
+
+class Subscriber:
+    """ One open stream: bounded queue of encoded SSE frames """
+    __slots__ = ("queue", "dropped")
+
+    def __init__(self, queue_size: int) -> None:
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.dropped = False
+
+
+def sse_frame(event: str, data: Dict[str, Any]) -> str:
+    """ Server-Sent Events message """
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'), default=str)}\n\n"
+
+
+class LiveBroker:
+    """ In-process fan-out of live events to the subscribers of each subreddit """
+    def __init__(self, queue_size: int, max_subscribers: int, rolling_window: int) -> None:
+        self.queue_size = queue_size
+        self.max_subscribers = max_subscribers
+        self.rolling_window = rolling_window
+        self.subscribers: Dict[str, Set[Subscriber]] = {}
+        self.rolling: Dict[str, Dict[str, RollingSentiment]] = {}
+        self.subscriber_count = 0
+
+    def has_capacity(self) -> bool:
+        return self.subscriber_count < self.max_subscribers
+
+    def subscribe(self, subreddit_name: str) -> Subscriber:
+        if not self.has_capacity():
+            raise LiveFeedFullError(f"{self.max_subscribers} live streams open")
+
+        subscriber = Subscriber(self.queue_size)
+        self.subscribers.setdefault(subreddit_name, set()).add(subscriber)
+        self.subscriber_count += 1
+        return subscriber
+
+    def unsubscribe(self, subreddit_name: str, subscriber: Subscriber) -> None:
+        subscribers = self.subscribers.get(subreddit_name)
+        if subscribers is None or subscriber not in subscribers:
+            return                                  # already dropped
+
+        subscribers.discard(subscriber)
+        self.subscriber_count -= 1
+        if not subscribers:
+            del self.subscribers[subreddit_name]
+            self.rolling.pop(subreddit_name, None)      # aggregates only live while someone watches the subreddit
+
+    def aggregates(self, subreddit_name: str) -> Dict[str, Any]:
+        """ Rolling aggregates of posts and comments seen by this process while the subreddit had subscribers """
+        rolling = self.rolling.get(subreddit_name)
+        if rolling is None:
+            return {"posts": EMPTY_SUMMARY, "comments": EMPTY_SUMMARY}
+        return {kind: window.summary() for kind, window in rolling.items()}
+
+    def dispatch(self, subreddit_name: str, events: List[Dict[str, Any]]) -> int:
+        """
+        Update the rolling aggregates and queue the events for every subscriber of the subreddit
+        Each frame is encoded once and shared by all subscribers - returns the number of subscribers reached
+        """
+        if subreddit_name not in self.subscribers:
+            return 0                                    # nobody watching - no aggregates kept for it either
+
+        rolling = self.rolling.get(subreddit_name)
+        if rolling is None:
+            rolling = self.rolling[subreddit_name] = {
+                "posts": RollingSentiment(self.rolling_window),
+                "comments": RollingSentiment(self.rolling_window),
+            }
+        frames = []
+
+        for event in events:
+            rolling["posts" if event["type"] == "post" else "comments"].add(event["compound"])
+
+            frames.append(sse_frame(event["type"], {**event, "rolling": self.aggregates(subreddit_name)}))
+
+        reached = 0
+        for subscriber in list(self.subscribers.get(subreddit_name, ())):
+            try:
+                for frame in frames:
+                    subscriber.queue.put_nowait(frame)
+                reached += 1
+            except asyncio.QueueFull:
+                subscriber.dropped = True           # the stream notices on its next read
+                self.unsubscribe(subreddit_name, subscriber)
+                metrics.increment("live.dropped_subscribers")
+                logger.warning(f"Live feed of 'r/{subreddit_name}': dropped a subscriber that fell {self.queue_size} events behind")
+
+        metrics.increment("live.events_delivered", len(frames) * reached)
+        return reached
+
+
+live_broker = LiveBroker(LIVE_QUEUE_SIZE, LIVE_MAX_SUBSCRIBERS, LIVE_ROLLING_WINDOW)
+
+_listener_task: Optional[asyncio.Task] = None
+
+
+def _iso(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def post_event(snapshot: Dict[str, Any]) -> Dict[str, Any]:
+    """ Live event of a written post snapshot """
+    return {
+        "type": "post",
+        "id": snapshot["post_id"],
+        "compound": snapshot["compound"],
+        "title_sentiment": snapshot["title_sentiment"],
+        "body_sentiment": snapshot["body_sentiment"],
+        "score": snapshot["score"],
+        "upvote_ratio": snapshot["upvote_ratio"],
+        "num_comments": snapshot["num_comments"],
+        "created_utc": _iso(snapshot["created_utc"]),
+        "measured_at": _iso(snapshot["measured_at"]),
+    }
+
+
+def comment_event(snapshot: Dict[str, Any]) -> Dict[str, Any]:
+    """ Live event of a written comment snapshot """
+    return {
+        "type": "comment",
+        "id": snapshot["comment_id"],
+        "post_id": snapshot["post_id"],
+        "compound": snapshot["compound"],
+        "sentiment": snapshot["comment_sentiment"],
+        "score": snapshot["score"],
+        "created_utc": _iso(snapshot["created_utc"]),
+        "measured_at": _iso(snapshot["measured_at"]),
+    }
+
+
+async def publish_events(subreddit_name: str, events: List[Dict[str, Any]]) -> None:
+    """ Publish live events of a subreddit (one message per batch) - never raises """
+    if not events:
+        return
+
+    try:
+        message = json.dumps({"subreddit": subreddit_name, "events": events}, separators=(',', ':'))
+        await get_redis().publish(f"{CHANNEL_PREFIX}{subreddit_name}", message)
+        metrics.increment("live.events_published", len(events))
+
+    except (RedisError, ValueError) as e:
+        # other processes miss these events, subscribers of this process still get them
+        logger.debug(f"Failed to publish live events of 'r/{subreddit_name}': {e}")
+        live_broker.dispatch(subreddit_name, events)
+
+
+async def _listen_loop() -> None:
+    """ Pattern subscription to all live channels, dispatched to the local broker - resubscribes after errors """
+    while True:
+        pubsub = get_redis().pubsub(ignore_subscribe_messages=True)
+        try:
+            await pubsub.psubscribe(f"{CHANNEL_PREFIX}*")
+            logger.info("Live feed subscribed to Redis")
+
+            while True:
+                message = await pubsub.get_message(timeout=1.0)
+                if message is None:
+                    continue
+                try:
+                    payload = json.loads(message["data"])
+                    live_broker.dispatch(payload["subreddit"], payload["events"])
+                except (ValueError, KeyError, TypeError) as e:
+                    logger.warning(f"Ignoring malformed live message on {message.get('channel')}: {e}")
+
+        except (RedisError, OSError) as e:
+            logger.warning(f"Live feed lost its Redis subscription, retrying in {LIVE_RECONNECT_DELAY}s: {e}")
+            await asyncio.sleep(LIVE_RECONNECT_DELAY)
+        except Exception as e:
+            # anything else would end the task silently - the streams stay open but get no more events
+            logger.error(f"Live feed listener failed, resubscribing in {LIVE_RECONNECT_DELAY}s: {e}", exc_info=True)
+            await asyncio.sleep(LIVE_RECONNECT_DELAY)
+        finally:
+            try:
+                await pubsub.aclose()
+            except (RedisError, OSError) as e:
+                logger.debug(f"Closing the live feed subscription failed: {e}")
+
+
+def start_live_feed() -> None:
+    """ Start the Redis listener (if Redis is configured) - called in the app lifespan """
+    global _listener_task
+
+    if REDIS_URL and _listener_task is None:
+        _listener_task = asyncio.create_task(_listen_loop())
+
+
+async def stop_live_feed() -> None:
+    """ Stop the Redis listener """
+    global _listener_task
+
+    if _listener_task is not None:
+        _listener_task.cancel()
+        try:
+            await _listener_task
+        except asyncio.CancelledError:
+            pass
+        _listener_task = None
+
+
+async def event_stream(subreddit_name: str, subscriber: Subscriber) -> AsyncIterator[str]:
+    """
+    SSE body of one client: current aggregates, then live events and keep-alive comments until dropped or disconnected
+    The endpoint subscribes (a full feed is refused before the response starts) - the stream unsubscribes when it ends
+    """
+    try:
+        yield sse_frame("ready", {"subreddit": subreddit_name, "rolling": live_broker.aggregates(subreddit_name)})
+
+        while True:
+            if subscriber.dropped:
+                yield sse_frame("dropped", {"reason": f"client fell more than {live_broker.queue_size} events behind"})
+                return
+
+            try:
+                frame = await asyncio.wait_for(subscriber.queue.get(), LIVE_HEARTBEAT)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"            # detects closed connections, keeps proxies from timing out
+                continue
+
+            if not subscriber.dropped:
+                yield frame
+    finally:
+        live_broker.unsubscribe(subreddit_name, subscriber)
@@ -1,7 +1,7 @@
 # ~/reddit_sentiment_tracker/src/api/models.py
 
 from pydantic import BaseModel, Field, EmailStr
-from typing import Optional, Dict
+from typing import Optional, Dict, List
 from datetime import datetime
 
 
@@ -61,3 +61,81 @@ class CommentsResponse(BaseModel):
     created_utc: datetime = Field(..., description="Comment created at")
     comment_sentiment: Dict[str, float] = Field(..., description="Commment sentiment")
     measured_at: datetime = Field(..., description="Comment sentiment measured at")
+
+# /search/{subreddit_name}/posts, /search/{subreddit_name}/comments
+class SearchSummary(BaseModel):
+    matches: int = Field(..., description="Number of matches for the query")
+    mean_compound: Optional[float] = Field(None, description="Mean compound sentiment of the matches")
+    positive_share: float = Field(..., description="Share of matches with compound >= 0.05")
+    negative_share: float = Field(..., description="Share of matches with compound <= -0.05")
+    neutral_share: float = Field(..., description="Share of the remaining matches")
+
+class PostSearchHit(BaseModel):
+    id: str = Field(..., description="Post id")
+    title: str = Field(..., description="Post title")
+    author: str = Field(..., description="Post author")
+    created_utc: datetime = Field(..., description="Post created at")
+    title_sentiment: Dict[str, float] = Field(..., description="Post title sentiment")
+    body_sentiment: Dict[str, float] = Field(..., description="Post body sentiment")
+    score: int = Field(..., description="Post score")
+    compound: float = Field(..., description="Post title compound sentiment")
+    measured_at: datetime = Field(..., description="Post sentiment measured at")
+
+class CommentSearchHit(BaseModel):
+    id: str = Field(..., description="Comment id")
+    post_id: str = Field(..., description="Post id of the comment")
+    author: str = Field(..., description="Comment author")
+    text: str = Field(..., description="Comment text")
+    score: int = Field(..., description="Comment score")
+    created_utc: datetime = Field(..., description="Comment created at")
+    comment_sentiment: Dict[str, float] = Field(..., description="Comment sentiment")
+    compound: float = Field(..., description="Comment compound sentiment")
+    measured_at: datetime = Field(..., description="Comment sentiment measured at")
+
+class PostSearchResponse(BaseModel):
+    status: str
+    query: str
+    summary: Optional[SearchSummary] = Field(None, description="Sentiment summary of all matches (first page only)")
+    items: List[PostSearchHit]
+    next_cursor: Optional[str] = Field(None, description="Token for the next page, None on the last page")
+
+class CommentSearchResponse(BaseModel):
+    status: str
+    query: str
+    summary: Optional[SearchSummary] = Field(None, description="Sentiment summary of all matches (first page only)")
+    items: List[CommentSearchHit]
+    next_cursor: Optional[str] = Field(None, description="Token for the next page, None on the last page")
+
+# /sentiment/{subreddit_name}/timeseries - column oriented: index i of every array belongs to buckets[i]
+class TimeseriesResponse(BaseModel):
+    status: str
+    subreddit: str
+    source: str = Field(..., description="posts (title compound) or comments")
+    bucket: str = Field(..., description="hour or day")
+    start: datetime = Field(..., description="Start of the range (inclusive)")
+    end: datetime = Field(..., description="End of the range (exclusive)")
+    buckets: List[datetime] = Field(..., description="Bucket start times, ascending - buckets without observed posts/comments are omitted")
+    count: List[int] = Field(..., description="Posts/comments observed per bucket (each counted once, with its latest snapshot)")
+    mean: List[float] = Field(..., description="Mean compound")
+    weighted_mean: List[float] = Field(..., description="Compound mean weighted by score (score <= 0 weighs 1)")
+    p25: List[float] = Field(..., description="25th percentile of compound")
+    median: List[float] = Field(..., description="Median compound")
+    p75: List[float] = Field(..., description="75th percentile of compound")
+
+# /compare
+class SubredditComparison(BaseModel):
+    name: str
+    post_count: int = Field(..., description="Posts with a sentiment snapshot")
+    comment_count: int = Field(..., description="Comments with a sentiment snapshot")
+    mean_compound: Optional[float] = Field(None, description="Mean post (title) compound")
+    median_compound: Optional[float] = Field(None, description="Median post (title) compound")
+    positive_share: float = Field(..., description="Share of posts with compound >= 0.05")
+    negative_share: float = Field(..., description="Share of posts with compound <= -0.05")
+    mean_controversiality: Optional[float] = Field(None, description="Mean post controversiality")
+    mean_score: Optional[float] = Field(None, description="Mean post score")
+    comment_mean_compound: Optional[float] = Field(None, description="Mean comment compound")
+
+class CompareResponse(BaseModel):
+    status: str
+    subreddits: List[SubredditComparison] = Field(..., description="In the requested order")
+    missing: List[str] = Field(..., description="Requested subreddits without data")
@@ -0,0 +1,86 @@
+# ~/reddit_sentiment_tracker/src/api/password_executor.py
+
+import time
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, TypeVar
+from src.config import PASSWORD_POOL_WORKERS, PASSWORD_POOL_QUEUE
+from src.utils import metrics
+
+logger = logging.getLogger("reddit_sentiment_tracker")
+
+T = TypeVar("T")
+
+# bcrypt releases the GIL while hashing, so the workers hash in parallel while the event loop keeps serving.
+# Admission control: at most PASSWORD_POOL_WORKERS jobs run and PASSWORD_POOL_QUEUE wait - anything beyond
+# is rejected right away instead of piling up behind seconds of queued hashing.
+_executor: Optional[ThreadPoolExecutor] = None
+_capacity = PASSWORD_POOL_WORKERS + PASSWORD_POOL_QUEUE
+_in_flight = 0
+_in_flight_lock = threading.Lock()          # slots are released from the worker threads (done callbacks)
+
+
+class PasswordPoolSaturatedError(Exception):
+    """ All password workers busy and the queue is full """
+
+
+def get_password_executor() -> ThreadPoolExecutor:
+    """ Shared password pool - created on first use, and again after a shutdown (next app lifespan) """
+    global _executor
+
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=PASSWORD_POOL_WORKERS, thread_name_prefix="password")
+    return _executor
+
+
+def _release(_: Optional[Future] = None) -> None:
+    global _in_flight
+    with _in_flight_lock:
+        _in_flight -= 1
+
+
+async def run_password_task(func: Callable[..., T], *args: Any) -> T:
+    """ Run a CPU heavy password function (hashing, verification, strength check) in the password pool """
+    global _in_flight
+
+    with _in_flight_lock:
+        admitted = _in_flight < _capacity
+        if admitted:
+            _in_flight += 1
+
+    if not admitted:
+        metrics.increment("password_pool.rejected")
+        logger.warning(f"Password pool saturated ({_in_flight}/{_capacity} jobs) - rejecting request")
+        raise PasswordPoolSaturatedError(f"Password pool saturated ({_in_flight}/{_capacity} jobs)")
+
+    submitted = time.perf_counter()
+
+    def timed() -> T:
+        metrics.observe("password_pool.queue_wait", time.perf_counter() - submitted)
+        return func(*args)
+
+    try:
+        future = get_password_executor().submit(timed)
+    except Exception:
+        _release()
+        raise
+
+    # the slot is held until the job itself ends - a cancelled request only cancels a job that hasn't started
+    future.add_done_callback(_release)
+    return await asyncio.wrap_future(future)
+
+
+def password_pool_status() -> Dict[str, int]:
+    """ Workers, admission capacity and jobs currently running or queued """
+    return {"workers": PASSWORD_POOL_WORKERS, "capacity": _capacity, "in_flight": _in_flight}
+
+
+def shutdown_password_executor() -> None:
+    """ Stop the worker threads - called in the app lifespan; the next task creates a new pool """
+    global _executor
+
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
@@ -1,6 +1,5 @@
 # ~/reddit_sentiment_tracker/src/api/password_validation.py
 
-from zxcvbn import zxcvbn
 
 def validate_password_strength(password: str, min_score: int = 3) -> None:
     """ 
@@ -14,6 +13,8 @@ def validate_password_strength(password: str, min_score: int = 3) -> None:
         4 — strong
     """
 
+    from zxcvbn import zxcvbn       # frequency lists are built on import - only needed at registration
+
     result = zxcvbn(password)
     score = result["score"]
     feedback = result["feedback"]
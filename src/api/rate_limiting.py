@@ -1,61 +1,300 @@
 # ~/reddit_sentiment_tracker/src/api/rate_limiting.py
 
+import time
+import asyncio
 import logging
-import redis.asyncio as redis
 from fastapi import Depends, HTTPException
-from typing import Any
-from src.config import REDIS_URL, RATE_LIMIT_Redis, WINDOW_SIZE_Redis
+from typing import Callable, Dict, Iterable, Optional, Tuple
+from redis.commands.core import AsyncScript
+from src.config import (RATE_LIMIT_Redis, WINDOW_SIZE_Redis, RATE_LIMIT_MODE, RATE_LIMIT_SLACK,
+                        RATE_LIMIT_SYNC_INTERVAL, RATE_LIMIT_REDIS_RETRY)
+from src.storage.redis_connection import get_redis
+from src.utils import metrics
+from src.utils.tracing import span
 from .auth_dependencies import get_current_user
 
 logger = logging.getLogger("reddit_sentiment_tracker")
 
-async def get_redis_client(REDIS_URL: str) -> Any:
-    """ Getting Redis Client """
-    try:
-        redis_client = await redis.from_url(REDIS_URL, decode_responses=True)
-        redis_client.ping()
+# GCRA (generic cell rate algorithm): per user only the "theoretical arrival time" (TAT) is stored.
+# Every request moves it forward by one emission interval (window / limit) - a request is rejected
+# if that would put the TAT more than one window ahead of now. Allows a burst of RATE_LIMIT_Redis
+# requests, then one request per emission interval. Check and update run atomically inside Redis
+# in one round-trip, with the Redis clock (TIME) so API processes with skewed clocks agree.
+# saturate = 1 (reconciling requests that were already admitted locally): if the cost doesn't fit,
+# the allowance is still used up completely instead of leaving the state untouched.
+GCRA_SCRIPT = """
+local emission = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local saturate = ARGV[4] == '1'
 
-        logger.info("Redis Client successfully retrieved")
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) * 1000000 + tonumber(clock[2])
 
-        return redis_client
+local tat = tonumber(redis.call('GET', KEYS[1])) or now
+if tat < now then
+    tat = now
+end
 
-    except Exception as e:
-        logger.error(f"Error initializing Redis Client: {e}", exc_info=True)
-        raise
+local new_tat = tat + emission * cost
+local used = new_tat - now
 
+if used > window then
+    if saturate then
+        redis.call('SET', KEYS[1], string.format('%.0f', now + window), 'PX', math.ceil(window / 1000))
+    end
+    return {0, math.floor((window - (tat - now)) / emission), math.ceil((used - window) / 1000)}
+end
 
-async def rate_limit_check(user_id: str = Depends(get_current_user)) -> str:
-    """ Rate Limiting with redis. Check if user has exceeded the rate limit for api endpoints """
+redis.call('SET', KEYS[1], string.format('%.0f', new_tat), 'PX', math.ceil(used / 1000))
+return {1, math.floor((window - used) / emission), 0}
+"""
 
-    redis_client = await get_redis_client(REDIS_URL)   # get Redis Client
+WINDOW_US = WINDOW_SIZE_Redis * 1_000_000
+EMISSION_INTERVAL_US = WINDOW_US // RATE_LIMIT_Redis
 
-    try:
-        key = f"rate_limit:{user_id}"
+_gcra_script: Optional[AsyncScript] = None
 
-        current = await redis_client.get(key)   # get current count - returns None if key doens't exist
 
-        if current is None:
-            current_count = 0
-        else:
-            current_count = int(current)
+def _rate_limit_key(user_id: str) -> str:
+    return f"rate_limit:{user_id}"
+
+
+def _script() -> AsyncScript:
+    """ GCRA script registered once - sha computed once, EVALSHA with EVAL fallback """
+    global _gcra_script
+
+    if _gcra_script is None:
+        _gcra_script = get_redis().register_script(GCRA_SCRIPT)
+    return _gcra_script
+
+
+async def gcra_consume(user_id: str, cost: int = 1, saturate: bool = False) -> Tuple[bool, int, int]:
+    """
+    Atomically take cost requests from the user's allowance
+    Returns: (allowed, remaining requests, retry after in ms if rejected)
+    """
+    allowed, remaining, retry_after_ms = await _script()(
+        keys=[_rate_limit_key(user_id)],
+        args=[EMISSION_INTERVAL_US, WINDOW_US, cost, int(saturate)],
+        client=get_redis()
+    )
+    return bool(allowed), int(remaining), int(retry_after_ms)
+
+
+async def gcra_consume_many(costs: Dict[str, int]) -> Dict[str, Tuple[bool, int, int]]:
+    """ Charge already admitted requests of several users in one pipelined round-trip (saturating) """
+    script = _script()
+
+    async with get_redis().pipeline(transaction=False) as pipe:
+        for user_id, cost in costs.items():
+            await script(keys=[_rate_limit_key(user_id)], args=[EMISSION_INTERVAL_US, WINDOW_US, cost, 1], client=pipe)
+        results = await pipe.execute()
+
+    return {
+        user_id: (bool(allowed), int(remaining), int(retry_after_ms))
+        for user_id, (allowed, remaining, retry_after_ms) in zip(costs, results)
+    }
+
+
+class TokenBucket:
+    """ Local per-process allowance of one user - same capacity and refill rate as the GCRA limit """
+    __slots__ = ("capacity", "rate", "tokens", "updated")
+
+    def __init__(self, capacity: float, rate: float, now: float) -> None:
+        self.capacity = capacity
+        self.rate = rate                # tokens per second
+        self.tokens = capacity
+        self.updated = now
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_consume(self, now: float) -> Tuple[bool, float]:
+        """ Returns: (allowed, seconds until the next token if rejected) """
+        self._refill(now)
+
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True, 0.0
+        return False, (1 - self.tokens) / self.rate
+
+    def limit_to(self, remaining: float, now: float) -> None:
+        """ Align with the global allowance Redis reported - never raises the local one """
+        self._refill(now)
+        self.tokens = min(self.tokens, remaining)
+
+    def is_full(self, now: float) -> bool:
+        self._refill(now)
+        return self.tokens >= self.capacity
+
+
+class LocalRateLimiter:
+    """
+    Token buckets per user_id plus the count of locally admitted requests Redis doesn't know about yet
+    Used alone when Redis is unavailable, and as first tier in hybrid mode
+    """
+    def __init__(self, capacity: int, window_seconds: float, clock: Callable[[], float] = time.monotonic) -> None:
+        self.capacity = capacity
+        self.rate = capacity / window_seconds
+        self.clock = clock
+        self.buckets: Dict[str, TokenBucket] = {}
+        self.pending: Dict[str, int] = {}
+
+    def consume(self, user_id: str, track: bool = True) -> Tuple[bool, float]:
+        """ Take one request from the user's bucket - track: remember it for reconciliation """
+        now = self.clock()
+        bucket = self.buckets.get(user_id)
+        if bucket is None:
+            bucket = self.buckets[user_id] = TokenBucket(self.capacity, self.rate, now)
+
+        allowed, retry_after = bucket.try_consume(now)
+        if allowed and track:
+            self.pending[user_id] = self.pending.get(user_id, 0) + 1
+
+        return allowed, retry_after
+
+    def pending_count(self, user_id: str) -> int:
+        return self.pending.get(user_id, 0)
+
+    def take_pending(self, user_ids: Optional[Iterable[str]] = None) -> Dict[str, int]:
+        """ Remove and return unreconciled counts (all users or the given ones) """
+        user_ids = list(self.pending) if user_ids is None else [u for u in user_ids if u in self.pending]
+        return {user_id: self.pending.pop(user_id) for user_id in user_ids}
+
+    def restore_pending(self, taken: Dict[str, int]) -> None:
+        """ Put counts back after a failed reconciliation """
+        for user_id, count in taken.items():
+            self.pending[user_id] = self.pending.get(user_id, 0) + count
+
+    def apply_remaining(self, user_id: str, remaining: int) -> None:
+        """ Global allowance from Redis after reconciliation """
+        bucket = self.buckets.get(user_id)
+        if bucket is not None:
+            bucket.limit_to(remaining, self.clock())
+
+    def purge_idle(self) -> int:
+        """ Drop buckets that refilled completely and have nothing pending - returns the number dropped """
+        now = self.clock()
+        idle = [user_id for user_id, bucket in self.buckets.items()
+                if user_id not in self.pending and bucket.is_full(now)]
 
-        if current_count >= RATE_LIMIT_Redis:         # check if limit is exceeded
-            logger.warning(f"Rate limit exceeded for user {user_id}: {current_count}/{RATE_LIMIT_Redis}")
-            raise HTTPException(status_code=429, detail=f"Rate limit exceeded for user {user_id}: {current_count}/{RATE_LIMIT_Redis}")
+        for user_id in idle:
+            del self.buckets[user_id]
+        return len(idle)
 
-        async with redis_client.pipeline() as pipe:
-            pipe.incr(key)
-            pipe.expire(key, WINDOW_SIZE_Redis)
-            await pipe.execute()
 
-        logger.info(f"Rate Limit check passed for user {user_id}: {current_count + 1}/{RATE_LIMIT_Redis}")
+local_limiter = LocalRateLimiter(RATE_LIMIT_Redis, WINDOW_SIZE_Redis)
 
-        return user_id
+# Redis errors switch to local-only limiting for RATE_LIMIT_REDIS_RETRY seconds instead of
+# waiting for the socket timeout on every request
+_redis_retry_at = 0.0
+_sync_task: Optional[asyncio.Task] = None
 
-    except HTTPException:
-        raise
+
+def _redis_available() -> bool:
+    return time.monotonic() >= _redis_retry_at
+
+
+def _mark_redis_down(error: Exception) -> None:
+    global _redis_retry_at
+
+    if _redis_available():
+        logger.warning(f"Rate limiting: Redis unavailable, limiting locally for {RATE_LIMIT_REDIS_RETRY}s: {error}")
+    _redis_retry_at = time.monotonic() + RATE_LIMIT_REDIS_RETRY
+
+
+async def reconcile(user_ids: Optional[Iterable[str]] = None) -> None:
+    """ Charge locally admitted requests to Redis and align the local buckets with the global allowance """
+    taken = local_limiter.take_pending(user_ids)
+    if not taken:
+        return
+
+    try:
+        results = await gcra_consume_many(taken)
     except Exception as e:
-        logger.error(f"Rate Limit check failed: {e}", exc_info=True)
-        return user_id
-    finally:
-        await redis_client.close()     # close redis connection
+        local_limiter.restore_pending(taken)
+        _mark_redis_down(e)
+        return
+
+    for user_id, (allowed, remaining, _) in results.items():
+        local_limiter.apply_remaining(user_id, remaining if allowed else 0)
+
+    metrics.increment("rate_limit.reconciled", sum(taken.values()))
+
+
+async def _sync_loop() -> None:
+    """ Hybrid mode background task: reconcile all users every RATE_LIMIT_SYNC_INTERVAL seconds """
+    while True:
+        await asyncio.sleep(RATE_LIMIT_SYNC_INTERVAL)
+
+        if _redis_available():
+            await reconcile()
+        local_limiter.purge_idle()
+
+
+def start_rate_limit_sync() -> None:
+    """ Start the reconciliation task (hybrid mode only) - called in the app lifespan """
+    global _sync_task
+
+    if RATE_LIMIT_MODE == "hybrid" and _sync_task is None:
+        _sync_task = asyncio.create_task(_sync_loop())
+        logger.info(f"Hybrid rate limiting: reconciling every {RATE_LIMIT_SYNC_INTERVAL}s, slack {RATE_LIMIT_SLACK}")
+
+
+async def stop_rate_limit_sync() -> None:
+    """ Stop the reconciliation task and flush what is still pending """
+    global _sync_task
+
+    if _sync_task is not None:
+        _sync_task.cancel()
+        try:
+            await _sync_task
+        except asyncio.CancelledError:
+            pass
+        _sync_task = None
+        await reconcile()
+
+
+async def _check_redis(user_id: str) -> Tuple[bool, float]:
+    """ Every request checked in Redis, local buckets only while Redis is unavailable """
+    if _redis_available():
+        try:
+            allowed, _, retry_after_ms = await gcra_consume(user_id)
+            return allowed, retry_after_ms / 1000
+        except Exception as e:
+            _mark_redis_down(e)
+
+    metrics.increment("rate_limit.local_fallback")
+    return local_limiter.consume(user_id, track=False)
+
+
+async def _check_hybrid(user_id: str) -> Tuple[bool, float]:
+    """ Local bucket decides, Redis is consulted inline only once a user ran RATE_LIMIT_SLACK requests ahead """
+    if local_limiter.pending_count(user_id) >= RATE_LIMIT_SLACK and _redis_available():
+        await reconcile([user_id])
+
+    return local_limiter.consume(user_id)
+
+
+async def rate_limit_check(user_id: str = Depends(get_current_user)) -> str:
+    """ Rate Limiting with redis. Check if user has exceeded the rate limit for api endpoints """
+    with span("rate_limit"):
+        if RATE_LIMIT_MODE == "hybrid":
+            allowed, retry_after_seconds = await _check_hybrid(user_id)
+        else:
+            allowed, retry_after_seconds = await _check_redis(user_id)
+
+    if not allowed:
+        retry_after = max(1, -(-int(retry_after_seconds * 1000) // 1000))     # whole seconds, rounded up
+        metrics.increment("rate_limit.rejected")
+        logger.warning(f"Rate limit exceeded for user {user_id}: {RATE_LIMIT_Redis}/{WINDOW_SIZE_Redis}s, retry in {retry_after}s")
+        raise HTTPException(
+            status_code=429,
+            detail=f"Rate limit exceeded for user {user_id}: {RATE_LIMIT_Redis} requests per {WINDOW_SIZE_Redis}s",
+            headers={"Retry-After": str(retry_after)}
+        )
+
+    logger.debug("Rate Limit check passed for user %s", user_id)
+    return user_id
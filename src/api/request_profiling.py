@@ -0,0 +1,97 @@
+# ~/reddit_sentiment_tracker/src/api/request_profiling.py
+
+import hmac
+import asyncio
+import logging
+from typing import Optional
+from fastapi import Header, HTTPException
+from starlette.datastructures import MutableHeaders
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from src.config import PROFILE_ADMIN_TOKEN
+from src.utils import metrics
+from src.utils.profiling import PROFILE_MODES, ProfileSession, start_profile
+
+logger = logging.getLogger("reddit_sentiment_tracker")
+
+# Profile a single request in production: send "X-Profile: cprofile" (or "sample") together with
+# "X-Profile-Token: <PROFILE_ADMIN_TOKEN>". The response carries X-Profile-Id, the profile is written
+# once the response is complete and downloaded from GET /profiles/{id} (same token). The middleware
+# is only installed when PROFILE_ADMIN_TOKEN is set (server.py) - otherwise requests don't pass it at all.
+
+
+def is_profile_admin(token: Optional[str]) -> bool:
+    """ Constant time comparison with PROFILE_ADMIN_TOKEN - False if profiling is off """
+    if not PROFILE_ADMIN_TOKEN or token is None:
+        return False
+    return hmac.compare_digest(token.encode(), PROFILE_ADMIN_TOKEN.encode())
+
+
+async def require_profile_admin(
+    x_profile_token: Optional[str] = Header(None, description="PROFILE_ADMIN_TOKEN")
+) -> None:
+    """ Dependency of the profile download endpoints - 404 while profiling is off, 403 for a wrong token """
+    if not PROFILE_ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Profiling is not enabled")
+    if not is_profile_admin(x_profile_token):
+        raise HTTPException(status_code=403, detail="Invalid profile token")
+
+
+class ProfilingMiddleware:
+    """ Pure ASGI middleware: profiles requests that ask for it with a valid admin token """
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        mode = token = None
+        for key, value in scope["headers"]:
+            if key == b"x-profile":
+                mode = value.decode("latin-1").strip().lower()
+            elif key == b"x-profile-token":
+                token = value.decode("latin-1")
+
+        if mode is None:
+            await self.app(scope, receive, send)
+            return
+        if not is_profile_admin(token):
+            logger.warning(f"Profile request for {scope['method']} {scope['path']} with an invalid token")
+            await JSONResponse({"detail": "Invalid profile token"}, status_code=403)(scope, receive, send)
+            return
+        if mode not in PROFILE_MODES:
+            await JSONResponse({"detail": f"X-Profile must be one of: {', '.join(PROFILE_MODES)}"},
+                               status_code=400)(scope, receive, send)
+            return
+
+        session = start_profile(mode, f"{scope['method']} {scope['path']}")
+        if session is None:
+            await self.app(scope, receive, _with_header(send, "X-Profile-Status", "busy"))      # another profile is running
+            return
+
+        try:
+            await self.app(scope, receive, _with_header(send, "X-Profile-Id", session.profile_id))
+        finally:
+            session.stop()
+            await _save(session)
+
+
+def _with_header(send: Send, name: str, value: str) -> Send:
+    async def send_with_header(message: Message) -> None:
+        if message["type"] == "http.response.start":
+            MutableHeaders(scope=message).append(name, value)
+        await send(message)
+    return send_with_header
+
+
+async def _save(session: ProfileSession) -> None:
+    """ Write the profile off the event loop - the response is already sent, failures are only logged """
+    try:
+        path = await asyncio.to_thread(session.save)
+        metrics.increment(f"profiling.{session.mode}")
+        duration = f"{session.duration * 1000:.1f}ms" if session.duration is not None else "not stopped"
+        logger.info(f"Profile of {session.label} ({session.mode}, {duration}) written to {path}")
+    except Exception as e:
+        logger.error(f"Failed to write profile {session.profile_id}: {e}", exc_info=True)
@@ -0,0 +1,143 @@
+# ~/reddit_sentiment_tracker/src/api/request_tracing.py
+
+import time
+import asyncio
+import logging
+import functools
+from typing import Any, Callable, Coroutine, Optional
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from src.config import TRACE_SLOW_REQUEST_MS, TRACE_EXPORT_FILE
+from src.utils import metrics
+from src.utils.tracing import (begin_trace, end_trace, current_trace, record_span, to_otlp,
+                               RequestTrace, TraceExporter)
+
+logger = logging.getLogger("reddit_sentiment_tracker")
+
+# Where the time of a request went: the middleware opens a trace per request and answers with a
+# Server-Timing header (auth;dur=0.4, rate_limit;dur=1.1, db;dur=6.0, ..., total;dur=9.3) that browsers
+# show in their network tab. "total" is the time until the response headers - streamed bodies (export,
+# SSE) are paced by the client. Requests slower than TRACE_SLOW_REQUEST_MS are logged with their spans.
+
+_exporter: Optional[TraceExporter] = None
+
+
+def get_trace_exporter() -> Optional[TraceExporter]:
+    """ Exporter of TRACE_EXPORT_FILE, None if exporting is off """
+    global _exporter
+
+    if _exporter is None and TRACE_EXPORT_FILE:
+        _exporter = TraceExporter(TRACE_EXPORT_FILE)
+        logger.info(f"Exporting request traces (OTLP/JSON) to {TRACE_EXPORT_FILE}")
+    return _exporter
+
+
+def close_trace_exporter() -> None:
+    global _exporter
+
+    if _exporter is not None:
+        _exporter.close()
+        _exporter = None
+
+
+class TracingMiddleware:
+    """ Pure ASGI middleware: request trace, Server-Timing header, slow request log, optional export """
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        trace, token = begin_trace()
+        status_code = 500
+        headers_sent: Optional[float] = None
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code, headers_sent
+            if message["type"] == "http.response.start":
+                headers_sent = time.perf_counter()
+                status_code = message["status"]
+                MutableHeaders(scope=message).append("Server-Timing", trace.server_timing(headers_sent))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            end_trace(token)
+            _finish(scope, trace, status_code, headers_sent)
+
+
+def _finish(scope: Scope, trace: RequestTrace, status_code: int, headers_sent: Optional[float]) -> None:
+    """ Slow request log and export once the response is complete """
+    end = time.perf_counter()
+    route = scope.get("route")
+    route_path = getattr(route, "path", None) or scope["path"]          # template, not the concrete path
+    elapsed_ms = trace.elapsed_ms(headers_sent if headers_sent is not None else end)
+
+    if elapsed_ms >= TRACE_SLOW_REQUEST_MS:
+        metrics.increment("tracing.slow_requests")
+        logger.warning(f"Slow request {scope['method']} {route_path} -> {status_code} in {elapsed_ms:.1f}ms: "
+                       f"{trace.breakdown()} (trace {trace.trace_id})")
+
+    exporter = get_trace_exporter()
+    if exporter is not None:
+        exporter.submit(to_otlp(trace, f"{scope['method']} {route_path}", end, {
+            "http.request.method": scope["method"],
+            "http.route": route_path,
+            "url.path": scope["path"],
+            "http.response.status_code": status_code,
+        }, error=status_code >= 500))
+
+
+def _traced_endpoint(endpoint: Callable[..., Any]) -> Callable[..., Any]:
+    """ Wrap an endpoint in an "endpoint" span and mark where the response serialization starts """
+    def finished(start: float) -> None:
+        end = time.perf_counter()
+        record_span("endpoint", start, end)
+        trace = current_trace()
+        if trace is not None:
+            trace.endpoint_end = end
+
+    if asyncio.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)                  # FastAPI reads the parameters through __wrapped__
+        async def traced(*args: Any, **kwargs: Any) -> Any:
+            start = time.perf_counter()
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                finished(start)
+        return traced
+
+    @functools.wraps(endpoint)
+    def traced_sync(*args: Any, **kwargs: Any) -> Any:      # run in the threadpool, the trace is in the copied context
+        start = time.perf_counter()
+        try:
+            return endpoint(*args, **kwargs)
+        finally:
+            finished(start)
+    return traced_sync
+
+
+class TracedRoute(APIRoute):
+    """
+    APIRoute splitting the handler into the endpoint itself and the response serialization after it
+    (response_model validation, jsonable encoding, rendering)
+    """
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any) -> None:
+        super().__init__(path, _traced_endpoint(endpoint), **kwargs)
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+
+        async def traced_handler(request: Request) -> Response:
+            response = await handler(request)
+            trace = current_trace()
+            if trace is not None and trace.endpoint_end is not None:
+                record_span("serialize", trace.endpoint_end)
+            return response
+
+        return traced_handler
@@ -0,0 +1,225 @@
+# ~/reddit_sentiment_tracker/src/api/response_cache.py
+
+import json
+import time
+import hashlib
+import logging
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar
+from fastapi import Response
+from redis.exceptions import RedisError
+from src.config import RESPONSE_CACHE_ENABLED, RESPONSE_CACHE_TTL
+from src.storage.redis_connection import get_redis
+from src.utils import metrics
+from src.utils.tracing import span
+
+logger = logging.getLogger("reddit_sentiment_tracker")
+
+T = TypeVar("T")        # payload type of a loader - a cache hit returns the same payload, decoded from JSON
+
+# Cache keys contain the subreddit's generation counter. A collection that writes data for a
+# subreddit bumps the counter, so every cached response of that subreddit is bypassed at once
+# (old entries simply expire through their TTL). Redis is never required: on any Redis error
+# the loader runs as if there was no cache.
+#
+# The same generation is the version of the subreddit's data for HTTP caching: responses carry
+# an ETag built from it, and a matching If-None-Match is answered with 304 before any query runs.
+
+
+def _generation_key(subreddit_name: str) -> str:
+    return f"cache_gen:{subreddit_name}"
+
+
+async def get_generation(subreddit_name: str) -> int:
+    """ Current data generation of a subreddit - initialized to a timestamp so it never repeats after a Redis flush """
+    client = get_redis()
+    key = _generation_key(subreddit_name)
+
+    generation = await client.get(key)
+    if generation is None:
+        await client.set(key, time.time_ns() // 1000, nx=True)
+        generation = await client.get(key)
+
+    return int(generation)
+
+
+async def invalidate_subreddit(subreddit_name: str) -> None:
+    """ Bump the generation of a subreddit after new data was written - never raises """
+    try:
+        async with get_redis().pipeline(transaction=True) as pipe:
+            pipe.set(_generation_key(subreddit_name), time.time_ns() // 1000, nx=True)
+            pipe.incr(_generation_key(subreddit_name))
+            await pipe.execute()
+
+        metrics.increment("response_cache.invalidations")
+        logger.debug(f"Response cache of 'r/{subreddit_name}' invalidated")
+
+    except (RedisError, ValueError) as e:
+        # cached responses stay valid until their TTL runs out
+        logger.warning(f"Failed to invalidate response cache of 'r/{subreddit_name}': {e}")
+
+
+def _params_digest(params: Dict[str, Any]) -> str:
+    return hashlib.sha1(json.dumps(params, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def _cache_key(endpoint: str, subreddit_name: str, generation: int, params: Dict[str, Any]) -> str:
+    """ endpoint + subreddit + generation + digest of the query parameters """
+    return f"cache:{endpoint}:{subreddit_name}:{generation}:{_params_digest(params)}"
+
+
+def build_etag(endpoint: str, generation: int, params: Dict[str, Any]) -> str:
+    """ Weak ETag - same data generation and same query parameters give the same response body """
+    return f'W/"{endpoint}-{generation}-{_params_digest(params)[:16]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """ If-None-Match comparison (weak, as required for GET): '*' or any listed tag equal to etag """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+
+    def opaque(tag: str) -> str:
+        tag = tag.strip()
+        return tag[2:] if tag.startswith("W/") else tag
+
+    return any(opaque(tag) == opaque(etag) for tag in if_none_match.split(","))
+
+
+async def conditional_get(endpoint: str, subreddit_name: str, params: Dict[str, Any],
+                          if_none_match: Optional[str], response: Response) -> Tuple[Optional[int], Optional[str]]:
+    """
+    Resolve the data generation, set ETag/Cache-Control on the response
+    Returns: (generation or None if Redis is unavailable, etag if the client copy is still current else None)
+    """
+    try:
+        with span("cache"):
+            generation = await get_generation(subreddit_name)
+    except (RedisError, ValueError) as e:
+        metrics.increment("response_cache.errors")
+        logger.warning(f"Data generation unavailable, responding without ETag: {e}")
+        return None, None
+
+    etag = build_etag(endpoint, generation, params)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"     # clients may store it, but must revalidate
+
+    if etag_matches(if_none_match, etag):
+        metrics.increment("response_cache.not_modified")
+        return generation, etag
+
+    return generation, None
+
+
+def not_modified_response(etag: str) -> Response:
+    """ Empty 304 answer for a conditional GET """
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+
+
+def _json_default(value: Any) -> str:
+    """ json.dumps fallback for datetimes (parsed back by the response models) """
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+async def get_generations(subreddit_names: List[str]) -> List[int]:
+    """ Generations of several subreddits - one MGET, plus initialization of the ones never seen """
+    client = get_redis()
+    keys = [_generation_key(name) for name in subreddit_names]
+    generations = await client.mget(keys)
+
+    missing = [key for key, generation in zip(keys, generations) if generation is None]
+    if missing:
+        initial = time.time_ns() // 1000
+        async with client.pipeline(transaction=False) as pipe:
+            for key in missing:
+                pipe.set(key, initial, nx=True)
+            await pipe.execute()
+        generations = await client.mget(keys)
+
+    return [int(generation) for generation in generations]
+
+
+async def _serve_cached(client: Any, key: str, cached: Optional[str], loader: Callable[[], Awaitable[T]]) -> T:
+    """ Cached payload on a hit, on a miss run loader and SET its (non None) result with the TTL """
+    if cached is not None:
+        metrics.increment("response_cache.hits")
+        return json.loads(cached)
+
+    metrics.increment("response_cache.misses")
+    result = await loader()
+
+    if result is not None:
+        try:
+            with span("cache"):
+                await client.set(key, json.dumps(result, default=_json_default), ex=RESPONSE_CACHE_TTL)
+        except RedisError as e:
+            metrics.increment("response_cache.errors")
+            logger.warning(f"Failed to store response in cache: {e}")
+
+    return result
+
+
+async def cached_response(endpoint: str, subreddit_name: str, params: Dict[str, Any], loader: Callable[[], Awaitable[T]],
+                          generation: Optional[int] = None) -> T:
+    """
+    Return the cached payload for endpoint/subreddit/params or run loader and cache its result
+    None results (not found) are not cached, generation can be passed if already resolved (conditional_get)
+    """
+    if not RESPONSE_CACHE_ENABLED:
+        return await loader()
+
+    try:
+        with span("cache"):
+            client = get_redis()
+            if generation is None:
+                generation = await get_generation(subreddit_name)
+            key = _cache_key(endpoint, subreddit_name, generation, params)
+            cached = await client.get(key)
+    except (RedisError, ValueError) as e:
+        metrics.increment("response_cache.errors")
+        logger.warning(f"Response cache unavailable, reading from DB: {e}")
+        return await loader()
+
+    return await _serve_cached(client, key, cached, loader)
+
+
+async def cached_multi_response(endpoint: str, subreddit_names: List[str], params: Dict[str, Any],
+                                loader: Callable[[], Awaitable[T]]) -> T:
+    """
+    cached_response for payloads spanning several subreddits - the key contains every subreddit's generation,
+    so new data for any one of them invalidates the entry
+    """
+    if not RESPONSE_CACHE_ENABLED:
+        return await loader()
+
+    try:
+        with span("cache"):
+            client = get_redis()
+            names = sorted(set(subreddit_names))
+            generations = await get_generations(names)
+            key = f"cache:{endpoint}:multi:{_params_digest({**params, 'subreddits': list(zip(names, generations))})}"
+            cached = await client.get(key)
+    except (RedisError, ValueError) as e:
+        metrics.increment("response_cache.errors")
+        logger.warning(f"Response cache unavailable, reading from DB: {e}")
+        return await loader()
+
+    return await _serve_cached(client, key, cached, loader)
+
+
+def cache_stats() -> Dict[str, Any]:
+    """ Hit/miss counters and hit rate of this process """
+    counters = metrics.snapshot()["counters"]
+    hits = counters.get("response_cache.hits", 0)
+    misses = counters.get("response_cache.misses", 0)
+
+    return {
+        "hits": hits,
+        "misses": misses,
+        "errors": counters.get("response_cache.errors", 0),
+        "not_modified": counters.get("response_cache.not_modified", 0),
+        "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+    }
@@ -8,6 +8,11 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 
 # log path
 LOG_DIR = BASE_DIR / "logs"
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text").lower()                  # "text" or "json" (one object per line)
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))            # records waiting for the writer thread before new ones are dropped
+LOG_SAMPLE_LIMIT = int(os.getenv("LOG_SAMPLE_LIMIT", "50"))           # records per call site and window below ERROR (0: no limit)
+LOG_SAMPLE_WINDOW = float(os.getenv("LOG_SAMPLE_WINDOW", "1.0"))      # seconds
 
 # rate limits
 RATE_LIMIT_TOP_POSTS = 10
@@ -23,3 +28,70 @@ TOP_POSTS_TIME_FILTER = "all"
 REDIS_URL = os.getenv("REDIS_URL")
 RATE_LIMIT_Redis = 10           # max requests allowed
 WINDOW_SIZE_Redis = 60          # in seconds (time window duration)
+REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", "50"))       # shared pool per process
+REDIS_SOCKET_TIMEOUT = float(os.getenv("REDIS_SOCKET_TIMEOUT", "1.0"))      # seconds - fail fast, Redis is never required for correctness
+# "redis": every check runs in Redis, "hybrid": local token buckets per process, reconciled with Redis in batches
+RATE_LIMIT_MODE = os.getenv("RATE_LIMIT_MODE", "redis")
+RATE_LIMIT_SLACK = int(os.getenv("RATE_LIMIT_SLACK", "3"))                        # hybrid: requests per user a process may admit before Redis knows
+RATE_LIMIT_SYNC_INTERVAL = float(os.getenv("RATE_LIMIT_SYNC_INTERVAL", "0.5"))    # hybrid: seconds between reconciliations
+RATE_LIMIT_REDIS_RETRY = float(os.getenv("RATE_LIMIT_REDIS_RETRY", "5.0"))        # seconds of local-only limiting after a Redis error
+
+# Password hashing (bcrypt) and strength checks (zxcvbn) run in a bounded thread pool off the event loop
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))                               # cost factor of new hashes (each +1 doubles the time)
+PASSWORD_POOL_WORKERS = int(os.getenv("PASSWORD_POOL_WORKERS", str(min(4, os.cpu_count() or 1))))
+PASSWORD_POOL_QUEUE = int(os.getenv("PASSWORD_POOL_QUEUE", "16"))                   # jobs waiting for a worker before requests get 429
+
+# Response cache (Redis) for the read endpoints - invalidated per subreddit when a collection writes data
+RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() == "true"
+RESPONSE_CACHE_TTL = int(os.getenv("RESPONSE_CACHE_TTL", "300"))           # seconds
+
+# /posts and /comments: serialize the rows directly (orjson if installed) instead of validating them against the response models
+FAST_JSON_RESPONSES = os.getenv("FAST_JSON_RESPONSES", "false").lower() == "true"
+
+# Database connection pools (write = collection inserts/auth, read = API retrieval)
+DB_WRITE_POOL_SIZE = int(os.getenv("DB_WRITE_POOL_SIZE", "5"))
+DB_WRITE_MAX_OVERFLOW = int(os.getenv("DB_WRITE_MAX_OVERFLOW", "10"))
+DB_READ_POOL_SIZE = int(os.getenv("DB_READ_POOL_SIZE", "5"))
+DB_READ_MAX_OVERFLOW = int(os.getenv("DB_READ_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))     # seconds to wait for a free connection
+READ_REPLICA_URL = os.getenv("READ_REPLICA_URL")             # optional asyncpg DSN of a read replica
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "30000"))     # DATABASE_URL=sqlite+aiosqlite:///...: wait for the write lock
+
+# Sentiment history: only store snapshots that differ from the last one (unchanged ones just bump last_seen_at)
+SNAPSHOT_DEDUPLICATION = os.getenv("SNAPSHOT_DEDUPLICATION", "true").lower() == "true"
+
+# Bulk export - rows fetched from the server-side cursor and encoded per streamed chunk
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "2000"))
+
+# Full text search - text search configuration of the generated tsvector columns ("simple": no stemming, language agnostic)
+SEARCH_TEXT_CONFIG = "simple"
+
+# VADER compound thresholds for positive / negative shares
+SENTIMENT_POSITIVE_THRESHOLD = 0.05
+SENTIMENT_NEGATIVE_THRESHOLD = -0.05
+
+# Sentiment time series - range used when "from" is omitted, upper bound on buckets per request
+TIMESERIES_DEFAULT_DAYS = 7
+TIMESERIES_MAX_BUCKETS = 2000
+
+# Subreddit comparison - max subreddits per request
+COMPARE_MAX_SUBREDDITS = 50
+
+# Live feed (GET /stream) - Server-Sent Events fanned out per process, Redis pub/sub across workers
+LIVE_QUEUE_SIZE = int(os.getenv("LIVE_QUEUE_SIZE", "256"))                # buffered events per subscriber before it is dropped
+LIVE_MAX_SUBSCRIBERS = int(os.getenv("LIVE_MAX_SUBSCRIBERS", "1000"))     # open streams per process
+LIVE_HEARTBEAT = float(os.getenv("LIVE_HEARTBEAT", "15"))                 # seconds between keep-alive comments
+LIVE_ROLLING_WINDOW = int(os.getenv("LIVE_ROLLING_WINDOW", "200"))        # latest posts/comments in the rolling aggregates
+LIVE_RECONNECT_DELAY = 5.0                                                # seconds before resubscribing after a Redis error
+
+# Request tracing - per request spans in a Server-Timing header, slow requests logged with their span breakdown
+TRACING_ENABLED = os.getenv("TRACING_ENABLED", "true").lower() == "true"
+TRACE_SLOW_REQUEST_MS = float(os.getenv("TRACE_SLOW_REQUEST_MS", "500"))      # time until the response headers
+TRACE_EXPORT_FILE = os.getenv("TRACE_EXPORT_FILE")                            # optional: OTLP/JSON traces appended one per line
+
+# On-demand profiling - a request with "X-Profile: cprofile|sample" and "X-Profile-Token: <PROFILE_ADMIN_TOKEN>" is
+# profiled, the profile is downloadable from GET /profiles/{id}. Unset token: profiling middleware not installed
+PROFILE_ADMIN_TOKEN = os.getenv("PROFILE_ADMIN_TOKEN")
+PROFILE_DIR = Path(os.getenv("PROFILE_DIR", str(BASE_DIR / "profiles")))
+PROFILE_SAMPLE_INTERVAL = float(os.getenv("PROFILE_SAMPLE_INTERVAL", "0.005"))     # seconds between stack samples ("sample" mode)
+PROFILE_KEEP = int(os.getenv("PROFILE_KEEP", "50"))                                # stored profiles, the oldest are deleted
@@ -1,16 +1,17 @@
 # ~/reddit_sentiment_tracker/src/data_collection/comment_fetcher.py
 
 from ..sentiment_analysis.sentiment_analyzer import analyze_sentiment
+from .records import CommentRecord, SentimentScores
 from datetime import datetime, timezone
-from typing import Any
+from typing import Any, List
 import logging
 
 logger = logging.getLogger("reddit_sentiment_tracker")
 
-async def fetch_comments(reddit: Any, post_id: str, REPLY_DEPTH: int, COMMENT_LIMIT: int) -> list[dict[str, Any]]:
+async def fetch_comments(reddit: Any, post_id: str, REPLY_DEPTH: int, COMMENT_LIMIT: int) -> List[CommentRecord]:
     """ 
     Comment fetcher - gets top-level comments only
-    Returns: List of comment dicts with basic info + sentiment
+    Returns: List of comment records with basic info + sentiment
     """
     try:
         # returns submission object that contains all the posts data (title, content, author etc)
@@ -24,19 +25,19 @@ async def fetch_comments(reddit: Any, post_id: str, REPLY_DEPTH: int, COMMENT_LI
 
         # using a python slicer ":limit" to limit the amount of comments fetched
         for comment in submission.comments[:limit]:
-            comments_data.append({
-                "id": comment.id,
-                "parent_id": comment.parent_id,                     # id of the parent of comment
-                "depth": comment.depth,                             # nesting level (0 = top-level)
-                "text": comment.body,
-                "author": str(comment.author) if comment.author else "[deleted]",
-                "score": comment.score,
-                "edited": comment.edited,
-                "created_utc": datetime.fromtimestamp(comment.created_utc, tz=timezone.utc),
-                "sentiment": analyze_sentiment(comment.body)  # Your existing function
-            })
+            comments_data.append(CommentRecord(
+                id=comment.id,
+                parent_id=comment.parent_id,                        # id of the parent of comment
+                depth=comment.depth,                                # nesting level (0 = top-level)
+                text=comment.body,
+                author=str(comment.author) if comment.author else "[deleted]",
+                score=comment.score,
+                edited=comment.edited,
+                created_utc=datetime.fromtimestamp(comment.created_utc, tz=timezone.utc),
+                sentiment=SentimentScores.from_scores(analyze_sentiment(comment.body))
+            ))
         
-        logger.info(f"Fetching {len(comments_data)} comments of {post_id} successful")
+        logger.debug("Fetching %d comments of %s successful", len(comments_data), post_id)
 
         return comments_data
     
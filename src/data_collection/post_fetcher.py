@@ -1,14 +1,16 @@
 # ~/reddit_sentiment_tracker/src/data_collection/post_fetcher.py
 
-import asyncpraw.exceptions
 from .post_processor import process_post
-from typing import List, Dict, Any, Optional
+from .records import PostRecord
+from typing import List, Any, Optional
 import logging
 
 logger = logging.getLogger("reddit_sentiment_tracker")
 
-async def fetch_top_posts(subreddit_name: str, reddit: Any, RATE_LIMIT_TOP_POSTS: int, TOP_POSTS_TIME_FILTER: str) -> Optional[List[Dict[str, Any]]]:
+async def fetch_top_posts(subreddit_name: str, reddit: Any, RATE_LIMIT_TOP_POSTS: int, TOP_POSTS_TIME_FILTER: str) -> Optional[List[PostRecord]]:
     """ Fetches top posts from a Subreddit """
+    from asyncpraw.exceptions import APIException      # loaded with the Reddit client
+
     try:
         subreddit = await reddit.subreddit(subreddit_name)           # accessing subreddit
         logger.info(f"Accessed the subreddit: {subreddit_name}")
@@ -23,7 +25,7 @@ async def fetch_top_posts(subreddit_name: str, reddit: Any, RATE_LIMIT_TOP_POSTS
         logger.info(f"Top Posts of subreddit '{subreddit_name}' fetched successfully")
         return top_posts_data 
 
-    except asyncpraw.exceptions.APIException as e:
+    except APIException as e:
         logger.error(f"Reddit API Exception while fetching metadata for '{subreddit_name}': {e}")
         return None
     except Exception as e:
@@ -31,8 +33,10 @@ async def fetch_top_posts(subreddit_name: str, reddit: Any, RATE_LIMIT_TOP_POSTS
         return None
 
 
-async def fetch_rising_posts(subreddit_name: str, reddit: Any, RATE_LIMIT_RISING_POSTS: int) -> Optional[List[Dict[str, Any]]]:
+async def fetch_rising_posts(subreddit_name: str, reddit: Any, RATE_LIMIT_RISING_POSTS: int) -> Optional[List[PostRecord]]:
     """ Fetches rising posts from a Subreddit """
+    from asyncpraw.exceptions import APIException      # loaded with the Reddit client
+
     try:
         subreddit = await reddit.subreddit(subreddit_name)           # accessing subreddit
         logger.info(f"Accessed the subreddit: {subreddit_name}")
@@ -45,7 +49,7 @@ async def fetch_rising_posts(subreddit_name: str, reddit: Any, RATE_LIMIT_RISING
         logger.info(f"Rising Posts of subreddit '{subreddit_name}' fetched successfully")
         return rising_posts_data 
 
-    except asyncpraw.exceptions.APIException as e:
+    except APIException as e:
         logger.error(f"Reddit API Exception: {e}")
         return None
     except Exception as e:
@@ -0,0 +1,95 @@
+# ~/reddit_sentiment_tracker/src/data_collection/records.py
+
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+# Collected posts and comments, from the fetchers through the orchestrator to crud.py. Slotted classes
+# instead of per-record dicts: fixed fields without a per-instance __dict__ or key table - a post or comment
+# with its sentiment scores takes about half the memory of the dict version (benchmarks/records_benchmark.py)
+
+
+class _Record:
+    """ Shared repr / equality over the slots """
+    __slots__: Tuple[str, ...] = ()
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+    def __eq__(self, other: object) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+
+class SentimentScores(_Record):
+    """ VADER polarity scores of one text """
+    __slots__ = ("neg", "neu", "pos", "compound")
+
+    def __init__(self, neg: float, neu: float, pos: float, compound: float) -> None:
+        self.neg = neg
+        self.neu = neu
+        self.pos = pos
+        self.compound = compound
+
+    @classmethod
+    def from_scores(cls, scores: Dict[str, float]) -> Optional["SentimentScores"]:
+        """ From analyze_sentiment() output - None if the analysis failed (empty scores) """
+        if not scores:
+            return None
+        return cls(scores["neg"], scores["neu"], scores["pos"], scores["compound"])
+
+    def as_dict(self) -> Dict[str, float]:
+        return {"neg": self.neg, "neu": self.neu, "pos": self.pos, "compound": self.compound}
+
+
+def sentiment_json(scores: Optional[SentimentScores]) -> Dict[str, float]:
+    """ Value of the JSON sentiment columns - {} for a failed analysis, as before """
+    return scores.as_dict() if scores is not None else {}
+
+
+def compound_of(scores: Optional[SentimentScores]) -> float:
+    return scores.compound if scores is not None else 0.0
+
+
+class PostRecord(_Record):
+    """ Processed post with the sentiment of title and body (post_processor.process_post) """
+    __slots__ = ("id", "author", "created_utc", "num_comments", "url", "awards", "edited", "flair", "title",
+                 "title_sentiment", "selftext", "body_sentiment", "score", "upvote_ratio", "controversiality")
+
+    def __init__(self, *, id: str, author: str, created_utc: datetime, num_comments: int, url: str, awards: int,
+                 edited: Any, flair: Optional[str], title: str, title_sentiment: Optional[SentimentScores],
+                 selftext: str, body_sentiment: Optional[SentimentScores], score: int, upvote_ratio: float,
+                 controversiality: float) -> None:
+        self.id = id
+        self.author = author
+        self.created_utc = created_utc
+        self.num_comments = num_comments
+        self.url = url
+        self.awards = awards
+        self.edited = edited                    # False or the edit timestamp (Reddit API)
+        self.flair = flair
+        self.title = title
+        self.title_sentiment = title_sentiment
+        self.selftext = selftext
+        self.body_sentiment = body_sentiment
+        self.score = score
+        self.upvote_ratio = upvote_ratio
+        self.controversiality = controversiality
+
+
+class CommentRecord(_Record):
+    """ Fetched comment with its sentiment (comment_fetcher.fetch_comments) """
+    __slots__ = ("id", "parent_id", "depth", "text", "author", "score", "edited", "created_utc", "sentiment")
+
+    def __init__(self, *, id: str, parent_id: str, depth: int, text: str, author: str, score: int, edited: Any,
+                 created_utc: datetime, sentiment: Optional[SentimentScores]) -> None:
+        self.id = id
+        self.parent_id = parent_id              # t3_<post id> (top level) or t1_<comment id> (reply)
+        self.depth = depth                      # nesting level (0 = top-level)
+        self.text = text
+        self.author = author
+        self.score = score
+        self.edited = edited
+        self.created_utc = created_utc
+        self.sentiment = sentiment
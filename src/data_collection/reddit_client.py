@@ -1,19 +1,33 @@
 # ~/reddit_sentiment_tracker/src/data_collection/reddit_client.py
 
 import os
-import asyncpraw
 from dotenv import load_dotenv
 import logging
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    import asyncpraw
 
 logger = logging.getLogger("reddit_sentiment_tracker")
 
 # loading environmental variables load_dotenv()
 load_dotenv()
 
-async def get_reddit_client() -> asyncpraw.Reddit:
+# one client (and HTTP session) per process - asyncpraw is imported and the client built on the first collection
+_reddit_client: Optional["asyncpraw.Reddit"] = None
+
+
+async def get_reddit_client() -> "asyncpraw.Reddit":
     """ Initialize and return authenticated Reddit client using credentials from environment variables. """
+    global _reddit_client
+
+    if _reddit_client is not None:
+        return _reddit_client
+
     try:
-        client = asyncpraw.Reddit(
+        import asyncpraw
+
+        _reddit_client = asyncpraw.Reddit(
             client_id=os.getenv("CLIENT_ID"),
             client_secret=os.getenv("SECRET_KEY"),
             user_agent=os.getenv("USER_AGENT"),
@@ -21,8 +35,18 @@ async def get_reddit_client() -> asyncpraw.Reddit:
             password=os.getenv("REDDIT_PW")
         )
         logger.info("Reddit Client retrieval success")
-        return client
+        return _reddit_client
 
     except Exception as e:
         logger.error(f"Error retrieving Reddit Client: {e}", exc_info=True)
         raise
+
+
+async def close_reddit_client() -> None:
+    """ Close the shared Reddit client and its HTTP session """
+    global _reddit_client
+
+    if _reddit_client is not None:
+        await _reddit_client.close()
+        _reddit_client = None
+        logger.info("Reddit Client closed")
@@ -1,7 +1,5 @@
 # ~/reddit_sentiment_tracker/src/data_collection/subreddit_fetcher.py
 
-import asyncpraw
-import asyncpraw.exceptions
 from datetime import datetime, timezone
 from typing import Any, Optional, Dict
 import logging
@@ -10,6 +8,8 @@ logger = logging.getLogger("reddit_sentiment_tracker")
 
 async def fetch_subreddit_metadata(subreddit_name: str, reddit: Any) -> Optional[Dict[str, Any]]:
     """ Fetches metadata of a specific subreddit """
+    from asyncpraw.exceptions import APIException      # loaded with the Reddit client
+
     try:
         subreddit = await reddit.subreddit(subreddit_name)
 
@@ -26,7 +26,7 @@ async def fetch_subreddit_metadata(subreddit_name: str, reddit: Any) -> Optional
 
         return metadata
 
-    except asyncpraw.exceptions.APIException as e:
+    except APIException as e:
         logger.error(f"Reddit API Exception while fetching metadata of subreddit '{subreddit_name}': {e}")
         return None
     except Exception as e:
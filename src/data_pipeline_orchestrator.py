@@ -9,6 +9,9 @@ from .data_collection.subreddit_fetcher import fetch_subreddit_metadata
 from .storage.crud import insert_subreddit_metadata, insert_top_posts, insert_rising_posts, insert_comments, insert_post_sentiment, insert_comment_sentiment
 from .data_collection.post_fetcher import fetch_top_posts, fetch_rising_posts
 from .data_collection.comment_fetcher import fetch_comments
+from .data_collection.records import PostRecord
+from .api.response_cache import invalidate_subreddit
+from .api.live_feed import publish_events, post_event, comment_event
 
 logger = logging.getLogger("reddit_sentiment_tracker")
 
@@ -53,12 +56,13 @@ async def subreddit_data_into_db(subreddit_name: str, subreddit_metadata: Dict[s
     """ Insert Subreddit Metadata into Db """
     try:
         await insert_subreddit_metadata(subreddit_metadata)
+        await invalidate_subreddit(subreddit_name)
         logger.info(f"Subreddit metadata of 'r/{subreddit_name}' inserted into DB successfully")
     except Exception as e:
         logger.error(f"Failed to insert subreddit metadata of 'r/{subreddit_name}' into DB: {e}", exc_info=True)
 
 
-async def get_top_posts(subreddit_name: str, reddit: Any, RATE_LIMIT_TOP_POSTS: int, TOP_POSTS_TIME_FILTER: str) -> List[Dict[str, Any]]:
+async def get_top_posts(subreddit_name: str, reddit: Any, RATE_LIMIT_TOP_POSTS: int, TOP_POSTS_TIME_FILTER: str) -> List[PostRecord]:
     """ Fetch Top Posts """
     try:
         top_posts_data = await fetch_top_posts(subreddit_name,
@@ -73,42 +77,48 @@ async def get_top_posts(subreddit_name: str, reddit: Any, RATE_LIMIT_TOP_POSTS:
         logger.error(f"Failed to fetch top posts: {e}", exc_info=True)
         raise
 
-async def top_posts_data_into_db(top_posts_data: List[Dict[str, Any]], subreddit_id: str) -> None:
+async def top_posts_data_into_db(top_posts_data: List[PostRecord], subreddit_id: str, subreddit_name: str) -> None:
     """ Insert Top Posts Sentiment data into DB"""
     try:
         await insert_top_posts(top_posts_data, subreddit_id)
-        await insert_post_sentiment(top_posts_data)
+        written = await insert_post_sentiment(top_posts_data, subreddit_id)
+        await invalidate_subreddit(subreddit_name)
+        await publish_events(subreddit_name, [post_event(snapshot) for snapshot in written])
 
         logger.info("Inserting top posts and sentiment data into DB successful")
     except Exception as e:
         logger.error(f"Failed to insert top posts and sentiment data into DB: {e}", exc_info=True)
 
 
-async def comments_top_posts_into_db(top_posts_data: List[Dict[str, Any]], reddit: Any, REPLY_DEPTH: int, COMMENT_LIMIT: int) -> None:
+async def comments_top_posts_into_db(top_posts_data: List[PostRecord], reddit: Any, REPLY_DEPTH: int, COMMENT_LIMIT: int,
+                                 subreddit_name: str) -> None:
     """ Insert Comments of top posts and and Sentiment into DB """
     try:
         for post in top_posts_data:
-            post_id = post["id"]
-            post["comments"] = await fetch_comments(reddit,
-                                              post_id,
-                                              REPLY_DEPTH,
-                                              COMMENT_LIMIT)
-            post_comments = post["comments"]
+            post_id = post.id
+            # not attached to the post - released after this iteration instead of living until the run ends
+            post_comments = await fetch_comments(reddit,
+                                                 post_id,
+                                                 REPLY_DEPTH,
+                                                 COMMENT_LIMIT)
 
             # DB: inserting comments of Top Posts
             try: 
                 await insert_comments(post_comments, post_id)
-                await insert_comment_sentiment(post_comments)
+                written = await insert_comment_sentiment(post_comments, post_id)
+                await publish_events(subreddit_name, [comment_event(snapshot) for snapshot in written])
 
-                logger.info(f"Post id {post_id}: Inserting comments and sentiments of Top Posts into DB successful")
+                logger.debug("Post id %s: Inserting comments and sentiments of Top Posts into DB successful", post_id)
 
             except Exception as e:
                 logger.error(f"Post id {post_id}: Failed to insert comments and sentiments of Top Posts into DB: {e}", exc_info=True)
     except Exception as e:
         logger.error(f"Failed to fetch comments for Top Posts", exc_info=True)
+    finally:
+        await invalidate_subreddit(subreddit_name)      # once per batch of posts, also after partial failures
 
 
-async def get_rising_posts(subreddit_name: str, reddit: Any, RATE_LIMIT_RISING_POSTS: int) -> List[Dict[str, Any]]:
+async def get_rising_posts(subreddit_name: str, reddit: Any, RATE_LIMIT_RISING_POSTS: int) -> List[PostRecord]:
     """ Fetch Rissing Posts """
     try:
         rising_posts_data = await fetch_rising_posts(subreddit_name,
@@ -123,34 +133,38 @@ async def get_rising_posts(subreddit_name: str, reddit: Any, RATE_LIMIT_RISING_P
         raise
 
 
-async def rising_posts_data_into_db(rising_posts_data: List[Dict[str, Any]], subreddit_id: str) -> None:
+async def rising_posts_data_into_db(rising_posts_data: List[PostRecord], subreddit_id: str, subreddit_name: str) -> None:
     """ Inserting Rising Posts and Sentiment Data into DB """
     try: 
         await insert_rising_posts(rising_posts_data, subreddit_id)
-        await insert_post_sentiment(rising_posts_data)
+        written = await insert_post_sentiment(rising_posts_data, subreddit_id)
+        await invalidate_subreddit(subreddit_name)
+        await publish_events(subreddit_name, [post_event(snapshot) for snapshot in written])
 
         logger.info("Inserting rising posts and sentiment data into DB successful")
     except Exception as e:
         logger.error(f"Failed to insert rising posts and sentiment data into DB: {e}", exc_info=True)
 
 
-async def comments_rising_posts_into_db(rising_posts_data: List[Dict[str, Any]], reddit: Any, REPLY_DEPTH: int, COMMENT_LIMIT: int) -> None:
+async def comments_rising_posts_into_db(rising_posts_data: List[PostRecord], reddit: Any, REPLY_DEPTH: int, COMMENT_LIMIT: int,
+                                    subreddit_name: str) -> None:
     """ Insert Comments of rising posts and and Sentiment into DB """
     try:
         for post in rising_posts_data:
-            post_id = post["id"]
-            post["comments"] = await fetch_comments(reddit,
-                                              post["id"],
-                                              REPLY_DEPTH,
-                                              COMMENT_LIMIT)
-            post_comments = post["comments"]
+            post_id = post.id
+            # not attached to the post - released after this iteration instead of living until the run ends
+            post_comments = await fetch_comments(reddit,
+                                                 post_id,
+                                                 REPLY_DEPTH,
+                                                 COMMENT_LIMIT)
 
             # DB: inserting comments of Rising Posts
             try: 
                 await insert_comments(post_comments, post_id)
-                await insert_comment_sentiment(post_comments)
+                written = await insert_comment_sentiment(post_comments, post_id)
+                await publish_events(subreddit_name, [comment_event(snapshot) for snapshot in written])
 
-                logger.info(f"Post id {post_id}: Inserting comments and sentiments of Rising Posts into DB successful")
+                logger.debug("Post id %s: Inserting comments and sentiments of Rising Posts into DB successful", post_id)
 
             except Exception as e:
                 logger.error(f"Post id {post_id}: Failed to insert comments and sentiments of Rising Posts into DB: {e}", exc_info=True)
@@ -158,3 +172,5 @@ async def comments_rising_posts_into_db(rising_posts_data: List[Dict[str, Any]],
 
     except Exception as e:
         logger.error(f"Failed to fetch comments for Rising Posts", exc_info=True)
+    finally:
+        await invalidate_subreddit(subreddit_name)      # once per batch of posts, also after partial failures
@@ -1,32 +1,144 @@
 # ~/reddit_sentiment_tracker/src/logger.py
 
-import logging
 import sys
-from logging.handlers import RotatingFileHandler
-from .config import LOG_DIR
+import json
+import time
+import queue
+import atexit
+import logging
+import threading
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
+from typing import Dict, List, Tuple, Union, cast
+from .config import LOG_DIR, LOG_LEVEL, LOG_FORMAT, LOG_QUEUE_SIZE, LOG_SAMPLE_LIMIT, LOG_SAMPLE_WINDOW
+from .utils import metrics
+from .utils.tracing import current_trace
 from pathlib import Path
 
-def setup_logger(name: str ="reddit_sentiment_tracker", level: int = logging.INFO) -> logging.Logger:
-    """
-    Setup logger with both console and file handlers
-    """
-    
-    logger = logging.getLogger(name)  # MOVE THIS UP - define logger FIRST
+# Log calls only put the record on a queue - formatting, console and file I/O and rotation run in a
+# QueueListener thread, never on the event loop. High-volume call sites are rate limited per line of
+# code: at most LOG_SAMPLE_LIMIT records per LOG_SAMPLE_WINDOW seconds below ERROR, the next record
+# that gets through reports how many were suppressed.
 
-    # avoid duplicate handlers
-    if logger.handlers:
-        return logger
+_listeners: Dict[str, QueueListener] = {}   # logger name -> listener thread of its handlers
+
+
+class JsonFormatter(logging.Formatter):
+    """ One JSON object per line (LOG_FORMAT=json) """
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record, "%Y-%m-%dT%H:%M:%S") + f".{int(record.msecs):03d}",
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "function": record.funcName,
+            "line": record.lineno,
+            "process": record.process,
+        }
+        trace_id = getattr(record, "trace_id", None)
+        if trace_id is not None:
+            entry["trace_id"] = trace_id
+        suppressed = getattr(record, "suppressed", 0)
+        if suppressed:
+            entry["suppressed"] = suppressed
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class LogSamplingFilter(logging.Filter):
+    """ Per call site rate limit: limit records per window below ERROR, suppressed ones are counted """
+    def __init__(self, limit: int, window: float) -> None:
+        super().__init__()
+        self.limit = limit
+        self.window = window
+        self._sites: Dict[Tuple[str, int], List[float]] = {}       # (path, line) -> [window start, count, suppressed]
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.ERROR:
+            return True
+
+        now = time.monotonic()
+        key = (record.pathname, record.lineno)
+        with self._lock:
+            site = self._sites.get(key)
+            if site is None:
+                self._sites[key] = [now, 1, 0]
+                return True
+
+            if now - site[0] >= self.window:
+                suppressed = int(site[2])
+                site[0], site[1], site[2] = now, 1, 0
+                if suppressed:
+                    record.suppressed = suppressed
+                    if isinstance(record.msg, str):
+                        record.msg += f" [{suppressed} similar messages suppressed]"
+                return True
+
+            if site[1] < self.limit:
+                site[1] += 1
+                return True
+
+            site[2] += 1
+
+        metrics.increment("logging.suppressed")
+        return False
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """ QueueHandler that never blocks the caller - records are dropped (and counted) when the queue is full """
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # message merged now (args may change later), no formatter pass here - the listener's handlers format.
+        # No copy: this handler is the only one of the logger, the record isn't seen by anything else
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = _traceback_formatter.formatException(record.exc_info)
+            record.exc_info = None                  # don't keep the frames alive until the listener gets to it
+        trace = current_trace()
+        if trace is not None:
+            record.trace_id = trace.trace_id        # the request context is gone in the listener thread
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            metrics.increment("logging.dropped")
+
+
+_traceback_formatter = logging.Formatter()
+
+
+class DrainingQueueListener(QueueListener):
+    """ QueueListener whose stop() waits for room in a full queue instead of raising """
+    def enqueue_sentinel(self) -> None:
+        cast(queue.Queue, self.queue).put(None)     # None: QueueListener's sentinel, blocking put of queue.Queue
+
+
+def _log_files(name: str, log_dir: Path) -> Tuple[Path, Path]:
+    """ Log and error log paths - log_dir, /tmp/logs if that isn't writable """
+    try:
+        log_dir.mkdir(parents=True, exist_ok=True)
+        return log_dir / f"{name}.log", log_dir / f"{name}.errors.log"
+    except PermissionError:
+        # Fallback for Hugging Face Spaces
+        fallback_log_dir = Path("/tmp/logs")
+        fallback_log_dir.mkdir(parents=True, exist_ok=True)
+        return fallback_log_dir / f"{name}.log", fallback_log_dir / f"{name}.errors.log"
 
-    # set logger level
-    logger.setLevel(level)
 
+def build_handlers(name: str, json_format: bool = False, log_dir: Path = LOG_DIR) -> List[logging.Handler]:
+    """ Console, rotating log file and error log file handlers (run by the listener thread) """
     # formatter
-    detailed_formatter = logging.Formatter(
+    detailed_formatter = JsonFormatter() if json_format else logging.Formatter(
         fmt="%(asctime)s | %(name)s | %(levelname)-8s | %(funcName)s:%(lineno)d | %(message)s",
         datefmt="%Y-%m-%d %H:%M:%S"
     )
- 
-    console_formatter = logging.Formatter(
+
+    console_formatter = JsonFormatter() if json_format else logging.Formatter(
         fmt="%(asctime)s | %(levelname)-8s | %(message)s",
         datefmt="%H:%M:%S"
     )
@@ -35,19 +147,10 @@ def setup_logger(name: str ="reddit_sentiment_tracker", level: int = logging.INF
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(logging.INFO)
     console_handler.setFormatter(console_formatter)
-    
+
+    log_file, error_log_file = _log_files(name, log_dir)
+
     # File handler with rotation - Debug and above
-    try:
-        LOG_DIR.mkdir(parents=True, exist_ok=True)
-        log_file = LOG_DIR / f"{name}.log"
-        error_log_file = LOG_DIR / f"{name}.errors.log"
-    except PermissionError:
-        # Fallback for Hugging Face Spaces
-        fallback_log_dir = Path("/tmp/logs")
-        fallback_log_dir.mkdir(parents=True, exist_ok=True)
-        log_file = fallback_log_dir / f"{name}.log"
-        error_log_file = fallback_log_dir / f"{name}.errors.log"
-    
     file_handler = RotatingFileHandler(
         filename=str(log_file),
         maxBytes=5_000_000,  # 5MB
@@ -67,13 +170,73 @@ def setup_logger(name: str ="reddit_sentiment_tracker", level: int = logging.INF
     error_handler.setLevel(logging.ERROR)
     error_handler.setFormatter(detailed_formatter)
 
-    # Add handlers to logger
-    logger.addHandler(console_handler)
-    logger.addHandler(file_handler)
-    logger.addHandler(error_handler)
+    return [console_handler, file_handler, error_handler]
+
+
+def attach_queue_handler(logger: logging.Logger, handlers: List[logging.Handler],
+                         sample_limit: int = 0, sample_window: float = 1.0,
+                         queue_size: int = 10000) -> QueueListener:
+    """ Route the logger's records through a queue to handlers in a listener thread (started here) """
+    queue_handler = NonBlockingQueueHandler(queue.Queue(maxsize=queue_size))
+    if sample_limit > 0:
+        queue_handler.addFilter(LogSamplingFilter(sample_limit, sample_window))
+    logger.addHandler(queue_handler)
+
+    listener = DrainingQueueListener(queue_handler.queue, *handlers, respect_handler_level=True)
+    listener.start()
+    return listener
+
+
+def setup_logger(name: str ="reddit_sentiment_tracker", level: Union[int, str] = LOG_LEVEL) -> logging.Logger:
+    """
+    Setup logger with console and file handlers behind a queue
+    """
+
+    logger = logging.getLogger(name)  # MOVE THIS UP - define logger FIRST
+
+    # avoid duplicate handlers
+    if logger.handlers:
+        return logger
+
+    # set logger level
+    logger.setLevel(level)
+
+    handlers = build_handlers(name, json_format=LOG_FORMAT == "json")
+    _listeners[name] = attach_queue_handler(logger, handlers, LOG_SAMPLE_LIMIT, LOG_SAMPLE_WINDOW, LOG_QUEUE_SIZE)
 
     # Prevent propagation to root logger
     logger.propagate = False
 
+    log_file = next(handler.baseFilename for handler in handlers if isinstance(handler, logging.FileHandler))
     logger.info(f"Logger '{name}' initialized - Log files: {log_file}")
     return logger
+
+
+def restart_log_listeners(file_logging: bool = True) -> None:
+    """
+    Worker, right after fork: the listener threads stayed in the master, and their queues may have been
+    locked mid-operation - fresh queue and listener thread for every logger
+    file_logging=False: console only - with several workers they would all write and rotate the same files
+    """
+    for name, listener in list(_listeners.items()):
+        logger = logging.getLogger(name)
+        queue_handler = next(h for h in logger.handlers if isinstance(h, NonBlockingQueueHandler))
+        queue_handler.queue = queue.Queue(maxsize=cast(queue.Queue, queue_handler.queue).maxsize)
+
+        handlers = list(listener.handlers)
+        if not file_logging:
+            for handler in handlers:
+                if isinstance(handler, logging.FileHandler):
+                    handler.close()             # this process' copy of the descriptor - the master's stays open
+            handlers = [handler for handler in handlers if not isinstance(handler, logging.FileHandler)]
+
+        restarted = DrainingQueueListener(queue_handler.queue, *handlers, respect_handler_level=True)
+        restarted.start()
+        _listeners[name] = restarted
+
+
+@atexit.register
+def stop_log_listeners() -> None:
+    """ Write out what is still queued (also at interpreter exit) """
+    for name in list(_listeners):
+        _listeners.pop(name).stop()
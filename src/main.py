@@ -1,20 +1,36 @@
 # ~/reddit_sentiment_tracker/src/main.py
 
 import asyncio
+import argparse
+from typing import Optional
 from .config import RATE_LIMIT_RISING_POSTS, RATE_LIMIT_TOP_POSTS, COMMENT_LIMIT, TOP_POSTS_TIME_FILTER, REPLY_DEPTH
 from .data_pipeline_orchestrator import (init_db, reddit_client, get_subreddit_metadata,
                                          subreddit_data_into_db, get_top_posts, top_posts_data_into_db,
                                          comments_top_posts_into_db, get_rising_posts, rising_posts_data_into_db,
                                          comments_rising_posts_into_db)
+from .data_collection.reddit_client import close_reddit_client
 from .logger import setup_logger
+from .utils.profiling import PROFILE_MODES, start_profile
 
 logger = setup_logger("reddit_sentiment_tracker")
 
 
-async def main() -> None:
+async def main(profile_mode: Optional[str] = None) -> None:
     # Subreddit Name
     subreddit_name = "wien"
 
+    # Profiling the whole run (python -m src.main --profile [cprofile|sample])
+    profile = start_profile(profile_mode, f"collect {subreddit_name}") if profile_mode else None
+    try:
+        await collect(subreddit_name)
+    finally:
+        await close_reddit_client()         # shared client - closed once, at the end of the run
+        if profile is not None:
+            profile.stop()
+            logger.info(f"Collection profile ({profile.mode}, {profile.duration:.1f}s) written to {profile.save()}")
+
+
+async def collect(subreddit_name: str) -> None:
     # Initializing DB
     await init_db()
 
@@ -35,13 +51,14 @@ async def main() -> None:
             TOP_POSTS_TIME_FILTER
         )
         # Inserting Top Posts into DB (with Sentiment)
-        await top_posts_data_into_db(top_posts_data, subreddit_id)
+        await top_posts_data_into_db(top_posts_data, subreddit_id, subreddit_name)
         # Commments (top posts) fetching + Inserting into DB
         await comments_top_posts_into_db(
             top_posts_data,
             reddit,
             REPLY_DEPTH,
-            COMMENT_LIMIT
+            COMMENT_LIMIT,
+            subreddit_name
         )
 
 
@@ -52,17 +69,22 @@ async def main() -> None:
             RATE_LIMIT_RISING_POSTS
         )
         # Inserting Rising Posts into DB (with Sentiment)
-        await rising_posts_data_into_db(rising_posts_data, subreddit_id)
+        await rising_posts_data_into_db(rising_posts_data, subreddit_id, subreddit_name)
         # Rising Posts Comments fetching + Inserting into Db (with Sentiment)
         await comments_rising_posts_into_db(
             rising_posts_data,
             reddit,
             REPLY_DEPTH,
-            COMMENT_LIMIT
+            COMMENT_LIMIT,
+            subreddit_name
         )
     except (ValueError, Exception) as e:
         logger.error(f"Data pipeline failed for subreddit '{subreddit_name}': {e}", exc_info=True)
         return
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description="Collect r/wien into the database")
+    parser.add_argument("--profile", nargs="?", const="cprofile", choices=list(PROFILE_MODES),
+                        help="profile the run, written to PROFILE_DIR (default mode: cprofile)")
+    args = parser.parse_args()
+    asyncio.run(main(args.profile))
@@ -0,0 +1,44 @@
+# ~/reddit_sentiment_tracker/src/process_lifecycle.py
+
+import gc
+import logging
+from .api.password_validation import validate_password_strength
+from .sentiment_analysis.sentiment_analyzer import analyze_sentiment
+from .storage.connection import created_engines
+from .storage import redis_connection
+from .logger import restart_log_listeners
+
+logger = logging.getLogger("reddit_sentiment_tracker")
+
+# Multi-worker serving (gunicorn.conf.py): the app is imported once in the master and the workers are
+# forked from it, so large read-only tables (VADER lexicon and emoji dictionary, zxcvbn frequency lists)
+# exist once in memory, shared copy-on-write. They are loaded lazily, so the master loads them explicitly.
+# Anything holding sockets must be per worker instead.
+
+
+def preload_shared_state(freeze: bool = True) -> None:
+    """
+    Master, before forking: load the read-only tables and move all objects so far into the permanent
+    GC generation - collections in the workers then never write to (and un-share) those pages
+    """
+    analyze_sentiment("Preloading the lexicon :) not bad at all")
+    try:
+        validate_password_strength("preloading frequency lists 2024")
+    except ValueError:
+        pass
+
+    if freeze:
+        gc.collect()
+        gc.freeze()
+    logger.info(f"Shared state preloaded ({gc.get_freeze_count()} objects frozen)")
+
+
+def reset_after_fork(file_logging: bool = True) -> None:
+    """
+    Worker, right after fork: drop connection pools inherited from the master without closing its sockets
+    file_logging=False (several workers): the worker logs to stdout only, the log files are never shared
+    """
+    restart_log_listeners(file_logging)
+    for engine in created_engines():
+        engine.sync_engine.dispose(close=False)
+    redis_connection.reset_after_fork()
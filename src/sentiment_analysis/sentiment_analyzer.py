@@ -1,18 +1,31 @@
 # ~/reddit_sentiment_tracker/src/sentiment_analysis/sentiment_analyzer.py
 
 import logging
-from typing import Dict
-from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+from typing import TYPE_CHECKING, Dict, Optional
+
+if TYPE_CHECKING:
+    from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 
 logger = logging.getLogger("reddit_sentiment_tracker")
 
-# Initialize sentiment analyzer
-sentiment_analyzer = SentimentIntensityAnalyzer()
+# VADER analyzer - lexicon and emoji files are loaded on the first analysis (or preloaded in the gunicorn master)
+_sentiment_analyzer: Optional["SentimentIntensityAnalyzer"] = None
+
+
+def get_sentiment_analyzer() -> "SentimentIntensityAnalyzer":
+    """ Shared VADER analyzer """
+    global _sentiment_analyzer
+
+    if _sentiment_analyzer is None:
+        from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+        _sentiment_analyzer = SentimentIntensityAnalyzer()
+    return _sentiment_analyzer
+
 
 def analyze_sentiment(text: str) -> Dict[str, float]:
     """ Analyze text sentiment using VADER """
     try:
-        return sentiment_analyzer.polarity_scores(text)
+        return get_sentiment_analyzer().polarity_scores(text)
     except Exception as e:
         logger.error(f"Error getting polarity scores: {e}", exc_info=True)
         return {}
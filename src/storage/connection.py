@@ -1,45 +1,141 @@
 # ~/reddit_sentiment_tracker/src/storage/connection.py
 
 import os
+import time
 import subprocess
-from sqlalchemy.ext.asyncio import create_async_engine
-from sqlalchemy import MetaData, text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy import MetaData, event, text, make_url
+from sqlalchemy.pool import QueuePool
 from dotenv import load_dotenv
 import logging
+from typing import Any, Dict, List, Optional
+from ..config import (DB_WRITE_POOL_SIZE, DB_WRITE_MAX_OVERFLOW, DB_READ_POOL_SIZE, DB_READ_MAX_OVERFLOW,
+                      DB_POOL_TIMEOUT, READ_REPLICA_URL, SQLITE_BUSY_TIMEOUT_MS)
+from ..utils.tracing import current_trace, record_span
 
 logger = logging.getLogger("reddit_sentiment_tracker")
 
 # getting evironmental variables for db authentication
 load_dotenv()
-HOST_DB = os.getenv("HOST_DB")
-NAME_DB = os.getenv("NAME_DB")
-USER_DB = os.getenv("USER_DB")
-PASSWORD_DB = os.getenv("PASSWORD_DB")
-PORT_DB = os.getenv("PORT_DB")
 
-# missing env var logic
-required_vars = ["HOST_DB", "NAME_DB", "USER_DB", "PASSWORD_DB", "PORT_DB"]
-missing_vars = []
-for var in required_vars:
-    if not os.getenv(var):
-        missing_vars.append(var)
+# two engines / pools: heavy collection writes can't starve the API reads of connections
+# built on first use (app lifespan / first query), so importing the app needs neither a DB config nor asyncpg
+_write_engine: Optional[AsyncEngine] = None
+_read_engine: Optional[AsyncEngine] = None
+_max_overflow: Dict[str, int] = {}          # per pool, for the utilization in pool_status()
 
-if missing_vars:
-    logger.critical(f"DB: missing required variables: {', '.join(missing_vars)}")
-    raise ValueError(f"DB: missing required variables: {', '.join(missing_vars)}")
+# Storage backends: Postgres (asyncpg, schema by alembic) or embedded SQLite (aiosqlite, DATABASE_URL=
+# sqlite+aiosqlite:///path/to/tracker.db) for single node deployments, local benchmarks and tests.
+# SQLite runs in WAL mode - readers never block the single writer - with one pooled write connection
+# per process, so writers queue at the pool instead of failing on the database lock.
 
-# Setup, Connection to postgresql
-try:
-    engine = create_async_engine(f"postgresql+asyncpg://{USER_DB}:{PASSWORD_DB}@{HOST_DB}:{PORT_DB}/{NAME_DB}",
-                           pool_size=5, 
-                           max_overflow=10, 
-                           pool_pre_ping=True)
 
-    logger.info(f"Postgres Database created successfully")
+def _primary_url() -> str:
+    """ DSN of the primary: DATABASE_URL if set, else asyncpg from the DB env vars - raises if any is missing """
+    database_url = os.getenv("DATABASE_URL")
+    if database_url:
+        return database_url
 
-except Exception as e:
-    logger.critical(f"Error creating Postgres Database: {e}", exc_info=True)
-    raise ValueError(f"Error creating Postgres Database: {e}")
+    required_vars = ["HOST_DB", "NAME_DB", "USER_DB", "PASSWORD_DB", "PORT_DB"]
+    missing_vars = [var for var in required_vars if not os.getenv(var)]
+
+    if missing_vars:
+        logger.critical(f"DB: missing required variables: {', '.join(missing_vars)}")
+        raise ValueError(f"DB: missing required variables: {', '.join(missing_vars)}")
+
+    return (f"postgresql+asyncpg://{os.getenv('USER_DB')}:{os.getenv('PASSWORD_DB')}"
+            f"@{os.getenv('HOST_DB')}:{os.getenv('PORT_DB')}/{os.getenv('NAME_DB')}")
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if current_trace() is not None:
+        context._trace_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    start = getattr(context, "_trace_start", None)
+    if start is not None:
+        record_span("db", start)            # statement round-trip(s) incl. fetching the rows
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """ Record every statement as "db" span of the current request trace (src/utils/tracing.py) """
+    # the events run in SQLAlchemy's greenlet, which carries the request's context variables
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def is_sqlite(url: str) -> bool:
+    return make_url(url).get_backend_name() == "sqlite"
+
+
+def _is_in_memory(url: str) -> bool:
+    return make_url(url).database in (None, "", ":memory:")
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """ Per new SQLite connection: WAL, foreign keys (off by default in SQLite), wait for the write lock """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")         # WAL: fsync at checkpoints instead of every commit
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+    cursor.close()
+
+
+def _create_engine(url: str, pool_size: int, max_overflow: int) -> AsyncEngine:
+    try:
+        if is_sqlite(url) and _is_in_memory(url):
+            engine = create_async_engine(url)           # one static connection - the database lives in it
+        else:
+            engine = create_async_engine(url,
+                                         pool_size=pool_size,
+                                         max_overflow=max_overflow,
+                                         pool_timeout=DB_POOL_TIMEOUT,
+                                         pool_pre_ping=True)
+    except Exception as e:
+        logger.critical(f"Error creating Database engine: {e}", exc_info=True)
+        raise ValueError(f"Error creating Database engine: {e}")
+
+    if is_sqlite(url):
+        event.listen(engine.sync_engine, "connect", _set_sqlite_pragmas)
+    instrument_engine(engine)
+    return engine
+
+
+def get_write_engine() -> AsyncEngine:
+    """ Engine of the primary (collection inserts, auth) - also the default engine of scripts and benchmarks """
+    global _write_engine
+
+    if _write_engine is None:
+        url = _primary_url()
+        if is_sqlite(url):
+            pool_size, max_overflow = 1, 0              # SQLite has a single writer
+        else:
+            pool_size, max_overflow = DB_WRITE_POOL_SIZE, DB_WRITE_MAX_OVERFLOW
+        _write_engine = _create_engine(url, pool_size, max_overflow)
+        _max_overflow["write"] = max_overflow
+        logger.info(f"{_write_engine.dialect.name} write engine created")
+    return _write_engine
+
+
+def get_read_engine() -> AsyncEngine:
+    """ Engine of the API reads - replica if configured, otherwise its own pool on the primary """
+    global _read_engine
+
+    if _read_engine is None:
+        url = READ_REPLICA_URL or _primary_url()
+        if is_sqlite(url) and _is_in_memory(url):
+            return get_write_engine()                   # a second in-memory engine would be a different database
+        _read_engine = _create_engine(url, DB_READ_POOL_SIZE, DB_READ_MAX_OVERFLOW)
+        _max_overflow["read"] = DB_READ_MAX_OVERFLOW
+        logger.info(f"{_read_engine.dialect.name} read engine created (read replica: {'yes' if READ_REPLICA_URL else 'no'})")
+    return _read_engine
+
+
+def created_engines() -> List[AsyncEngine]:
+    """ Engines that exist in this process (none before the first use) """
+    return [engine for engine in (_write_engine, _read_engine) if engine is not None]
 
 
 # intitializing metadata object to hold table definitions
@@ -70,11 +166,42 @@ def run_alembic_migrations() -> bool:
 # run_alembic_migrations()
 
 
+def pool_status() -> Dict[str, Dict[str, Any]]:
+    """ Current utilization of the read and write connection pools """
+    status = {}
+    for name, pool_engine in (("write", _write_engine), ("read", _read_engine)):
+        if pool_engine is None or not isinstance(pool_engine.pool, QueuePool):
+            continue                    # not used yet in this process / in-memory SQLite (static pool)
+        pool = pool_engine.pool
+        max_overflow = _max_overflow.get(name, 0)
+        capacity = pool.size() + max_overflow
+        status[name] = {
+            "size": pool.size(),
+            "max_overflow": max_overflow,
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "utilization": pool.checkedout() / capacity if capacity else 0.0,
+        }
+    return status
+
+
+async def create_sqlite_schema(engine: AsyncEngine) -> None:
+    """ SQLite schema from the table definitions - the alembic migrations are Postgres DDL """
+    from . import schema_manager  # noqa: F401 - registers the tables on metadata
+
+    async with engine.begin() as conn:
+        await conn.run_sync(metadata.create_all)            # CREATE ... IF NOT EXISTS semantics: existing tables are kept
+
+
 async def initialize_database() -> None:
-    """ Test database connection - schema is managed by alembic """
+    """ Test database connections (primary and read pool) - schema is managed by alembic (Postgres) """
     try:
-        async with engine.begin() as conn:
-            await conn.execute(text('SELECT 1'))         # text() tells sqlalchemy that raw SQL text should be executed
+        for connection_engine in (get_write_engine(), get_read_engine()):
+            async with connection_engine.begin() as conn:
+                await conn.execute(text('SELECT 1'))         # text() tells sqlalchemy that raw SQL text should be executed
+
+        if get_write_engine().dialect.name == "sqlite":
+            await create_sqlite_schema(get_write_engine())
         logger.info("Database connection successful")
     except Exception as e:
         logger.critical(f"Error connecting to Database: {e}", exc_info=True)
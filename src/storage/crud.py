@@ -1,23 +1,57 @@
+import time
 import logging
+from datetime import datetime
 from contextlib import asynccontextmanager
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy import select
-from typing import Optional, Dict, Any, List
-from .connection import engine
-from .schema_manager import subreddits, posts, comments, post_sentiment_history, comment_sentiment_history
+from sqlalchemy import select, update, tuple_, func, and_, false, true, literal, literal_column, String, Interval
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from typing import Optional, Dict, Any, AsyncIterator, List, Tuple
+from .connection import get_write_engine, get_read_engine
+from ..utils import metrics
+from ..utils.tracing import span
+from ..config import (SNAPSHOT_DEDUPLICATION, SEARCH_TEXT_CONFIG,
+                      SENTIMENT_POSITIVE_THRESHOLD, SENTIMENT_NEGATIVE_THRESHOLD, EXPORT_BATCH_SIZE)
+from .snapshots import split_changed_snapshots, POST_SNAPSHOT_FIELDS, COMMENT_SNAPSHOT_FIELDS
+from ..utils.pagination import encode_cursor, decode_cursor
+from ..utils.timeseries import (BUCKET_SECONDS, TimeseriesBucket, aggregate_buckets, bucket_bounds, carry_forward,
+                               rows_to_columns)
+from ..data_collection.records import PostRecord, CommentRecord, sentiment_json, compound_of
+from .schema_manager import (subreddits, posts, comments, post_sentiment_history, comment_sentiment_history,
+                             post_latest, comment_latest)
 
 logger = logging.getLogger("reddit_sentiment_tracker")
 
+# rows per multi-row upsert of the *_latest tables - ~12 bind parameters per row, asyncpg allows at most 32767 per statement
+UPSERT_BATCH_SIZE = 1000
+
 
 @asynccontextmanager
 async def db_session():
-    """ Context manager for transactions - begin() handles rollbacks/transactions """
-    async with engine.begin() as conn:
-        try:
-            yield conn
-        except SQLAlchemyError as e:
-            logger.error(f"Database Transaction failed: {e}", exc_info=True)
-            raise   # error - let application entry point decide
+    """ Context manager for transactions on the write pool - begin() handles rollbacks/transactions """
+    start = time.perf_counter()
+    async with get_write_engine().connect() as conn:
+        metrics.observe("db_pool_wait.write", time.perf_counter() - start)    # time spent waiting for a pooled connection
+        async with conn.begin():
+            try:
+                yield conn
+            except SQLAlchemyError as e:
+                logger.error(f"Database Transaction failed: {e}", exc_info=True)
+                raise   # error - let application entry point decide
+
+
+@asynccontextmanager
+async def db_read_session():
+    """ Context manager for read only queries on the read pool (replica if configured) """
+    start = time.perf_counter()
+    async with get_read_engine().connect() as conn:
+        metrics.observe("db_pool_wait.read", time.perf_counter() - start)
+        async with conn.begin():
+            try:
+                yield conn
+            except SQLAlchemyError as e:
+                logger.error(f"Database read failed: {e}", exc_info=True)
+                raise
 
 
 async def insert_subreddit_metadata(subreddit_metadata: dict) -> None:
@@ -34,7 +68,7 @@ async def insert_subreddit_metadata(subreddit_metadata: dict) -> None:
             )).fetchone()
 
             if exists:
-                logger.info(f"The Subreddit '{subreddit_metadata['id']}' already exists. Skipped inserting")
+                logger.debug("The Subreddit '%s' already exists. Skipped inserting", subreddit_metadata['id'])
                 return
 
             # otherwise insert
@@ -46,91 +80,71 @@ async def insert_subreddit_metadata(subreddit_metadata: dict) -> None:
         logger.error(f"Failure inserting subreddit metadata into DB: {e}", exc_info=True)
         raise
 
-async def insert_top_posts(top_posts_data, subreddit_id) -> None:
+async def _without_existing(conn, id_column, records: List[Any]) -> List[Any]:
+    """ Records whose id is not in the table yet - one query for the whole batch, repeated ids kept once """
+    unique_records: Dict[str, Any] = {}
+    for record in records:
+        unique_records.setdefault(record.id, record)
+
+    existing = set((await conn.execute(
+        select(id_column).where(id_column.in_(list(unique_records)))
+    )).scalars())
+
+    if existing:
+        logger.debug("%d of %d %s already exist. Skipped inserting", len(existing), len(unique_records), id_column.table.name)
+    return [record for record_id, record in unique_records.items() if record_id not in existing]
+
+
+async def _insert_posts(posts_data: List[PostRecord], subreddit_id, post_type: str) -> int:
+    """ Insert the posts that are not stored yet (batched: one existence check, one executemany) - returns the count """
+    async with db_session() as conn:
+        new_posts = await _without_existing(conn, posts.c.id, posts_data)
+
+        if new_posts:
+            await conn.execute(posts.insert(), [{
+                "id": post.id,
+                "subreddit_id": subreddit_id,
+                "author": post.author,
+                "post_type": post_type,
+                "title": post.title,
+                "selftext": post.selftext,
+                "url": post.url,
+                "flair": post.flair,
+                "created_utc": post.created_utc
+            } for post in new_posts])
+
+    return len(new_posts)
+
+
+async def insert_top_posts(top_posts_data: List[PostRecord], subreddit_id) -> None:
     """ Inserting posts data into DB in a transaction """
     if not top_posts_data:
         logger.info("No posts data to insert")
         return
 
     try:
-        async with db_session() as conn:
-            # getting post_id for each iteration
-            for post in top_posts_data:
-                post_id = post["id"]
-
-                # check if post already exists
-                exists = (await conn.execute(
-                    select(posts.c.id).where(posts.c.id == post_id)
-                )).fetchone()
-
-                # return if duplicate
-                if exists:
-                    logger.info(f"The Post ID: '{post_id}' already exists. Skipped inserting")
-                    continue
-
-                post_db_data = {
-                    "id": post["id"],
-                    "subreddit_id": subreddit_id,
-                    "author": post["author"],
-                    "post_type": "top",
-                    "title": post["title"],
-                    "selftext": post["selftext"],
-                    "url": post["url"],
-                    "flair": post["flair"],
-                    "created_utc": post["created_utc"]
-                }
-
-                # otherwise insert
-                await conn.execute(posts.insert(), post_db_data)
-
-            logger.info(f"Successfully inserted new top posts into DB (duplicates skipped)")
+        inserted = await _insert_posts(top_posts_data, subreddit_id, "top")
+        logger.info(f"Successfully inserted {inserted} new top posts into DB (duplicates skipped)")
 
     except Exception as e:
         logger.error(f"Failure inserting posts data into DB: {e}", exc_info=True)
         raise
 
-async def insert_rising_posts(rising_posts_data, subreddit_id) -> None:
+async def insert_rising_posts(rising_posts_data: List[PostRecord], subreddit_id) -> None:
     """ Inserting rising posts data into DB in a transaction """
     if not rising_posts_data:
         logger.info("No posts data to insert")
         return
 
     try:
-        async with db_session() as conn:
-            for post in rising_posts_data:
-                post_id = post["id"]
-
-                # check if post already exists
-                exists = (await conn.execute(
-                    select(posts.c.id).where(posts.c.id == post_id)
-                )).fetchone()
-
-                # continue iterations if duplicate
-                if exists:
-                    logger.info(f"The Post ID: '{post_id}' already exists. Skipped inserting")
-                    continue
-
-                post_db_data = {
-                    "id": post["id"],
-                    "subreddit_id": subreddit_id,
-                    "author": post["author"],
-                    "post_type": "rising",
-                    "title": post["title"],
-                    "selftext": post["selftext"],
-                    "url": post["url"],
-                    "flair": post["flair"],
-                    "created_utc": post["created_utc"]
-                }
-
-                await conn.execute(posts.insert(), post_db_data)
-
-            logger.info(f"Successfully inserted new rising posts into DB (skipped duplicates)")
+        inserted = await _insert_posts(rising_posts_data, subreddit_id, "rising")
+        logger.info(f"Successfully inserted {inserted} new rising posts into DB (skipped duplicates)")
 
     except Exception as e:
         logger.error(f"Failure inserting rising posts data into DB: {e}", exc_info=True)
         raise
 
-async def insert_comments(post_comments, post_id) -> None:
+async def insert_comments(post_comments: List[CommentRecord], post_id) -> None:
     """ Inserting comments of Posts into DB in a transaction """
     if not post_comments:
         logger.info("No commments data of Top Posts to insert")
@@ -138,107 +152,190 @@ async def insert_comments(post_comments, post_id) -> None:
 
     try:
         async with db_session() as conn:
-            for comment in post_comments:
-                comment_id = comment["id"]
-
-                exists = (await conn.execute(
-                    select(comments.c.id).where(comments.c.id == comment_id)
-                )).fetchone()
-
-                # continue iterations if duplicate
-                if exists:
-                    logger.info(f"The Commment ID: '{comment_id}' already exists. Skipped inserting")
-                    continue
+            new_comments = await _without_existing(conn, comments.c.id, post_comments)
+            comments_db_data = []
 
+            for comment in new_comments:
                 # handling parent_comment_id
-                parent_comment_id = comment["parent_id"]
+                parent_comment_id = comment.parent_id
                 if parent_comment_id.startswith("t3_"):     # t3_ are top level comments - no parent id
                     parent_comment_id = None
                 elif parent_comment_id.startswith("t1_"):   # t1_ are comment replies - parent id
                     parent_comment_id = parent_comment_id[3:]
 
-                comments_db_data = {
-                    "id": comment["id"], 
+                comments_db_data.append({
+                    "id": comment.id, 
                     "post_id": post_id, 
                     "parent_comment_id": parent_comment_id, 
-                    "depth": comment["depth"], 
-                    "author": comment["author"],
-                    "text": comment["text"],
-                    "score": comment["score"],
-                    "created_utc": comment["created_utc"],
-                }
-
+                    "depth": comment.depth, 
+                    "author": comment.author,
+                    "text": comment.text,
+                    "score": comment.score,
+                    "created_utc": comment.created_utc,
+                })
+
+            # one executemany in fetch order - parents come before their replies
+            if comments_db_data:
                 await conn.execute(comments.insert(), comments_db_data)
 
-            logger.info(f"Successfully inserted comments of Post '{post_id}' into DB (skipped duplicates)")
+            logger.info(f"Successfully inserted {len(comments_db_data)} comments of Post '{post_id}' into DB (skipped duplicates)")
 
     except Exception as e:
         logger.error(f"Failure inserting comments of Post '{post_id}' into DB: {e}", exc_info=True)
         raise
 
 
-async def insert_post_sentiment(post_data) -> None:
-    """ Inserting the Sentiment of posts into DB in a transaction """
+async def insert_post_sentiment(post_data: List[PostRecord], subreddit_id) -> List[Dict[str, Any]]:
+    """
+    Inserting the Sentiment of posts into DB in a transaction - change-only history + refreshed post_latest
+    Returns: the new/changed snapshots that were written (for the live feed)
+    """
 
     if not post_data:
         logger.info("No post data to insert")
-        return
+        return []
 
-    post_sentiment_to_insert = []
+    measured_at = datetime.now()
+    post_snapshots = {}
 
     for post in post_data:
-        post_sentiment_db_data = {
-            "post_id": post["id"],
-            "title_sentiment": post["title_sentiment"],
-            "body_sentiment": post["body_sentiment"],
-            "score": post["score"],
-            "upvote_ratio": post["upvote_ratio"],
-            "controversiality": post["controversiality"],
-            "num_comments": post["num_comments"],
+        # keyed by id - a post can show up in the same batch twice, the upsert needs unique rows
+        post_snapshots[post.id] = {
+            "post_id": post.id,
+            "subreddit_id": subreddit_id,
+            "title_sentiment": sentiment_json(post.title_sentiment),
+            "body_sentiment": sentiment_json(post.body_sentiment),
+            "score": post.score,
+            "upvote_ratio": post.upvote_ratio,
+            "controversiality": post.controversiality,
+            "num_comments": post.num_comments,
+            "compound": compound_of(post.title_sentiment),
+            "created_utc": post.created_utc,
+            "measured_at": measured_at,
+            "last_seen_at": measured_at,
         }
-        post_sentiment_to_insert.append(post_sentiment_db_data)
 
     try:
         async with db_session() as conn:
-            await conn.execute(post_sentiment_history.insert(), post_sentiment_to_insert)
+            changed, deduplicated = await _write_snapshots(
+                conn, post_sentiment_history, post_latest, "post_id", POST_SNAPSHOT_FIELDS,
+                list(post_snapshots.values()), measured_at
+            )
 
-        logger.info(f"Successfully inserted sentiment of post/s into DB")
+        metrics.increment("snapshots_written.posts", len(changed))
+        metrics.increment("snapshots_deduplicated.posts", deduplicated)
+        logger.info(f"Successfully inserted sentiment of post/s into DB ({len(changed)} changed, {deduplicated} unchanged)")
+        return changed
 
     except Exception as e:
         logger.error(f"Failure inserting sentiment of post/s into DB: {e}", exc_info=True)
         raise
 
-async def insert_comment_sentiment(post_comments) -> None:
-    """ Inserting the Sentiment of comments into DB in a transaction """
+async def insert_comment_sentiment(post_comments: List[CommentRecord], post_id) -> List[Dict[str, Any]]:
+    """
+    Inserting the Sentiment of comments into DB in a transaction - change-only history + refreshed comment_latest
+    Returns: the new/changed snapshots that were written (for the live feed)
+    """
     if not post_comments:
         logger.info("No post comments to insert")
-        return
+        return []
 
-    comment_sentiment_to_insert = []
+    measured_at = datetime.now()
+    comment_snapshots = {}
 
     for comment in post_comments:
-        comment_sentiment_db_data = {
-            "comment_id": comment["id"],
-            "comment_sentiment": comment["sentiment"],
-            "score": comment["score"],
+        comment_snapshots[comment.id] = {
+            "comment_id": comment.id,
+            "post_id": post_id,
+            "comment_sentiment": sentiment_json(comment.sentiment),
+            "score": comment.score,
+            "compound": compound_of(comment.sentiment),
+            "created_utc": comment.created_utc,
+            "measured_at": measured_at,
+            "last_seen_at": measured_at,
         }
-        comment_sentiment_to_insert.append(comment_sentiment_db_data)
 
     try:
         async with db_session() as conn:
-            await conn.execute(comment_sentiment_history.insert(), comment_sentiment_to_insert)
+            # subreddit of the parent post - denormalized into comment_latest
+            subreddit_id = (await conn.execute(
+                select(posts.c.subreddit_id).where(posts.c.id == post_id)
+            )).scalar_one()
+
+            for row in comment_snapshots.values():
+                row["subreddit_id"] = subreddit_id
 
-        logger.info("Successfully inserted sentiment of comment/s into DB")
+            changed, deduplicated = await _write_snapshots(
+                conn, comment_sentiment_history, comment_latest, "comment_id", COMMENT_SNAPSHOT_FIELDS,
+                list(comment_snapshots.values()), measured_at
+            )
+
+        metrics.increment("snapshots_written.comments", len(changed))
+        metrics.increment("snapshots_deduplicated.comments", deduplicated)
+        logger.info(f"Successfully inserted sentiment of comment/s into DB ({len(changed)} changed, {deduplicated} unchanged)")
+        return changed
 
     except Exception as e:
         logger.error(f"Failure inserting sentiment of comment/s into DB: {e}", exc_info=True)
         raise
 
 
+async def _write_snapshots(conn, history_table, latest_table, key: str, fields, snapshots: List[Dict[str, Any]],
+                           measured_at: datetime) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Append only new/changed snapshots to the history table and refresh their latest rows
+    Unchanged snapshots only bump last_seen_at ("still observed at") on the latest row
+    Returns: (snapshots written, number of snapshots deduplicated)
+    """
+    key_column = latest_table.c[key]
+
+    if SNAPSHOT_DEDUPLICATION:
+        previous_rows = (await conn.execute(
+            select(key_column, *(latest_table.c[field] for field in fields))
+            .where(key_column.in_([snapshot[key] for snapshot in snapshots]))
+        )).mappings()
+        previous = {row[key]: row for row in previous_rows}
+        changed, unchanged_ids = split_changed_snapshots(snapshots, previous, key, fields)
+    else:
+        changed, unchanged_ids = snapshots, []
+
+    if changed:
+        history_columns = history_table.c.keys()
+        await conn.execute(history_table.insert(), [
+            {column: snapshot[column] for column in history_columns if column in snapshot} for snapshot in changed
+        ])
+        for offset in range(0, len(changed), UPSERT_BATCH_SIZE):       # same transaction, one statement per batch
+            await conn.execute(_upsert_latest(conn, latest_table, key_column, changed[offset:offset + UPSERT_BATCH_SIZE]))
+
+    if unchanged_ids:
+        await conn.execute(
+            update(latest_table)
+            .where(key_column.in_(unchanged_ids))
+            .values(last_seen_at=measured_at)
+        )
+
+    return changed, len(unchanged_ids)
+
+
+def _dialect_insert(conn, table):
+    """ INSERT with ON CONFLICT support for the connection's backend (same API on Postgres and SQLite) """
+    return sqlite_insert(table) if conn.dialect.name == "sqlite" else pg_insert(table)
+
+
+def _upsert_latest(conn, table, key_column, rows: List[Dict[str, Any]]):
+    """ INSERT ... ON CONFLICT DO UPDATE for the *_latest tables - older snapshots never overwrite newer ones """
+    stmt = _dialect_insert(conn, table).values(rows)
+    return stmt.on_conflict_do_update(
+        index_elements=[key_column],
+        set_={column.name: stmt.excluded[column.name] for column in table.columns if column is not key_column},
+        where=table.c.measured_at <= stmt.excluded.measured_at
+    )
+
+
 async def retrieve_metadata(subreddit_name: str) -> Optional[Dict[str, Any]]:
     """ Read basic subreddit metadata (name, description, subscriber count, created at) from DB by name """
     try:
-        async with db_session() as conn:
+        async with db_read_session() as conn:
             result = (await conn.execute(
                 select(
                     subreddits.c.description,
@@ -263,119 +360,718 @@ async def retrieve_metadata(subreddit_name: str) -> Optional[Dict[str, Any]]:
         raise
 
 
-async def retrieve_posts_data(subreddit_name: str, limit: int) -> List[Dict[str, Any]]:
-    """ Read Posts Data (title, author, score, sentiment score etc.) from a Subreddit from DB """
+async def retrieve_posts_data(subreddit_name: str, limit: int, sort: str = "score",
+                              cursor: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Read Posts Data (title, author, score, sentiment score etc.) from a Subreddit from DB - one row per post (latest snapshot)
+    Keyset pagination: returns the page and the cursor of the next page (None on the last page)
+    """
+    sort_column = _POSTS_SORT_COLUMNS[sort]
+    after = decode_cursor(cursor, sort) if cursor is not None else None     # raises InvalidCursorError (not a DB failure)
+
     try:
-        async with db_session() as conn:
+        async with db_read_session() as conn:
+            subreddit_id = (
+                select(subreddits.c.id)
+                .where(subreddits.c.name == subreddit_name)
+                .scalar_subquery()
+            )
+
             query = (
                 select(                                                                         # selecting desired data
                     posts.c.id,
                     posts.c.title,
                     posts.c.author,
-                    posts.c.created_utc,
-                    post_sentiment_history.c.title_sentiment,
-                    post_sentiment_history.c.body_sentiment,
-                    post_sentiment_history.c.score,
-                    post_sentiment_history.c.upvote_ratio,
-                    post_sentiment_history.c.controversiality,
-                    post_sentiment_history.c.num_comments,
-                    post_sentiment_history.c.measured_at
+                    post_latest.c.created_utc,
+                    post_latest.c.title_sentiment,
+                    post_latest.c.body_sentiment,
+                    post_latest.c.score,
+                    post_latest.c.upvote_ratio,
+                    post_latest.c.controversiality,
+                    post_latest.c.num_comments,
+                    post_latest.c.compound,
+                    post_latest.c.measured_at
                 )
-                .select_from(                                                                   # selecting Tables to join
-                    posts.join(                                                         # Start: "posts" 1st JOIN with "subreddits"
-                        subreddits, posts.c.subreddit_id == subreddits.c.id    # connecting via ForeignKey and primary_key
-                    ).join(                                                                     # 2nd JOIN with "post_sentiment_history"
-                        post_sentiment_history, posts.c.id == post_sentiment_history.c.post_id  # connecting via ForeignKey and primary_key
-                    )
+                .select_from(                                                                   # latest snapshot joined with the post itself (primary key)
+                    post_latest.join(posts, post_latest.c.post_id == posts.c.id)
                 )
-                .where(subreddits.c.name == subreddit_name)   # Filter Condition: user input "subreddit_name"
-                .limit(limit)                                        # Limit: of posts retrieved (default = 5)
+                .where(post_latest.c.subreddit_id == subreddit_id)   # Filter Condition: user input "subreddit_name"
+                .order_by(sort_column.desc(), post_latest.c.post_id.desc())      # served by ix_post_latest_subreddit_* indexes
+                .limit(limit + 1)                                    # one extra row tells if there is a next page
             )
 
+            if after is not None:
+                # keyset condition: continue strictly after the last row of the previous page
+                query = query.where(tuple_(sort_column, post_latest.c.post_id) < tuple_(*map(literal, after)))
+
             results = (await conn.execute(query)).fetchall()
 
             if not results:
                 logger.warning(f"No Posts found for Subreddit '{subreddit_name}' in Database")
-                return []
+                return [], None
 
+            next_cursor = None
+            if len(results) > limit:
+                results = results[:limit]
+                last_row = results[-1]
+                next_cursor = encode_cursor(sort, getattr(last_row, sort), last_row.id)
 
             # results is a sqlalchemy row object so we have to iterate through it and convert it to a dict
             posts_list = []
 
-            for row in results:
-                post_data = {
-                "id": row.id,
-                "title": row.title,
-                "author": row.author,
-                "created_utc": row.created_utc,
-                "title_sentiment": row.title_sentiment,
-                "body_sentiment": row.body_sentiment,
-                "score": row.score,
-                "upvote_ratio": row.upvote_ratio,
-                "controversiality": row.controversiality,
-                "num_comments": row.num_comments,
-                "measured_at": row.measured_at
-                }
-
-                posts_list.append(post_data)
-
-            return posts_list
+            with span("row_mapping"):
+                for row in results:
+                    post_data = {
+                    "id": row.id,
+                    "title": row.title,
+                    "author": row.author,
+                    "created_utc": row.created_utc,
+                    "title_sentiment": row.title_sentiment,
+                    "body_sentiment": row.body_sentiment,
+                    "score": row.score,
+                    "upvote_ratio": row.upvote_ratio,
+                    "controversiality": row.controversiality,
+                    "num_comments": row.num_comments,
+                    "measured_at": row.measured_at
+                    }
+
+                    posts_list.append(post_data)
+
+            return posts_list, next_cursor
 
     except Exception as e:
         logger.error(f"Failed to retrieve Posts data of Subreddit '{subreddit_name}': {e}", exc_info=True)
         raise
 
-async def retrieve_comments_data(subreddit_name: str, limit: int) -> List[Dict[str, Any]]:
-    """ Read Comments Data () from a Subreddit from DB """
+async def retrieve_comments_data(subreddit_name: str, limit: int, sort: str = "score",
+                                 cursor: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Read Comments Data (author, text, score, sentiment etc.) from a Subreddit from DB - one row per comment (latest snapshot)
+    Keyset pagination: returns the page and the cursor of the next page (None on the last page)
+    """
+    sort_column = _COMMENTS_SORT_COLUMNS[sort]
+    after = decode_cursor(cursor, sort) if cursor is not None else None     # raises InvalidCursorError (not a DB failure)
+
     try:
-        async with db_session() as conn:
+        async with db_read_session() as conn:
+            subreddit_id = (
+                select(subreddits.c.id)
+                .where(subreddits.c.name == subreddit_name)
+                .scalar_subquery()
+            )
+
             query = (
                 select(
                     comments.c.id,
                     comments.c.author,
                     comments.c.text,
-                    comments.c.score,
-                    comments.c.created_utc,
-                    comment_sentiment_history.c.comment_sentiment,
-                    comment_sentiment_history.c.measured_at,
+                    comment_latest.c.score,
+                    comment_latest.c.created_utc,
+                    comment_latest.c.comment_sentiment,
+                    comment_latest.c.compound,
+                    comment_latest.c.measured_at,
                 )
                 .select_from(
-                    comments.join(
-                        posts, comments.c.post_id == posts.c.id
-                    ).join(
-                        subreddits, posts.c.subreddit_id == subreddits.c.id
-                    ).join(
-                        comment_sentiment_history, comments.c.id == comment_sentiment_history.c.comment_id
-                    )
+                    comment_latest.join(comments, comment_latest.c.comment_id == comments.c.id)
                 )
-                .where(subreddits.c.name == subreddit_name)
-                .limit(limit)
+                .where(comment_latest.c.subreddit_id == subreddit_id)
+                .order_by(sort_column.desc(), comment_latest.c.comment_id.desc())
+                .limit(limit + 1)
             )
 
+            if after is not None:
+                query = query.where(tuple_(sort_column, comment_latest.c.comment_id) < tuple_(*map(literal, after)))
+
             results = (await conn.execute(query)).fetchall()
 
             if not results:
                 logger.warning(f"No Comments found for Subreddit '{subreddit_name}' in Database")
-                return []
+                return [], None
+
+            next_cursor = None
+            if len(results) > limit:
+                results = results[:limit]
+                last_row = results[-1]
+                next_cursor = encode_cursor(sort, getattr(last_row, sort), last_row.id)
 
             # results is a sqlalchemy row object so we have to iterate through it and convert it to a dict
             comments_list = []
 
+            with span("row_mapping"):
+                for row in results:
+                    comment_data = {
+                        "id": row.id,
+                        "author": row.author,
+                        "text": row.text,
+                        "score": row.score,
+                        "created_utc": row.created_utc,
+                        "comment_sentiment": row.comment_sentiment,
+                        "measured_at": row.measured_at
+                    }
+
+                    comments_list.append(comment_data)
+
+            return comments_list, next_cursor
+
+    except Exception as e:
+        logger.error(f"Failed to retrieve Comments data of Subreddit '{subreddit_name}': {e}", exc_info=True)
+        raise
+
+
+# sort key per sort option - ordered DESC with the id as tie breaker so keyset pages are stable
+_POSTS_SORT_COLUMNS = {
+    "score": post_latest.c.score,
+    "created_utc": post_latest.c.created_utc,
+    "compound": post_latest.c.compound,
+}
+
+_COMMENTS_SORT_COLUMNS = {
+    "score": comment_latest.c.score,
+    "created_utc": comment_latest.c.created_utc,
+    "compound": comment_latest.c.compound,
+}
+
+
+async def search_posts(subreddit_name: str, search_query: str, limit: int,
+                       cursor: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]], Optional[str]]:
+    """
+    Full text search over post title + selftext of a Subreddit (GIN index on posts.search_vector)
+    Returns: matching posts with their latest sentiment (newest first, keyset paginated),
+             the sentiment summary of all matches (first page only) and the next page cursor
+    """
+    after = decode_cursor(cursor, "created_utc") if cursor is not None else None
+    try:
+        async with db_read_session() as conn:
+            subreddit_id = (
+                select(subreddits.c.id)
+                .where(subreddits.c.name == subreddit_name)
+                .scalar_subquery()
+            )
+
+            matches = (
+                post_latest.join(posts, post_latest.c.post_id == posts.c.id)
+            )
+            match_condition = and_(
+                post_latest.c.subreddit_id == subreddit_id,
+                _text_match(conn, posts.c.search_vector, func.coalesce(posts.c.title, "") + " " + func.coalesce(posts.c.selftext, ""), search_query)
+            )
+
+            query = (
+                select(
+                    posts.c.id,
+                    posts.c.title,
+                    posts.c.author,
+                    post_latest.c.created_utc,
+                    post_latest.c.title_sentiment,
+                    post_latest.c.body_sentiment,
+                    post_latest.c.score,
+                    post_latest.c.compound,
+                    post_latest.c.measured_at
+                )
+                .select_from(matches)
+                .where(match_condition)
+                .order_by(post_latest.c.created_utc.desc(), post_latest.c.post_id.desc())
+                .limit(limit + 1)
+            )
+
+            if after is not None:
+                query = query.where(tuple_(post_latest.c.created_utc, post_latest.c.post_id) < tuple_(*map(literal, after)))
+
+            results = (await conn.execute(query)).fetchall()
+
+            next_cursor = None
+            if len(results) > limit:
+                results = results[:limit]
+                next_cursor = encode_cursor("created_utc", results[-1].created_utc, results[-1].id)
+
+            posts_list = []
+
+            for row in results:
+                posts_list.append({
+                    "id": row.id,
+                    "title": row.title,
+                    "author": row.author,
+                    "created_utc": row.created_utc,
+                    "title_sentiment": row.title_sentiment,
+                    "body_sentiment": row.body_sentiment,
+                    "score": row.score,
+                    "compound": row.compound,
+                    "measured_at": row.measured_at
+                })
+
+            # aggregate over all matches - only computed for the first page
+            summary = None
+            if after is None:
+                summary = await _sentiment_summary(conn, matches, match_condition, post_latest.c.compound)
+
+            return posts_list, summary, next_cursor
+
+    except Exception as e:
+        logger.error(f"Failed to search Posts of Subreddit '{subreddit_name}' for '{search_query}': {e}", exc_info=True)
+        raise
+
+
+async def search_comments(subreddit_name: str, search_query: str, limit: int,
+                          cursor: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]], Optional[str]]:
+    """
+    Full text search over comment text of a Subreddit (GIN index on comments.search_vector)
+    Returns: matching comments with their latest sentiment (newest first, keyset paginated),
+             the sentiment summary of all matches (first page only) and the next page cursor
+    """
+    after = decode_cursor(cursor, "created_utc") if cursor is not None else None
+    try:
+        async with db_read_session() as conn:
+            subreddit_id = (
+                select(subreddits.c.id)
+                .where(subreddits.c.name == subreddit_name)
+                .scalar_subquery()
+            )
+
+            matches = (
+                comment_latest.join(comments, comment_latest.c.comment_id == comments.c.id)
+            )
+            match_condition = and_(
+                comment_latest.c.subreddit_id == subreddit_id,
+                _text_match(conn, comments.c.search_vector, comments.c.text, search_query)
+            )
+
+            query = (
+                select(
+                    comments.c.id,
+                    comments.c.post_id,
+                    comments.c.author,
+                    comments.c.text,
+                    comment_latest.c.score,
+                    comment_latest.c.created_utc,
+                    comment_latest.c.comment_sentiment,
+                    comment_latest.c.compound,
+                    comment_latest.c.measured_at
+                )
+                .select_from(matches)
+                .where(match_condition)
+                .order_by(comment_latest.c.created_utc.desc(), comment_latest.c.comment_id.desc())
+                .limit(limit + 1)
+            )
+
+            if after is not None:
+                query = query.where(tuple_(comment_latest.c.created_utc, comment_latest.c.comment_id) < tuple_(*map(literal, after)))
+
+            results = (await conn.execute(query)).fetchall()
+
+            next_cursor = None
+            if len(results) > limit:
+                results = results[:limit]
+                next_cursor = encode_cursor("created_utc", results[-1].created_utc, results[-1].id)
+
+            comments_list = []
+
             for row in results:
-                comment_data = {
+                comments_list.append({
                     "id": row.id,
+                    "post_id": row.post_id,
                     "author": row.author,
                     "text": row.text,
                     "score": row.score,
                     "created_utc": row.created_utc,
                     "comment_sentiment": row.comment_sentiment,
+                    "compound": row.compound,
                     "measured_at": row.measured_at
-                }
+                })
 
-                comments_list.append(comment_data)
+            summary = None
+            if after is None:
+                summary = await _sentiment_summary(conn, matches, match_condition, comment_latest.c.compound)
 
-            return comments_list
+            return comments_list, summary, next_cursor
 
     except Exception as e:
-        logger.error(f"Failed to retrieve Comments data of Subreddit '{subreddit_name}': {e}", exc_info=True)
+        logger.error(f"Failed to search Comments of Subreddit '{subreddit_name}' for '{search_query}': {e}", exc_info=True)
+        raise
+
+
+def _text_match(conn, search_vector, text, search_query: str):
+    """
+    Full text match - Postgres: generated tsvector @@ websearch_to_tsquery (GIN index)
+    SQLite: every term as case insensitive substring, "-term" excludes (scan of the subreddit's rows)
+    """
+    if conn.dialect.name != "sqlite":
+        return search_vector.op("@@")(func.websearch_to_tsquery(literal_column(f"'{SEARCH_TEXT_CONFIG}'"), search_query))
+
+    lowered = func.lower(text)
+    conditions = []
+    for term in search_query.lower().replace('"', " ").split():
+        if term.startswith("-") and len(term) > 1:
+            conditions.append(~lowered.contains(term[1:], autoescape=True))
+        else:
+            conditions.append(lowered.contains(term, autoescape=True))
+
+    return and_(*conditions) if conditions else false()
+
+
+async def _sentiment_summary(conn, from_clause, condition, compound_column) -> Dict[str, Any]:
+    """ Count, mean compound and positive/negative/neutral shares of all rows matching condition (one aggregate query) """
+    positive = compound_column >= SENTIMENT_POSITIVE_THRESHOLD
+    negative = compound_column <= SENTIMENT_NEGATIVE_THRESHOLD
+
+    row = (await conn.execute(
+        select(
+            func.count().label("matches"),
+            func.avg(compound_column).label("mean_compound"),
+            func.count().filter(positive).label("positive"),
+            func.count().filter(negative).label("negative"),
+        )
+        .select_from(from_clause)
+        .where(condition)
+    )).one()
+
+    matches = row.matches
+    return {
+        "matches": matches,
+        "mean_compound": float(row.mean_compound) if row.mean_compound is not None else None,
+        "positive_share": row.positive / matches if matches else 0.0,
+        "negative_share": row.negative / matches if matches else 0.0,
+        "neutral_share": (matches - row.positive - row.negative) / matches if matches else 0.0,
+    }
+
+
+TIMESERIES_FIELDS = ("bucket", "count", "mean", "weighted_mean", "p25", "median", "p75")
+
+
+def _timeseries_source(source: str):
+    """ (history table, entity key, latest table, compound expression, history joined to latest) of posts or comments """
+    if source == "posts":
+        history, latest, key = post_sentiment_history, post_latest, "post_id"
+        compound = history.c.title_sentiment["compound"].as_float()
+    elif source == "comments":
+        history, latest, key = comment_sentiment_history, comment_latest, "comment_id"
+        compound = history.c.comment_sentiment["compound"].as_float()
+    else:
+        raise ValueError(f"Unknown time series source: '{source}'")
+
+    from_clause = history.join(latest, latest.c[key] == history.c[key])
+    return history, history.c[key], latest, compound, from_clause
+
+
+async def retrieve_sentiment_timeseries(subreddit_name: str, source: str, bucket: str,
+                                        start: datetime, end: datetime) -> Optional[Dict[str, List[Any]]]:
+    """
+    Compound sentiment of the Subreddit's posts/comments per hour/day bucket of [start, end), aggregated in the database
+    History only holds changed snapshots: each one is carried forward until the next snapshot (the newest until
+    last_seen_at) - every post/comment observed in a bucket counts once, with its sentiment at the end of the bucket
+    Returns column arrays (bucket, count, mean, score weighted mean, p25, median, p75) - None if the subreddit is unknown
+    """
+    if bucket not in BUCKET_SECONDS:
+        raise ValueError(f"Unknown bucket: '{bucket}'")
+
+    history, key, latest, compound, from_clause = _timeseries_source(source)
+
+    try:
+        async with db_read_session() as conn:
+            subreddit_id = (await conn.execute(
+                select(subreddits.c.id).where(subreddits.c.name == subreddit_name)
+            )).scalar_one_or_none()
+
+            if subreddit_id is None:
+                logger.warning(f"Subreddit '{subreddit_name}' not found in Database")
+                return None
+
+            # SQLite has no percentile_cont / generate_series - carried forward and aggregated in Python
+            if conn.dialect.name == "sqlite":
+                results: List[Any] = await _sqlite_timeseries(conn, history, key, latest, compound, from_clause,
+                                                              subreddit_id, bucket, start, end)
+            else:
+                results = await _postgres_timeseries(conn, history, key, latest, compound, from_clause,
+                                                     subreddit_id, bucket, start, end)
+
+            logger.info(f"Sentiment time series ({source}, {bucket}) of Subreddit '{subreddit_name}': {len(results)} buckets")
+            return rows_to_columns(results, TIMESERIES_FIELDS)
+
+    except Exception as e:
+        logger.error(f"Failed to retrieve sentiment time series of Subreddit '{subreddit_name}': {e}", exc_info=True)
+        raise
+
+
+async def _postgres_timeseries(conn, history, key, latest, compound, from_clause, subreddit_id: str, bucket: str,
+                               start: datetime, end: datetime) -> List[Any]:
+    """ Snapshots expanded to the buckets they stand for (generate_series) and aggregated per bucket """
+    first_bucket, last_bucket = bucket_bounds(start, end, bucket)
+
+    # unit and step inlined (validated by the caller) - the interval is a literal, not a bindable value
+    unit = literal_column(f"'{bucket}'", String)
+    step = literal_column(f"interval '1 {bucket}'", Interval)
+    next_measured_at = func.lead(history.c.measured_at).over(partition_by=key, order_by=(history.c.measured_at, history.c.id))
+
+    # buckets of every snapshot: from its own up to the one before the next snapshot's (the newest: up to last_seen_at's)
+    spans = (
+        select(
+            compound.label("compound"),
+            (func.greatest(history.c.score, 0) + 1).label("weight"),     # score weighted: score <= 0 still counts once
+            func.greatest(func.date_trunc(unit, history.c.measured_at), first_bucket).label("first_bucket"),
+            func.least(
+                func.coalesce(func.date_trunc(unit, next_measured_at) - step, func.date_trunc(unit, latest.c.last_seen_at)),
+                last_bucket
+            ).label("last_bucket"),
+        )
+        .select_from(from_clause)
+        .where(
+            latest.c.subreddit_id == subreddit_id,
+            latest.c.last_seen_at >= first_bucket,              # posts/comments last observed before the range can't reach it
+            history.c.measured_at < end
+        )
+        .subquery("spans")
+    )
+    buckets = func.generate_series(spans.c.first_bucket, spans.c.last_bucket, step).table_valued("bucket").render_derived("buckets")
+
+    return (await conn.execute(
+        select(
+            buckets.c.bucket,
+            func.count().label("count"),
+            func.avg(spans.c.compound).label("mean"),
+            (func.sum(spans.c.compound * spans.c.weight) / func.sum(spans.c.weight)).label("weighted_mean"),
+            func.percentile_cont(0.25).within_group(spans.c.compound).label("p25"),
+            func.percentile_cont(0.5).within_group(spans.c.compound).label("median"),
+            func.percentile_cont(0.75).within_group(spans.c.compound).label("p75"),
+        )
+        .select_from(spans.join(buckets, true()))               # function in FROM: implicitly LATERAL
+        .where(spans.c.compound.is_not(None))
+        .group_by(buckets.c.bucket)
+        .order_by(buckets.c.bucket)
+    )).fetchall()
+
+
+async def _sqlite_timeseries(conn, history, key, latest, compound, from_clause, subreddit_id: str, bucket: str,
+                             start: datetime, end: datetime) -> List[TimeseriesBucket]:
+    """ Snapshots of the range from the DB, carried forward and aggregated in Python """
+    first_bucket, _ = bucket_bounds(start, end, bucket)
+
+    snapshots = (await conn.execute(
+        select(key, history.c.measured_at, compound, history.c.score, latest.c.last_seen_at)
+        .select_from(from_clause)
+        .where(
+            latest.c.subreddit_id == subreddit_id,
+            latest.c.last_seen_at >= first_bucket,
+            history.c.measured_at < end
+        )
+        .order_by(key, history.c.measured_at, history.c.id)
+    )).all()
+
+    return aggregate_buckets(carry_forward(
+        ((entity, measured_at, value, max(score or 0, 0) + 1, last_seen_at)
+         for entity, measured_at, value, score, last_seen_at in snapshots),
+        bucket, start, end
+    ))
+
+
+def _median_compound_by_subreddit(selected):
+    """ Median post compound per subreddit with window functions - SQLite has no percentile_cont """
+    ranked = (
+        select(
+            post_latest.c.subreddit_id,
+            post_latest.c.compound,
+            func.row_number().over(partition_by=post_latest.c.subreddit_id, order_by=post_latest.c.compound).label("position"),
+            func.count().over(partition_by=post_latest.c.subreddit_id).label("total"),
+        )
+        .where(post_latest.c.subreddit_id.in_(selected))
+        .subquery()
+    )
+    # the middle row (odd count) or the two middle rows (even count), averaged
+    return (
+        select(ranked.c.subreddit_id, func.avg(ranked.c.compound).label("median_compound"))
+        .where(ranked.c.position.between(ranked.c.total / 2.0, ranked.c.total / 2.0 + 1))
+        .group_by(ranked.c.subreddit_id)
+        .subquery()
+    )
+
+
+async def compare_subreddits(subreddit_names: List[str]) -> List[Dict[str, Any]]:
+    """
+    Side by side sentiment aggregates of several subreddits in one query: posts and comments (latest snapshots)
+    are aggregated per subreddit in two grouped subqueries joined to subreddits
+    Subreddits that are not in the database are left out
+    """
+    positive = post_latest.c.compound >= SENTIMENT_POSITIVE_THRESHOLD
+    negative = post_latest.c.compound <= SENTIMENT_NEGATIVE_THRESHOLD
+
+    selected = select(subreddits.c.id).where(subreddits.c.name.in_(subreddit_names)).scalar_subquery()
+
+    comment_stats = (
+        select(
+            comment_latest.c.subreddit_id,
+            func.count().label("comment_count"),
+            func.avg(comment_latest.c.compound).label("comment_mean_compound"),
+        )
+        .where(comment_latest.c.subreddit_id.in_(selected))
+        .group_by(comment_latest.c.subreddit_id)
+        .subquery()
+    )
+
+    try:
+        async with db_read_session() as conn:
+            sqlite = conn.dialect.name == "sqlite"
+
+            post_stats = (
+                select(
+                    post_latest.c.subreddit_id,
+                    func.count().label("post_count"),
+                    func.avg(post_latest.c.compound).label("mean_compound"),
+                    *([] if sqlite else [
+                        func.percentile_cont(0.5).within_group(post_latest.c.compound).label("median_compound")
+                    ]),
+                    func.count().filter(positive).label("positive"),
+                    func.count().filter(negative).label("negative"),
+                    func.avg(post_latest.c.controversiality).label("mean_controversiality"),
+                    func.avg(post_latest.c.score).label("mean_score"),
+                )
+                .where(post_latest.c.subreddit_id.in_(selected))      # leading column of the ix_post_latest_subreddit_* indexes
+                .group_by(post_latest.c.subreddit_id)
+                .subquery()
+            )
+
+            from_clause = (
+                subreddits
+                .outerjoin(post_stats, post_stats.c.subreddit_id == subreddits.c.id)
+                .outerjoin(comment_stats, comment_stats.c.subreddit_id == subreddits.c.id)
+            )
+
+            if sqlite:
+                medians = _median_compound_by_subreddit(selected)
+                from_clause = from_clause.outerjoin(medians, medians.c.subreddit_id == subreddits.c.id)
+                median_compound = medians.c.median_compound
+            else:
+                median_compound = post_stats.c.median_compound
+
+            results = (await conn.execute(
+                select(
+                    subreddits.c.name,
+                    post_stats.c.post_count, post_stats.c.mean_compound, median_compound,
+                    post_stats.c.positive, post_stats.c.negative, post_stats.c.mean_controversiality,
+                    post_stats.c.mean_score, comment_stats.c.comment_count, comment_stats.c.comment_mean_compound
+                )
+                .select_from(from_clause)
+                .where(subreddits.c.name.in_(subreddit_names))
+            )).fetchall()
+
+            comparison = []
+            for row in results:
+                post_count = row.post_count or 0
+                comparison.append({
+                    "name": row.name,
+                    "post_count": post_count,
+                    "comment_count": row.comment_count or 0,
+                    "mean_compound": float(row.mean_compound) if row.mean_compound is not None else None,
+                    "median_compound": float(row.median_compound) if row.median_compound is not None else None,
+                    "positive_share": row.positive / post_count if post_count else 0.0,
+                    "negative_share": row.negative / post_count if post_count else 0.0,
+                    "mean_controversiality": float(row.mean_controversiality) if row.mean_controversiality is not None else None,
+                    "mean_score": float(row.mean_score) if row.mean_score is not None else None,
+                    "comment_mean_compound": float(row.comment_mean_compound) if row.comment_mean_compound is not None else None,
+                })
+
+            logger.info(f"Compared {len(comparison)} of {len(subreddit_names)} requested Subreddits")
+            return comparison
+
+    except Exception as e:
+        logger.error(f"Failed to compare Subreddits {subreddit_names}: {e}", exc_info=True)
+        raise
+
+
+async def retrieve_subreddit_id(subreddit_name: str) -> Optional[str]:
+    """ Subreddit id by name - None if the subreddit was never collected """
+    try:
+        async with db_read_session() as conn:
+            return (await conn.execute(
+                select(subreddits.c.id).where(subreddits.c.name == subreddit_name)
+            )).scalar_one_or_none()
+
+    except Exception as e:
+        logger.error(f"Failed to retrieve id of Subreddit '{subreddit_name}': {e}", exc_info=True)
         raise
+
+
+EXPORT_DATASETS = ("posts", "comments", "post_history", "comment_history")
+
+
+def _export_query(dataset: str, subreddit_id: Optional[str]):
+    """ Full dataset of one subreddit, in a stable order served by the (subreddit, created) / primary key indexes """
+    if dataset == "posts":
+        return (
+            select(
+                posts.c.id, posts.c.author, posts.c.post_type, posts.c.title, posts.c.selftext, posts.c.url,
+                posts.c.flair, posts.c.created_utc, post_latest.c.score, post_latest.c.upvote_ratio,
+                post_latest.c.controversiality, post_latest.c.num_comments, post_latest.c.compound,
+                post_latest.c.title_sentiment, post_latest.c.body_sentiment, post_latest.c.measured_at,
+                post_latest.c.last_seen_at
+            )
+            .select_from(posts.outerjoin(post_latest, post_latest.c.post_id == posts.c.id))
+            .where(posts.c.subreddit_id == subreddit_id)
+            .order_by(posts.c.created_utc, posts.c.id)
+        )
+
+    if dataset == "comments":
+        return (
+            select(
+                comments.c.id, comments.c.post_id, comments.c.parent_comment_id, comments.c.depth, comments.c.author,
+                comments.c.text, comments.c.created_utc, comment_latest.c.score, comment_latest.c.compound,
+                comment_latest.c.comment_sentiment, comment_latest.c.measured_at, comment_latest.c.last_seen_at
+            )
+            .select_from(
+                comments.join(posts, comments.c.post_id == posts.c.id)
+                .outerjoin(comment_latest, comment_latest.c.comment_id == comments.c.id)
+            )
+            .where(posts.c.subreddit_id == subreddit_id)
+            .order_by(comments.c.created_utc, comments.c.id)
+        )
+
+    if dataset == "post_history":
+        return (
+            select(
+                post_sentiment_history.c.post_id, post_sentiment_history.c.measured_at,
+                post_sentiment_history.c.score, post_sentiment_history.c.upvote_ratio,
+                post_sentiment_history.c.controversiality, post_sentiment_history.c.num_comments,
+                post_sentiment_history.c.title_sentiment, post_sentiment_history.c.body_sentiment
+            )
+            .select_from(post_sentiment_history.join(posts, post_sentiment_history.c.post_id == posts.c.id))
+            .where(posts.c.subreddit_id == subreddit_id)
+            .order_by(post_sentiment_history.c.id)          # insert order = measurement order
+        )
+
+    if dataset == "comment_history":
+        return (
+            select(
+                comment_sentiment_history.c.comment_id, comments.c.post_id, comment_sentiment_history.c.measured_at,
+                comment_sentiment_history.c.score, comment_sentiment_history.c.comment_sentiment
+            )
+            .select_from(
+                comment_sentiment_history.join(comments, comment_sentiment_history.c.comment_id == comments.c.id)
+                .join(posts, comments.c.post_id == posts.c.id)
+            )
+            .where(posts.c.subreddit_id == subreddit_id)
+            .order_by(comment_sentiment_history.c.id)
+        )
+
+    raise ValueError(f"Unknown export dataset: '{dataset}'")
+
+
+def export_columns(dataset: str) -> List[str]:
+    """ Column names of an export (CSV header) - known without running the query """
+    return list(_export_query(dataset, None).selected_columns.keys())
+
+
+async def stream_export(subreddit_id: str, dataset: str,
+                        batch_size: int = EXPORT_BATCH_SIZE) -> AsyncIterator[List[Dict[str, Any]]]:
+    """
+    Yield a full dataset of a subreddit in batches of batch_size rows from a server-side cursor
+    Only one batch is in memory at a time - the read connection is held until the generator is exhausted or closed
+    """
+    query = _export_query(dataset, subreddit_id).execution_options(yield_per=batch_size)
+    exported = 0
+
+    async with db_read_session() as conn:
+        result = await conn.stream(query)
+
+        async for partition in result.mappings().partitions(batch_size):
+            exported += len(partition)
+            yield partition
+
+    logger.info(f"Export '{dataset}' of Subreddit '{subreddit_id}' finished: {exported} rows")
+
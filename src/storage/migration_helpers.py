@@ -0,0 +1,43 @@
+# ~/reddit_sentiment_tracker/src/storage/migration_helpers.py
+
+import sqlalchemy as sa
+from alembic import op, context
+
+# Online DDL for the alembic revisions that touch the hot tables (alembic/versions). Call them inside
+# op.get_context().autocommit_block(): CREATE INDEX CONCURRENTLY can't run in a transaction, and every
+# backfill batch commits on its own - no statement holds locks on a whole table while the API reads it.
+
+
+def drop_if_invalid(name: str) -> None:
+    """ Drop a leftover INVALID index from an interrupted concurrent build """
+    if context.is_offline_mode():
+        return
+
+    invalid = op.get_bind().execute(sa.text("""
+        SELECT 1 FROM pg_class c JOIN pg_index i ON i.indexrelid = c.oid
+        WHERE c.relname = :name AND NOT i.indisvalid
+    """), {"name": name}).first()
+
+    if invalid:
+        op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {name}')
+
+
+def create_index_concurrently(name: str, table: str, definition: str) -> None:
+    """ CREATE INDEX CONCURRENTLY IF NOT EXISTS - rebuilds a leftover INVALID index of the same name """
+    drop_if_invalid(name)
+    op.execute(f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} {definition}')
+
+
+def backfill_in_batches(table: str, key: str, assignment: str, pending: str, batch_size: int = 5000) -> None:
+    """
+    UPDATE table SET assignment for the rows matching pending, batch_size rows per committed statement
+    pending must stop matching a row once it is updated (the loop ends when no row matches)
+    """
+    if context.is_offline_mode():
+        op.execute(f'UPDATE {table} SET {assignment} WHERE {pending}')     # --sql: one statement, rowcounts unknown
+        return
+
+    batch = sa.text(f'UPDATE {table} SET {assignment} WHERE {key} IN '
+                    f'(SELECT {key} FROM {table} WHERE {pending} LIMIT {batch_size})')
+    while op.get_bind().execute(batch).rowcount:
+        pass
@@ -0,0 +1,58 @@
+# ~/reddit_sentiment_tracker/src/storage/redis_connection.py
+
+import logging
+from typing import Optional
+import redis.asyncio as redis
+from ..config import REDIS_URL, REDIS_MAX_CONNECTIONS, REDIS_SOCKET_TIMEOUT
+
+logger = logging.getLogger("reddit_sentiment_tracker")
+
+# one pooled client per process - created on first use, closed in the app lifespan
+_redis_client: Optional[redis.Redis] = None
+
+
+def get_redis() -> redis.Redis:
+    """ Shared Redis client (connection pool) """
+    global _redis_client
+
+    if _redis_client is None:
+        if not REDIS_URL:
+            raise ValueError("REDIS_URL variable is required")
+
+        _redis_client = redis.from_url(
+            REDIS_URL,
+            decode_responses=True,
+            max_connections=REDIS_MAX_CONNECTIONS,
+            socket_timeout=REDIS_SOCKET_TIMEOUT,
+            socket_connect_timeout=REDIS_SOCKET_TIMEOUT
+        )
+        logger.info("Redis connection pool created")
+
+    return _redis_client
+
+
+async def init_redis() -> bool:
+    """ Create the shared client at startup and check that Redis answers - Redis is optional, so only warn """
+    try:
+        await get_redis().ping()       # type: ignore[misc]  # typed for the sync and the asyncio client
+        logger.info("Redis connection successfully established")
+        return True
+    except Exception as e:
+        logger.warning(f"Redis unavailable at startup (rate limiting and response cache degraded): {e}")
+        return False
+
+
+def reset_after_fork() -> None:
+    """ Forget a client inherited from the parent process - the next get_redis() builds this process's own pool """
+    global _redis_client
+    _redis_client = None
+
+
+async def close_redis() -> None:
+    """ Close the shared Redis client and its pool """
+    global _redis_client
+
+    if _redis_client is not None:
+        await _redis_client.aclose()
+        _redis_client = None
+        logger.info("Redis connection pool closed")
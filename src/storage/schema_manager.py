@@ -1,10 +1,26 @@
 # ~/reddit_sentiment_tracker/src/storage/schema_manager.py
 
 from datetime import datetime, timezone
-from sqlalchemy.dialects.postgresql import JSONB
-from sqlalchemy import (Column, ForeignKey, Table,
-                        String, Integer, Float, DateTime, Text)
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.schema import CreateColumn
+from sqlalchemy import (Column, ForeignKey, Table, Index, Computed,
+                        String, Integer, Float, DateTime, Text, JSON)
 from .connection import metadata
+from ..config import SEARCH_TEXT_CONFIG
+
+# dialect aware types for the SQLite backend (connection.py): JSONB is plain JSON (text) there, the
+# generated tsvector columns and their GIN indexes don't exist - search falls back to LIKE (crud.py)
+JSONType = JSONB().with_variant(JSON(), "sqlite")
+
+
+@compiles(CreateColumn, "sqlite")
+def _skip_tsvector_columns(element, compiler, **kw):
+    """ CREATE TABLE on SQLite without the Postgres full text search columns """
+    if isinstance(element.element.type, TSVECTOR):
+        return None
+    return compiler.visit_create_column(element, **kw)
+
 
 users = Table(
     'users', metadata,
@@ -38,14 +54,18 @@ posts = Table(
     Column('flair', String),
     Column('created_utc', DateTime, nullable=False),
     Column('fetched_at', DateTime, default=datetime.now(), nullable=False),
+    Column('search_vector', TSVECTOR, Computed(      # full text search - maintained by postgres on insert
+        f"to_tsvector('{SEARCH_TEXT_CONFIG}', coalesce(title, '') || ' ' || coalesce(selftext, ''))", persisted=True)),
 )
 
+Index('ix_posts_search_vector', posts.c.search_vector, postgresql_using='gin').ddl_if(dialect="postgresql")
+
 post_sentiment_history = Table(
     'post_sentiment_history', metadata,
     Column('id', Integer, primary_key=True, autoincrement=True),
     Column('post_id', String, ForeignKey('posts.id'), nullable=False, index=True),    # index for post id
-    Column('title_sentiment', JSONB),
-    Column('body_sentiment', JSONB),
+    Column('title_sentiment', JSONType),
+    Column('body_sentiment', JSONType),
     Column('score', Integer),
     Column('upvote_ratio', Float),
     Column('controversiality', Float),
@@ -53,6 +73,12 @@ post_sentiment_history = Table(
     Column('measured_at', DateTime, default=datetime.now(), nullable=False)
 )
 
+# latest snapshot of one post / time range scans (BRIN - measured_at follows insert order)
+Index('ix_post_sentiment_history_post_measured', post_sentiment_history.c.post_id, post_sentiment_history.c.measured_at.desc())
+Index('ix_post_sentiment_history_measured_brin', post_sentiment_history.c.measured_at, postgresql_using='brin')
+# posts of a subreddit by time
+Index('ix_posts_subreddit_created', posts.c.subreddit_id, posts.c.created_utc)
+
 comments = Table(
     'comments', metadata,
     Column('id', String, primary_key=True),
@@ -63,18 +89,67 @@ comments = Table(
     Column('text', Text),
     Column('score', Integer),
     Column('created_utc', DateTime, nullable=False, index=True),     # index for time based queries
-    Column('fetched_at', DateTime, default=datetime.now(), nullable=False)
-)    
+    Column('fetched_at', DateTime, default=datetime.now(), nullable=False),
+    Column('search_vector', TSVECTOR, Computed(      # full text search - maintained by postgres on insert
+        f"to_tsvector('{SEARCH_TEXT_CONFIG}', coalesce(text, ''))", persisted=True)),
+)
+
+Index('ix_comments_search_vector', comments.c.search_vector, postgresql_using='gin').ddl_if(dialect="postgresql")
 
 comment_sentiment_history = Table(
     'comment_sentiment_history', metadata,
     Column('id', Integer, primary_key=True, autoincrement=True),
     Column('comment_id', String, ForeignKey('comments.id'), nullable=False, index=True),  # index for comment id
-    Column('comment_sentiment', JSONB),
+    Column('comment_sentiment', JSONType),
     Column('score', Integer),
     Column('measured_at', DateTime, default=datetime.now(), nullable=False)
 )
 
+# latest snapshot of one comment / time range scans / comments of a post by time
+Index('ix_comment_sentiment_history_comment_measured', comment_sentiment_history.c.comment_id, comment_sentiment_history.c.measured_at.desc())
+Index('ix_comment_sentiment_history_measured_brin', comment_sentiment_history.c.measured_at, postgresql_using='brin')
+Index('ix_comments_post_created', comments.c.post_id, comments.c.created_utc)
+
+# latest snapshot per post - kept up to date by the insert path, read paths are served from here
+post_latest = Table(
+    'post_latest', metadata,
+    Column('post_id', String, ForeignKey('posts.id'), primary_key=True),
+    Column('subreddit_id', String, ForeignKey('subreddits.id'), nullable=False),   # denormalized for per subreddit index scans
+    Column('title_sentiment', JSONType),
+    Column('body_sentiment', JSONType),
+    Column('score', Integer, nullable=False),
+    Column('upvote_ratio', Float),
+    Column('controversiality', Float),
+    Column('num_comments', Integer),
+    Column('compound', Float, nullable=False, server_default='0'),     # title compound score - sortable without JSON extraction
+    Column('created_utc', DateTime, nullable=False),     # denormalized from posts for recency ordering
+    Column('measured_at', DateTime, nullable=False),     # when this snapshot was first measured (last change)
+    Column('last_seen_at', DateTime, nullable=False)     # when an identical snapshot was last observed
+)
+
+# composite indexes matching the ORDER BY of the read paths (id as tie breaker)
+Index('ix_post_latest_subreddit_score', post_latest.c.subreddit_id, post_latest.c.score.desc(), post_latest.c.post_id.desc())
+Index('ix_post_latest_subreddit_created', post_latest.c.subreddit_id, post_latest.c.created_utc.desc(), post_latest.c.post_id.desc())
+Index('ix_post_latest_subreddit_compound', post_latest.c.subreddit_id, post_latest.c.compound.desc(), post_latest.c.post_id.desc())
+
+# latest snapshot per comment
+comment_latest = Table(
+    'comment_latest', metadata,
+    Column('comment_id', String, ForeignKey('comments.id'), primary_key=True),
+    Column('post_id', String, ForeignKey('posts.id'), nullable=False),
+    Column('subreddit_id', String, ForeignKey('subreddits.id'), nullable=False),   # denormalized for per subreddit index scans
+    Column('comment_sentiment', JSONType),
+    Column('score', Integer, nullable=False),
+    Column('compound', Float, nullable=False, server_default='0'),     # comment compound score - sortable without JSON extraction
+    Column('created_utc', DateTime, nullable=False),
+    Column('measured_at', DateTime, nullable=False),     # when this snapshot was first measured (last change)
+    Column('last_seen_at', DateTime, nullable=False)     # when an identical snapshot was last observed
+)
+
+Index('ix_comment_latest_subreddit_score', comment_latest.c.subreddit_id, comment_latest.c.score.desc(), comment_latest.c.comment_id.desc())
+Index('ix_comment_latest_subreddit_created', comment_latest.c.subreddit_id, comment_latest.c.created_utc.desc(), comment_latest.c.comment_id.desc())
+Index('ix_comment_latest_subreddit_compound', comment_latest.c.subreddit_id, comment_latest.c.compound.desc(), comment_latest.c.comment_id.desc())
+
 average_daily_sentiment = Table(
     'average_daily_sentiment', metadata,
     Column('id', Integer, primary_key=True, autoincrement=True),
@@ -0,0 +1,31 @@
+# ~/reddit_sentiment_tracker/src/storage/snapshots.py
+
+from typing import Any, Dict, List, Mapping, Sequence, Tuple
+
+# fields that make up a sentiment snapshot - if none of them changed the snapshot is not stored again
+POST_SNAPSHOT_FIELDS = ("title_sentiment", "body_sentiment", "score", "upvote_ratio", "controversiality", "num_comments")
+COMMENT_SNAPSHOT_FIELDS = ("comment_sentiment", "score")
+
+
+def split_changed_snapshots(
+    new_rows: Sequence[Dict[str, Any]],
+    previous: Mapping[str, Mapping[str, Any]],
+    key: str,
+    fields: Sequence[str]
+) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """
+    Compare new snapshot rows against the last known snapshot per entity
+    Returns: (rows that are new or changed, ids whose snapshot is unchanged)
+    """
+    changed = []
+    unchanged_ids = []
+
+    for row in new_rows:
+        last = previous.get(row[key])
+
+        if last is not None and all(row[field] == last[field] for field in fields):
+            unchanged_ids.append(row[key])
+        else:
+            changed.append(row)
+
+    return changed, unchanged_ids
@@ -0,0 +1,72 @@
+# ~/reddit_sentiment_tracker/src/utils/export_formats.py
+
+import io
+import csv
+import json
+from datetime import datetime
+from typing import Any, AsyncIterator, Iterable, Mapping, Sequence
+
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def _json_default(value: Any) -> str:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _csv_value(value: Any) -> Any:
+    """ Flat CSV cell: datetimes as ISO 8601, sentiment dicts as JSON, NULL as empty """
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, separators=(",", ":"))
+    return value
+
+
+def ndjson_chunk(rows: Iterable[Mapping[str, Any]]) -> bytes:
+    """ One JSON object per line """
+    return "".join(
+        json.dumps(dict(row), default=_json_default, separators=(",", ":")) + "\n" for row in rows
+    ).encode("utf-8")
+
+
+class CsvChunkEncoder:
+    """ Encodes batches of rows as CSV text, reusing one buffer """
+    def __init__(self, columns: Sequence[str]) -> None:
+        self.columns = list(columns)
+        self.buffer = io.StringIO()
+        self.writer = csv.writer(self.buffer, lineterminator="\n")
+
+    def _drain(self) -> bytes:
+        chunk = self.buffer.getvalue().encode("utf-8")
+        self.buffer.seek(0)
+        self.buffer.truncate()
+        return chunk
+
+    def header(self) -> bytes:
+        self.writer.writerow(self.columns)
+        return self._drain()
+
+    def rows(self, rows: Iterable[Mapping[str, Any]]) -> bytes:
+        self.writer.writerows([_csv_value(row[column]) for column in self.columns] for row in rows)
+        return self._drain()
+
+
+async def encode_export(batches: AsyncIterator[Sequence[Mapping[str, Any]]], columns: Sequence[str],
+                        export_format: str) -> AsyncIterator[bytes]:
+    """ Turn streamed row batches into NDJSON or CSV chunks (one chunk per batch) """
+    if export_format == "csv":
+        encoder = CsvChunkEncoder(columns)
+        yield encoder.header()
+        async for batch in batches:
+            yield encoder.rows(batch)
+
+    elif export_format == "ndjson":
+        async for batch in batches:
+            yield ndjson_chunk(batch)
+
+    else:
+        raise ValueError(f"Unknown export format: '{export_format}'")
@@ -0,0 +1,44 @@
+# ~/reddit_sentiment_tracker/src/utils/metrics.py
+
+import threading
+from typing import Dict, Any
+
+# in-process counters and timings - exposed through GET /metrics
+_lock = threading.Lock()
+_counters: Dict[str, float] = {}
+_timings: Dict[str, Dict[str, float]] = {}
+
+
+def increment(name: str, amount: float = 1) -> None:
+    """ Increase a named counter """
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + amount
+
+
+def observe(name: str, seconds: float) -> None:
+    """ Record a duration for a named timing (count, total, max) """
+    with _lock:
+        timing = _timings.get(name)
+        if timing is None:
+            timing = _timings[name] = {"count": 0, "total_seconds": 0.0, "max_seconds": 0.0}
+        timing["count"] += 1
+        timing["total_seconds"] += seconds
+        if seconds > timing["max_seconds"]:
+            timing["max_seconds"] = seconds
+
+
+def snapshot() -> Dict[str, Any]:
+    """ Copy of all counters and timings (with the mean added) """
+    with _lock:
+        timings = {
+            name: {**timing, "mean_seconds": timing["total_seconds"] / timing["count"]}
+            for name, timing in _timings.items()
+        }
+        return {"counters": dict(_counters), "timings": timings}
+
+
+def reset() -> None:
+    """ Clear all metrics """
+    with _lock:
+        _counters.clear()
+        _timings.clear()
@@ -0,0 +1,53 @@
+# ~/reddit_sentiment_tracker/src/utils/pagination.py
+
+import json
+import base64
+import binascii
+from datetime import datetime
+from typing import Any, Tuple
+
+# sort options for the list endpoints - value type of the sort key in the cursor
+SORT_KEY_TYPES = {
+    "created_utc": datetime,
+    "score": int,
+    "compound": float,
+}
+
+
+class InvalidCursorError(ValueError):
+    """ Raised when a pagination cursor cannot be decoded or does not match the requested sort """
+
+
+def encode_cursor(sort: str, sort_value: Any, last_id: str) -> str:
+    """ Encode the keyset position (sort key value + id of the last row) into an opaque url-safe token """
+    if isinstance(sort_value, datetime):
+        sort_value = sort_value.isoformat()
+
+    raw = json.dumps([sort, sort_value, last_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str) -> Tuple[Any, str]:
+    """ Decode a token from encode_cursor. Raises InvalidCursorError if it is malformed or was issued for another sort """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_sort, sort_value, last_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, TypeError, binascii.Error) as e:
+        raise InvalidCursorError(f"Malformed cursor: {e}")
+
+    if cursor_sort != sort:
+        raise InvalidCursorError(f"Cursor was issued for sort '{cursor_sort}', not '{sort}'")
+
+    if not isinstance(last_id, str):
+        raise InvalidCursorError("Malformed cursor: id must be a string")
+
+    key_type = SORT_KEY_TYPES[sort]
+    try:
+        if key_type is datetime:
+            sort_value = datetime.fromisoformat(sort_value)
+        else:
+            sort_value = key_type(sort_value)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursorError(f"Malformed cursor value: {e}")
+
+    return sort_value, last_id
@@ -0,0 +1,175 @@
+# ~/reddit_sentiment_tracker/src/utils/profiling.py
+
+import re
+import sys
+import json
+import time
+import secrets
+import cProfile
+import threading
+from pathlib import Path
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from ..config import PROFILE_DIR, PROFILE_SAMPLE_INTERVAL, PROFILE_KEEP
+
+# On-demand profiles of single requests (src/api/request_profiling.py) and collection runs (main.py --profile):
+#  "cprofile" - deterministic, every function call of the profiled thread -> .pstats (python -m pstats, snakeviz)
+#  "sample"   - the thread's stack every PROFILE_SAMPLE_INTERVAL seconds from a background thread -> speedscope
+#               JSON (https://www.speedscope.app); low overhead, also shows time spent waiting (selector.select)
+# Both profile the whole thread - on the event loop that includes whatever else the loop ran meanwhile.
+# One profile per process at a time; nothing is installed until a profile starts.
+
+PROFILE_MODES = {"cprofile": ".pstats", "sample": ".speedscope.json"}
+
+_PROFILE_ID = re.compile(r"^[0-9]{8}-[0-9]{6}-[A-Za-z0-9_-]{0,60}-[0-9a-f]{6}$")
+_active = threading.Lock()          # held while a profile runs in this process
+
+
+class SamplingProfiler:
+    """ Stack sampler of one thread (the caller's by default) - sys._current_frames() from a daemon thread """
+    def __init__(self, interval: float = PROFILE_SAMPLE_INTERVAL, thread_id: Optional[int] = None) -> None:
+        self.interval = interval
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self.frames: List[Dict[str, Any]] = []                      # speedscope shared frames
+        self._frame_index: Dict[Tuple[str, str, int], int] = {}
+        self.samples: List[List[int]] = []                          # frame indices, root first
+        self.weights: List[float] = []                              # seconds per sample
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self) -> None:
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            now = time.perf_counter()
+            if frame is None:
+                break                                               # profiled thread ended
+            self._record(frame, now - last)
+            last = now
+
+    def _record(self, frame: Any, weight: float) -> None:
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            key = (getattr(code, "co_qualname", code.co_name), code.co_filename, code.co_firstlineno)
+            index = self._frame_index.get(key)
+            if index is None:
+                index = self._frame_index[key] = len(self.frames)
+                self.frames.append({"name": key[0], "file": key[1], "line": key[2]})
+            stack.append(index)
+            frame = frame.f_back
+        stack.reverse()
+        self.samples.append(stack)
+        self.weights.append(weight)
+
+    def speedscope(self, name: str) -> Dict[str, Any]:
+        """ speedscope file format, one "sampled" profile """
+        total = sum(self.weights)
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "reddit_sentiment_tracker",
+            "shared": {"frames": self.frames},
+            "profiles": [{
+                "type": "sampled", "name": name, "unit": "seconds", "startValue": 0, "endValue": total,
+                "samples": self.samples, "weights": self.weights,
+            }],
+        }
+
+
+class ProfileSession:
+    """ One running profile - stop() ends it (and frees the profiler for the next one), save() writes it """
+    def __init__(self, mode: str, label: str) -> None:
+        self.mode = mode
+        self.label = label
+        self.profile_id = (f"{time.strftime('%Y%m%d-%H%M%S')}-{re.sub(r'[^A-Za-z0-9_-]+', '_', label).strip('_')[:60]}"
+                           f"-{secrets.token_hex(3)}")
+        self.started = time.perf_counter()
+        self.duration: Optional[float] = None
+        if mode == "cprofile":
+            self._profiler: Any = cProfile.Profile()
+            self._profiler.enable()
+        else:
+            self._profiler = SamplingProfiler()
+            self._profiler.start()
+
+    def stop(self) -> None:
+        if self.duration is not None:
+            return
+        try:
+            if self.mode == "cprofile":
+                self._profiler.disable()
+            else:
+                self._profiler.stop()
+        finally:
+            self.duration = time.perf_counter() - self.started
+            _active.release()
+
+    def save(self, directory: Optional[Path] = None) -> Path:
+        """ Write the stopped profile (blocking file I/O), drop the oldest beyond PROFILE_KEEP - returns the path """
+        directory = directory or PROFILE_DIR
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"{self.profile_id}{PROFILE_MODES[self.mode]}"
+        if self.mode == "cprofile":
+            self._profiler.dump_stats(str(path))
+        else:
+            with open(path, "w", encoding="utf-8") as profile_file:
+                json.dump(self._profiler.speedscope(self.label), profile_file)
+        _prune(directory, PROFILE_KEEP)
+        return path
+
+
+def start_profile(mode: str, label: str) -> Optional[ProfileSession]:
+    """ Start profiling the calling thread - None if a profile is already running in this process """
+    if mode not in PROFILE_MODES:
+        raise ValueError(f"Unknown profile mode '{mode}' (one of: {', '.join(PROFILE_MODES)})")
+    if not _active.acquire(blocking=False):
+        return None
+    try:
+        return ProfileSession(mode, label)
+    except Exception:
+        _active.release()
+        raise
+
+
+def _stored(directory: Path) -> List[Tuple[str, str, Path]]:
+    """ (profile id, mode, path) of the stored profiles """
+    return [(path.name[:-len(suffix)], mode, path)
+            for mode, suffix in PROFILE_MODES.items() for path in directory.glob(f"*{suffix}")]
+
+
+def _prune(directory: Path, keep: int) -> None:
+    stored = sorted(_stored(directory), key=lambda entry: entry[2].stat().st_mtime, reverse=True)
+    for _, _, path in stored[keep:]:
+        path.unlink(missing_ok=True)
+
+
+def profile_path(profile_id: str, directory: Optional[Path] = None) -> Optional[Path]:
+    """ File of a stored profile - None for unknown or malformed ids (never a path outside the directory) """
+    if not _PROFILE_ID.match(profile_id):
+        return None
+    directory = directory or PROFILE_DIR
+    for suffix in PROFILE_MODES.values():
+        path = directory / f"{profile_id}{suffix}"
+        if path.is_file():
+            return path
+    return None
+
+
+def list_profiles(directory: Optional[Path] = None) -> List[Dict[str, Any]]:
+    """ Stored profiles, newest first """
+    profiles = []
+    for profile_id, mode, path in _stored(directory or PROFILE_DIR):
+        stat = path.stat()
+        profiles.append({"id": profile_id, "mode": mode, "size": stat.st_size,
+                         "created": datetime.fromtimestamp(stat.st_mtime, timezone.utc)})
+    return sorted(profiles, key=lambda profile: profile["created"], reverse=True)
@@ -0,0 +1,139 @@
+# ~/reddit_sentiment_tracker/src/utils/timeseries.py
+
+from datetime import datetime, timedelta
+from itertools import groupby
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+# supported date_trunc units - seconds per bucket for the bucket count limit
+BUCKET_SECONDS = {
+    "hour": 3600,
+    "day": 86400,
+}
+
+
+def truncate(value: datetime, bucket: str) -> datetime:
+    """ Start of the hour/day bucket of value - Python date_trunc """
+    value = value.replace(minute=0, second=0, microsecond=0)
+    return value.replace(hour=0) if bucket == "day" else value
+
+
+def bucket_bounds(start: datetime, end: datetime, bucket: str) -> Tuple[datetime, datetime]:
+    """ First and last bucket of [start, end) - the bucket containing start, the last one starting before end """
+    return truncate(start, bucket), truncate(end - timedelta(microseconds=1), bucket)
+
+
+class InvalidTimeRangeError(ValueError):
+    """ Raised when a requested time range is empty or would produce too many buckets """
+
+
+def to_naive_local(value: datetime) -> datetime:
+    """ Timestamps are stored naive in server local time (datetime.now()) - convert aware input the same way """
+    if value.tzinfo is None:
+        return value
+    return value.astimezone().replace(tzinfo=None)
+
+
+def resolve_time_range(start: Optional[datetime], end: Optional[datetime], bucket: str, default_days: int,
+                       max_buckets: int, now: Optional[datetime] = None) -> Tuple[datetime, datetime]:
+    """
+    Fill in defaults (end = now, start = end - default_days) and validate the range
+    Raises InvalidTimeRangeError if start >= end or the range spans more than max_buckets buckets
+    """
+    if bucket not in BUCKET_SECONDS:
+        raise InvalidTimeRangeError(f"Unknown bucket '{bucket}'")
+
+    end = to_naive_local(end) if end is not None else (now or datetime.now())
+    start = to_naive_local(start) if start is not None else end - timedelta(days=default_days)
+
+    if start >= end:
+        raise InvalidTimeRangeError("'from' must be before 'to'")
+
+    buckets = (end - start).total_seconds() / BUCKET_SECONDS[bucket]
+    if buckets > max_buckets:
+        raise InvalidTimeRangeError(f"Range spans {int(buckets)} {bucket} buckets, at most {max_buckets} allowed")
+
+    return start, end
+
+
+def rows_to_columns(rows: Sequence[Any], fields: Sequence[str], precision: int = 4) -> Dict[str, List[Any]]:
+    """ Column oriented result: one array per field instead of one object per row (floats rounded) """
+    columns: Dict[str, List[Any]] = {field: [] for field in fields}
+
+    for row in rows:
+        for field in fields:
+            value = getattr(row, field)
+            columns[field].append(round(float(value), precision) if isinstance(value, float) else value)
+
+    return columns
+
+
+class TimeseriesBucket(NamedTuple):
+    """ One aggregated bucket - the columns of the database aggregation in crud.py """
+    bucket: datetime
+    count: int              # type: ignore[assignment]  # response column name - shadows tuple.count()
+    mean: float
+    weighted_mean: float
+    p25: float
+    median: float
+    p75: float
+
+
+def percentile_cont(ordered: Sequence[float], fraction: float) -> float:
+    """ Continuous percentile of sorted values, interpolated like Postgres percentile_cont """
+    position = fraction * (len(ordered) - 1)
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def carry_forward(snapshots: Iterable[Tuple[Any, datetime, Optional[float], float, datetime]], bucket: str,
+                  start: datetime, end: datetime) -> List[Tuple[datetime, float, float]]:
+    """
+    (key, measured_at, compound, weight, last_seen_at) snapshots ordered by key and measured_at -> (bucket, compound, weight)
+    samples of [start, end) ordered by bucket. History only stores changed snapshots: each one stands for every bucket until
+    the next snapshot of the same post/comment (the newest until last_seen_at) - one sample per post/comment and bucket
+    """
+    step = timedelta(seconds=BUCKET_SECONDS[bucket])
+    first_bucket, last_bucket = bucket_bounds(start, end, bucket)
+    samples = []
+
+    for _, group in groupby(snapshots, key=lambda snapshot: snapshot[0]):
+        history = list(group)
+        for position, (_, measured_at, compound, weight, last_seen_at) in enumerate(history):
+            if position + 1 < len(history):
+                until = truncate(history[position + 1][1], bucket) - step      # the next snapshot takes over its bucket
+            else:
+                until = truncate(last_seen_at, bucket)
+
+            current = max(truncate(measured_at, bucket), first_bucket)
+            until = min(until, last_bucket)
+            while compound is not None and current <= until:
+                samples.append((current, compound, weight))
+                current += step
+
+    samples.sort(key=lambda sample: sample[0])
+    return samples
+
+
+def aggregate_buckets(samples: Iterable[Tuple[datetime, float, float]]) -> List[TimeseriesBucket]:
+    """ Aggregate (bucket, compound, weight) samples ordered by bucket - for backends without percentile_cont (SQLite) """
+    buckets = []
+
+    for bucket, group in groupby(samples, key=lambda sample: sample[0]):
+        values, weights = [], []
+        for _, value, weight in group:
+            values.append(value)
+            weights.append(weight)
+
+        ordered = sorted(values)
+        buckets.append(TimeseriesBucket(
+            bucket=bucket,
+            count=len(values),
+            mean=sum(values) / len(values),
+            weighted_mean=sum(v * w for v, w in zip(values, weights)) / sum(weights),
+            p25=percentile_cont(ordered, 0.25),
+            median=percentile_cont(ordered, 0.5),
+            p75=percentile_cont(ordered, 0.75),
+        ))
+
+    return buckets
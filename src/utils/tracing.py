@@ -0,0 +1,210 @@
+# ~/reddit_sentiment_tracker/src/utils/tracing.py
+
+import os
+import json
+import time
+import queue
+import logging
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from . import metrics
+
+logger = logging.getLogger("reddit_sentiment_tracker")
+
+# Per request trace: the tracing middleware (src/api/request_tracing.py) opens one per HTTP request in a
+# context variable, code on the request path records named spans into it (auth, rate_limit, cache, db,
+# row_mapping, endpoint, serialize). Outside of a request (collection pipeline, scripts) there is no trace
+# and span() does nothing but one context variable lookup.
+
+MAX_SPANS = 256             # individual spans kept per trace for the export - totals always cover all of them
+
+
+class RequestTrace:
+    """ Spans of one request - per name totals for Server-Timing, individual spans for the export """
+    __slots__ = ("trace_id", "start", "start_unix_ns", "totals", "spans", "dropped_spans", "endpoint_end")
+
+    def __init__(self) -> None:
+        self.trace_id = os.urandom(16).hex()
+        self.start = time.perf_counter()
+        self.start_unix_ns = time.time_ns()
+        self.totals: Dict[str, List[float]] = {}              # name -> [first start, seconds, count]
+        self.spans: List[Tuple[str, float, float]] = []       # (name, start, end) in perf_counter seconds
+        self.dropped_spans = 0
+        self.endpoint_end: Optional[float] = None             # set by TracedRoute, start of the serialization
+
+    def add(self, name: str, start: float, end: float) -> None:
+        total = self.totals.get(name)
+        if total is None:
+            self.totals[name] = [start, end - start, 1]
+        else:
+            total[0] = min(total[0], start)
+            total[1] += end - start
+            total[2] += 1
+
+        if len(self.spans) < MAX_SPANS:
+            self.spans.append((name, start, end))
+        else:
+            self.dropped_spans += 1
+
+    def elapsed_ms(self, now: Optional[float] = None) -> float:
+        return ((now if now is not None else time.perf_counter()) - self.start) * 1000
+
+    def server_timing(self, now: Optional[float] = None) -> str:
+        """ Server-Timing header value: one metric per span name in order of first start, then total """
+        entries = []
+        for name, (_, seconds, count) in sorted(self.totals.items(), key=lambda item: item[1][0]):
+            entry = f"{name};dur={seconds * 1000:.1f}"
+            if count > 1:
+                entry += f';desc="{count:.0f}x"'
+            entries.append(entry)
+        entries.append(f"total;dur={self.elapsed_ms(now):.1f}")
+        return ", ".join(entries)
+
+    def breakdown(self) -> str:
+        """ Span totals for the log: auth=0.3ms db=12.1ms(3x) ... """
+        parts = []
+        for name, (_, seconds, count) in sorted(self.totals.items(), key=lambda item: item[1][0]):
+            parts.append(f"{name}={seconds * 1000:.1f}ms" + (f"({count:.0f}x)" if count > 1 else ""))
+        return " ".join(parts) or "no spans"
+
+
+_current_trace: ContextVar[Optional[RequestTrace]] = ContextVar("request_trace", default=None)
+
+
+def begin_trace() -> Tuple[RequestTrace, Token]:
+    """ Open a trace for the current request (the token resets it in end_trace) """
+    trace = RequestTrace()
+    return trace, _current_trace.set(trace)
+
+
+def end_trace(token: Token) -> None:
+    _current_trace.reset(token)
+
+
+def current_trace() -> Optional[RequestTrace]:
+    return _current_trace.get()
+
+
+def record_span(name: str, start: float, end: Optional[float] = None) -> None:
+    """ Record a span measured by the caller (perf_counter seconds) - no-op outside of a request """
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.add(name, start, end if end is not None else time.perf_counter())
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """ Time the block as span name of the current request """
+    trace = _current_trace.get()
+    if trace is None:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.add(name, start, time.perf_counter())
+
+
+# OpenTelemetry export - OTLP/JSON (the body of POST /v1/traces), one payload per line, so a collector's
+# file receiver or any OTLP tool can pick the traces up. Span kinds: 1 internal, 2 server, 3 client.
+
+SPAN_KINDS = {"db": 3, "cache": 3}
+
+
+def _otlp_attributes(attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    converted = []
+    for key, value in attributes.items():
+        if isinstance(value, bool):
+            converted.append({"key": key, "value": {"boolValue": value}})
+        elif isinstance(value, int):
+            converted.append({"key": key, "value": {"intValue": str(value)}})       # int64 as string in OTLP/JSON
+        else:
+            converted.append({"key": key, "value": {"stringValue": str(value)}})
+    return converted
+
+
+def to_otlp(trace: RequestTrace, root_name: str, end: float, attributes: Dict[str, Any],
+            error: bool = False) -> Dict[str, Any]:
+    """ The trace as OTLP/JSON: a server span for the request with one child span per recorded span """
+    def unix_nano(perf: float) -> str:
+        return str(trace.start_unix_ns + int((perf - trace.start) * 1_000_000_000))
+
+    root_id = os.urandom(8).hex()
+    if trace.dropped_spans:
+        attributes = {**attributes, "tracing.dropped_spans": trace.dropped_spans}
+
+    spans = [{
+        "traceId": trace.trace_id,
+        "spanId": root_id,
+        "name": root_name,
+        "kind": 2,
+        "startTimeUnixNano": unix_nano(trace.start),
+        "endTimeUnixNano": unix_nano(end),
+        "attributes": _otlp_attributes(attributes),
+        "status": {"code": 2 if error else 1},
+    }]
+    for name, start, span_end in trace.spans:
+        spans.append({
+            "traceId": trace.trace_id,
+            "spanId": os.urandom(8).hex(),
+            "parentSpanId": root_id,
+            "name": name,
+            "kind": SPAN_KINDS.get(name, 1),
+            "startTimeUnixNano": unix_nano(start),
+            "endTimeUnixNano": unix_nano(span_end),
+        })
+
+    return {"resourceSpans": [{
+        "resource": {"attributes": _otlp_attributes({"service.name": "reddit_sentiment_tracker",
+                                                     "process.pid": os.getpid()})},
+        "scopeSpans": [{"scope": {"name": "reddit_sentiment_tracker.tracing"}, "spans": spans}],
+    }]}
+
+
+class TraceExporter:
+    """ Appends OTLP/JSON payloads to a file from a background thread - the request path only enqueues """
+    def __init__(self, path: str, max_pending: int = 1000) -> None:
+        self.path = path
+        self._queue: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue(maxsize=max_pending)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def submit(self, payload: Dict[str, Any]) -> None:
+        """ Queue a payload for writing - dropped (and counted) if the writer is behind """
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:                    # started on first use: per worker after fork
+                    self._thread = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+                    self._thread.start()
+        try:
+            self._queue.put_nowait(payload)
+        except queue.Full:
+            metrics.increment("tracing.export_dropped")
+
+    def _run(self) -> None:
+        # one write() per payload on an O_APPEND descriptor: lines of several workers don't interleave
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            while True:
+                payload = self._queue.get()
+                if payload is None:
+                    return
+                try:
+                    os.write(fd, json.dumps(payload, separators=(",", ":")).encode("utf-8") + b"\n")
+                except (OSError, TypeError, ValueError) as e:
+                    metrics.increment("tracing.export_errors")
+                    logger.warning(f"Failed to export trace to {self.path}: {e}")
+        finally:
+            os.close(fd)
+
+    def close(self, timeout: float = 5.0) -> None:
+        """ Write what is queued and stop the writer thread """
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join(timeout)
+        self._thread = None
@@ -0,0 +1,17 @@
+# ~/reddit_sentiment_tracker/tests/conftest.py
+
+import logging
+import pytest
+
+
+@pytest.fixture(scope="session")
+def server():
+    """ server.py without its logging setup - the app logger keeps propagating to pytest's log capture """
+    logger = logging.getLogger("reddit_sentiment_tracker")
+    placeholder = logging.NullHandler()
+    logger.addHandler(placeholder)          # setup_logger() leaves loggers that already have handlers alone
+    try:
+        import server
+    finally:
+        logger.removeHandler(placeholder)
+    return server
@@ -0,0 +1,72 @@
+# ~/reddit_sentiment_tracker/tests/test_auth_service.py
+
+import jwt
+import time
+import pytest
+from datetime import timedelta
+from src.api import auth_service
+
+
+@pytest.fixture(autouse=True)
+def jwt_config(monkeypatch):
+    """ Fixed JWT settings and an empty token cache for every test """
+    monkeypatch.setattr(auth_service, "jwt_settings", lambda: ("test-secret", "HS256"))
+    auth_service.clear_token_cache()
+    yield
+    auth_service.clear_token_cache()
+
+
+@pytest.fixture
+def count_decodes(monkeypatch):
+    calls = []
+    decode = jwt.decode
+
+    def counting_decode(*args, **kwargs):
+        calls.append(1)
+        return decode(*args, **kwargs)
+
+    monkeypatch.setattr(auth_service.jwt, "decode", counting_decode)
+    return calls
+
+
+def test_verified_token_is_cached(count_decodes):
+    """ Test if a token is decoded only on its first verification """
+    token = auth_service.create_access_token({"sub": "alice", "user_id": 1})
+
+    first = auth_service.verify_token(token)
+    second = auth_service.verify_token(token)
+
+    assert first["user_id"] == second["user_id"] == 1
+    assert len(count_decodes) == 1
+
+def test_cached_token_expires(monkeypatch, count_decodes):
+    """ Test if a cached token is rejected once its exp has passed """
+    token = auth_service.create_access_token({"user_id": 1}, expires_delta=timedelta(seconds=60))
+    assert auth_service.verify_token(token) is not None
+
+    now = time.time()
+    monkeypatch.setattr(auth_service.time, "time", lambda: now + 61)
+
+    assert auth_service.verify_token(token) is None
+    assert token not in auth_service._verified_tokens
+
+def test_invalid_token_is_not_cached(count_decodes):
+    """ Test if tokens with a wrong signature are rejected every time and never stored """
+    forged = jwt.encode({"user_id": 1, "exp": time.time() + 60}, "other-secret", algorithm="HS256")
+
+    assert auth_service.verify_token(forged) is None
+    assert auth_service.verify_token(forged) is None
+    assert len(count_decodes) == 2
+    assert not auth_service._verified_tokens
+
+def test_cache_is_bounded_lru(monkeypatch):
+    """ Test if the least recently used token is evicted when the cache is full """
+    monkeypatch.setattr(auth_service, "TOKEN_CACHE_SIZE", 2)
+    tokens = [auth_service.create_access_token({"user_id": i}) for i in range(3)]
+
+    auth_service.verify_token(tokens[0])
+    auth_service.verify_token(tokens[1])
+    auth_service.verify_token(tokens[0])        # tokens[1] is now least recently used
+    auth_service.verify_token(tokens[2])
+
+    assert list(auth_service._verified_tokens) == [tokens[0], tokens[2]]
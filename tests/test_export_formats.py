@@ -0,0 +1,75 @@
+# ~/reddit_sentiment_tracker/tests/test_export_formats.py
+
+import csv
+import io
+import json
+import asyncio
+import pytest
+from datetime import datetime
+from src.utils.export_formats import ndjson_chunk, CsvChunkEncoder, encode_export
+
+COLUMNS = ["id", "created_utc", "score", "title_sentiment", "flair"]
+ROWS = [
+    {"id": "p1", "created_utc": datetime(2025, 1, 2, 3, 4, 5), "score": 10, "title_sentiment": {"compound": 0.5}, "flair": None},
+    {"id": "p2", "created_utc": datetime(2025, 1, 3), "score": -1, "title_sentiment": {"compound": -0.2}, "flair": 'say "hi", ok'},
+]
+
+
+async def batches(rows, size):
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+async def collect(chunks):
+    return b"".join([chunk async for chunk in chunks])
+
+
+def test_ndjson_one_object_per_line():
+    """ Test if each row becomes one JSON line with ISO datetimes and nested sentiment """
+    lines = ndjson_chunk(ROWS).decode("utf-8").splitlines()
+
+    assert len(lines) == 2
+    first = json.loads(lines[0])
+    assert first["created_utc"] == "2025-01-02T03:04:05"
+    assert first["title_sentiment"] == {"compound": 0.5}
+    assert first["flair"] is None
+
+def test_csv_round_trip():
+    """ Test if CSV output parses back with header, escaping, JSON cells and empty NULLs """
+    encoder = CsvChunkEncoder(COLUMNS)
+    text = (encoder.header() + encoder.rows(ROWS)).decode("utf-8")
+
+    parsed = list(csv.DictReader(io.StringIO(text)))
+
+    assert list(parsed[0]) == COLUMNS
+    assert parsed[0]["flair"] == ""
+    assert json.loads(parsed[0]["title_sentiment"]) == {"compound": 0.5}
+    assert parsed[1]["flair"] == 'say "hi", ok'
+
+def test_csv_chunks_do_not_repeat_earlier_rows():
+    """ Test if the reused buffer is emptied between chunks """
+    encoder = CsvChunkEncoder(COLUMNS)
+    encoder.header()
+
+    first = encoder.rows(ROWS[:1]).decode("utf-8")
+    second = encoder.rows(ROWS[1:]).decode("utf-8")
+
+    assert first.startswith("p1,") and "p2" not in first
+    assert second.startswith("p2,") and "p1" not in second
+
+def test_encode_export_streams_one_chunk_per_batch():
+    """ Test if batches are encoded lazily into one chunk each (plus the CSV header) """
+    async def run(export_format):
+        return [chunk async for chunk in encode_export(batches(ROWS, 1), COLUMNS, export_format)]
+
+    assert len(asyncio.run(run("ndjson"))) == 2
+    assert len(asyncio.run(run("csv"))) == 3
+
+def test_empty_csv_export_has_header():
+    """ Test if an empty export still yields a parseable CSV """
+    body = asyncio.run(collect(encode_export(batches([], 10), COLUMNS, "csv")))
+    assert body.decode("utf-8") == ",".join(COLUMNS) + "\n"
+
+def test_unknown_format():
+    with pytest.raises(ValueError):
+        asyncio.run(collect(encode_export(batches(ROWS, 10), COLUMNS, "xml")))
@@ -0,0 +1,67 @@
+# ~/reddit_sentiment_tracker/tests/test_fast_json.py
+
+import pytest
+from datetime import datetime
+from typing import List
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from src.api import fast_json
+from src.api.models import PostsResponse, CommentsResponse
+
+POST = {
+    "id": "p1",
+    "title": "Schönbrunn im Schnee ❄",
+    "author": "wiener",
+    "created_utc": datetime(2025, 1, 2, 3, 4, 5, 678901),
+    "title_sentiment": {"neg": 0.0, "neu": 0.588, "pos": 0.412, "compound": 0.4404},
+    "body_sentiment": {"neg": 0.0, "neu": 1.0, "pos": 0.0, "compound": 0.0},
+    "score": 1234,
+    "upvote_ratio": 0.97,
+    "controversiality": 0.0,
+    "num_comments": 56,
+    "measured_at": datetime(2025, 1, 3),
+}
+
+COMMENT = {
+    "id": "c1",
+    "author": "grazer",
+    "text": "\"quoted\"\nnew line",
+    "score": -3,
+    "created_utc": datetime(2025, 1, 2, 3, 4, 5),
+    "comment_sentiment": {"neg": 0.2, "neu": 0.8, "pos": 0.0, "compound": -0.296},
+    "measured_at": datetime(2025, 1, 3, 0, 0, 0, 1),
+}
+
+
+def default_body(model, rows):
+    """ What FastAPI renders for response_model=List[model]: validate, dump in json mode, JSONResponse """
+    adapter = TypeAdapter(List[model])
+    return JSONResponse(adapter.dump_python(adapter.validate_python(rows), mode="json")).body
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+@pytest.mark.parametrize("model, row", [(PostsResponse, POST), (CommentsResponse, COMMENT)])
+def test_fast_path_matches_default_serialization(monkeypatch, use_orjson, model, row):
+    """ Test if the fast response body is byte for byte the body of the validated default path """
+    if use_orjson:
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(fast_json, "orjson", None)
+
+    rows = [row, {**row, "id": "x2"}]
+    assert fast_json.fast_json_response(rows, Response()).body == default_body(model, rows)
+
+
+def test_fast_response_keeps_endpoint_headers():
+    """ Test if headers set on the injected response (ETag, cursor) are carried over """
+    response = Response()
+    del response.headers["content-length"]          # as FastAPI prepares the injected response
+    response.headers["ETag"] = 'W/"posts-1-abc"'
+    response.headers["X-Next-Cursor"] = "cursor"
+
+    fast = fast_json.fast_json_response([], response)
+
+    assert fast.headers["etag"] == 'W/"posts-1-abc"'
+    assert fast.headers["x-next-cursor"] == "cursor"
+    assert fast.headers["content-length"] == "2"
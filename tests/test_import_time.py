@@ -0,0 +1,39 @@
+# ~/reddit_sentiment_tracker/tests/test_import_time.py
+
+import os
+import sys
+import subprocess
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# loaded on first use (collection, first analysis, registration, first query) - never by importing the app
+LAZY_MODULES = ("asyncpraw", "aiohttp", "vaderSentiment", "zxcvbn", "asyncpg")
+
+# cumulative import time of server.py in seconds (about 0.9s on a dev machine, FastAPI itself is half of it)
+IMPORT_TIME_BUDGET = float(os.getenv("IMPORT_TIME_BUDGET", "2.0"))
+
+
+def import_server():
+    """ python -X importtime -c "import server" without any DB / JWT / Redis configuration """
+    env = {key: value for key, value in os.environ.items()
+           if key not in ("HOST_DB", "NAME_DB", "USER_DB", "PASSWORD_DB", "PORT_DB", "JWT_KEY", "JWT_ALGORITHM", "REDIS_URL")}
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import server"],
+                            cwd=PROJECT_ROOT, env=env, capture_output=True, text=True)
+
+    modules = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line.split("|")
+            if cumulative.strip().isdigit():
+                modules[name.strip()] = int(cumulative) / 1_000_000
+    return result, modules
+
+
+def test_server_import_is_lazy_and_within_budget():
+    """ Test if the app imports without configuration, skips heavy modules and stays within the time budget """
+    result, modules = import_server()
+
+    assert result.returncode == 0, result.stderr[-2000:]
+    assert not [name for name in modules if name.split(".")[0] in LAZY_MODULES]
+    assert modules["server"] < IMPORT_TIME_BUDGET, f"import server took {modules['server']:.2f}s"
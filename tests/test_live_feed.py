@@ -0,0 +1,218 @@
+# ~/reddit_sentiment_tracker/tests/test_live_feed.py
+
+import json
+import asyncio
+import pytest
+from datetime import datetime
+from fastapi import HTTPException
+from src.api import live_feed
+from src.api.live_feed import LiveBroker, RollingSentiment, LiveFeedFullError
+
+
+def comment(comment_id, compound):
+    """ Snapshot row as returned by insert_comment_sentiment """
+    return live_feed.comment_event({
+        "comment_id": comment_id,
+        "post_id": "p1",
+        "comment_sentiment": {"compound": compound},
+        "score": 1,
+        "compound": compound,
+        "created_utc": datetime(2025, 1, 1),
+        "measured_at": datetime(2025, 1, 2),
+    })
+
+
+def parse(frame):
+    event, data = frame.strip().split("\n")
+    return event.removeprefix("event: "), json.loads(data.removeprefix("data: "))
+
+
+@pytest.fixture
+def broker(monkeypatch):
+    broker = LiveBroker(queue_size=3, max_subscribers=2, rolling_window=2)
+    monkeypatch.setattr(live_feed, "live_broker", broker)
+    return broker
+
+
+def test_rolling_window_evicts_oldest():
+    """ Test if the aggregates only cover the latest window_size values """
+    rolling = RollingSentiment(2)
+    for compound in (0.8, -0.6, 0.0):
+        rolling.add(compound)
+
+    summary = rolling.summary()
+    assert summary["count"] == 2
+    assert summary["mean_compound"] == -0.3
+    assert summary["positive_share"] == 0.0
+    assert summary["negative_share"] == 0.5
+
+
+def test_dispatch_reaches_subscribers_of_the_subreddit(broker):
+    """ Test if events go to the subscribers of their subreddit only, with the rolling aggregates attached """
+    async def run():
+        wien, graz = broker.subscribe("wien"), broker.subscribe("graz")
+        reached = broker.dispatch("wien", [comment("c1", 0.5)])
+        return reached, wien.queue.get_nowait(), graz.queue.empty()
+
+    reached, frame, graz_empty = asyncio.run(run())
+    event, data = parse(frame)
+
+    assert reached == 1 and graz_empty
+    assert event == "comment"
+    assert data["id"] == "c1" and data["created_utc"] == "2025-01-01T00:00:00"
+    assert data["rolling"]["comments"]["count"] == 1
+    assert data["rolling"]["posts"]["count"] == 0
+
+
+def test_slow_subscriber_is_dropped(broker):
+    """ Test if a subscriber with a full queue is dropped without affecting the others """
+    async def run():
+        slow, fast = broker.subscribe("wien"), broker.subscribe("wien")
+        broker.dispatch("wien", [comment("c1", 0.1), comment("c2", 0.2)])
+        while not fast.queue.empty():
+            fast.queue.get_nowait()
+        broker.dispatch("wien", [comment("c3", 0.3), comment("c4", 0.4)])
+        return slow, fast
+
+    slow, fast = asyncio.run(run())
+
+    assert slow.dropped and not fast.dropped
+    assert fast.queue.qsize() == 2
+    assert broker.subscriber_count == 1
+
+
+def test_subscriber_limit(broker):
+    """ Test if subscribing beyond max_subscribers is refused """
+    broker.subscribe("wien")
+    broker.subscribe("graz")
+
+    with pytest.raises(LiveFeedFullError):
+        broker.subscribe("wien")
+
+
+def test_event_stream_ends_when_dropped(broker):
+    """ Test if a stream sends ready, then its events, and ends with a dropped event after overflowing """
+    async def run():
+        stream = live_feed.event_stream("wien", broker.subscribe("wien"))
+        frames = [await stream.__anext__()]                 # ready
+
+        broker.dispatch("wien", [comment("c1", 0.1)])
+        frames.append(await stream.__anext__())
+
+        broker.dispatch("wien", [comment(f"c{i}", 0.1) for i in range(2, 6)])
+        frames.extend([frame async for frame in stream])
+        return frames
+
+    events = [parse(frame)[0] for frame in asyncio.run(run())]
+
+    assert events == ["ready", "comment", "dropped"]
+    assert broker.subscriber_count == 0
+
+
+def test_stream_endpoint_subscribes_before_responding(server, monkeypatch, broker):
+    """ Test if the endpoint holds the slot before the response starts and answers a full feed with 503 """
+    monkeypatch.setattr(server, "live_broker", broker)
+
+    async def run():
+        response = await server.stream_subreddit("wien", user_id="u1")
+        subscribed = broker.subscriber_count
+        await server.stream_subreddit("graz", user_id="u2")
+
+        with pytest.raises(HTTPException) as full:
+            await server.stream_subreddit("linz", user_id="u3")
+
+        ready = await response.body_iterator.__anext__()
+        await response.body_iterator.aclose()                # disconnect: the stream unsubscribes
+        return subscribed, full.value.status_code, ready
+
+    subscribed, status, ready = asyncio.run(run())
+
+    assert subscribed == 1 and status == 503
+    assert parse(ready)[0] == "ready"
+    assert "wien" not in broker.subscribers
+
+
+def test_rolling_aggregates_only_while_subscribed(broker):
+    """ Test if a subreddit's aggregates are dropped with its last subscriber and not kept for unwatched ones """
+    async def run():
+        subscriber = broker.subscribe("wien")
+        broker.dispatch("wien", [comment("c1", 0.5)])
+        watched = broker.aggregates("wien")["comments"]["count"]
+        broker.unsubscribe("wien", subscriber)
+        broker.dispatch("graz", [comment("c2", 0.5)])
+        return watched
+
+    assert asyncio.run(run()) == 1
+    assert broker.rolling == {}
+
+
+def test_publish_without_redis_delivers_locally(monkeypatch, broker):
+    """ Test if publishing falls back to the subscribers of this process when Redis is unavailable """
+    def no_redis():
+        raise ValueError("REDIS_URL variable is required")
+    monkeypatch.setattr(live_feed, "get_redis", no_redis)
+
+    async def run():
+        subscriber = broker.subscribe("wien")
+        await live_feed.publish_events("wien", [comment("c1", 0.5)])
+        return subscriber.queue.qsize()
+
+    assert asyncio.run(run()) == 1
+
+
+def test_events_travel_through_redis_pubsub(monkeypatch, broker):
+    """ Test if a published batch reaches the subscribers through the pattern subscription """
+    fakeredis = pytest.importorskip("fakeredis")
+    client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    monkeypatch.setattr(live_feed, "get_redis", lambda: client)
+    monkeypatch.setattr(live_feed, "REDIS_URL", "redis://fake")
+
+    async def run():
+        subscriber = broker.subscribe("wien")
+        live_feed.start_live_feed()
+        try:
+            while not await client.pubsub_numpat():        # wait for the pattern subscription
+                await asyncio.sleep(0.01)
+            await live_feed.publish_events("wien", [comment("c1", 0.5)])
+            return await asyncio.wait_for(subscriber.queue.get(), 2)
+        finally:
+            await live_feed.stop_live_feed()
+
+    event, data = parse(asyncio.run(run()))
+    assert event == "comment" and data["id"] == "c1"
+
+
+def test_listener_survives_unexpected_errors(monkeypatch, broker):
+    """ Test if the listener logs a non-Redis error, resubscribes and keeps delivering """
+    fakeredis = pytest.importorskip("fakeredis")
+    client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    monkeypatch.setattr(live_feed, "get_redis", lambda: client)
+    monkeypatch.setattr(live_feed, "REDIS_URL", "redis://fake")
+    monkeypatch.setattr(live_feed, "LIVE_RECONNECT_DELAY", 0)
+
+    dispatch, calls = broker.dispatch, []
+
+    def failing_once(subreddit_name, events):
+        calls.append(subreddit_name)
+        if len(calls) == 1:
+            raise RuntimeError("unexpected")
+        return dispatch(subreddit_name, events)
+
+    monkeypatch.setattr(broker, "dispatch", failing_once)
+
+    async def run():
+        subscriber = broker.subscribe("wien")
+        live_feed.start_live_feed()
+        try:
+            async def deliver():
+                while subscriber.queue.empty():             # republish until the resubscribed listener gets one
+                    await live_feed.publish_events("wien", [comment("c1", 0.5)])
+                    await asyncio.sleep(0.02)
+                return subscriber.queue.get_nowait()
+
+            return await asyncio.wait_for(deliver(), 2)
+        finally:
+            await live_feed.stop_live_feed()
+
+    event, _ = parse(asyncio.run(run()))
+    assert event == "comment" and len(calls) >= 2
@@ -0,0 +1,100 @@
+# ~/reddit_sentiment_tracker/tests/test_logger.py
+
+import sys
+import json
+import logging
+from src import logger as log_setup
+from src.logger import JsonFormatter, LogSamplingFilter, attach_queue_handler
+
+
+def make_record(level=logging.INFO, msg="post %s processed", args=("p1",), lineno=10, exc_info=None):
+    return logging.LogRecord("reddit_sentiment_tracker", level, "src/crud.py", lineno, msg, args, exc_info)
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+def test_sampling_limits_each_call_site(monkeypatch):
+    """ Test if a call site is limited per window, other sites are not, and the next window reports the suppressed count """
+    now = [100.0]
+    monkeypatch.setattr(log_setup.time, "monotonic", lambda: now[0])
+    sampling = LogSamplingFilter(limit=2, window=1.0)
+
+    passed = [sampling.filter(make_record()) for _ in range(5)]
+    other_site = sampling.filter(make_record(lineno=20))
+
+    now[0] += 1.0
+    next_window = make_record()
+
+    assert passed == [True, True, False, False, False] and other_site
+    assert sampling.filter(next_window)
+    assert next_window.suppressed == 3
+    assert next_window.getMessage() == "post p1 processed [3 similar messages suppressed]"
+
+
+def test_sampling_never_drops_errors():
+    """ Test if ERROR and above always pass """
+    sampling = LogSamplingFilter(limit=1, window=60.0)
+
+    assert all(sampling.filter(make_record(level=logging.ERROR)) for _ in range(5))
+
+
+def test_json_formatter_structured_entry():
+    """ Test if a JSON line carries level, merged message, call site, trace id and traceback """
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        record = make_record(level=logging.ERROR, exc_info=sys.exc_info())
+    record.trace_id = "abc123"
+
+    entry = json.loads(JsonFormatter().format(record))
+
+    assert entry["level"] == "ERROR" and entry["message"] == "post p1 processed"
+    assert entry["line"] == 10 and entry["trace_id"] == "abc123"
+    assert "ValueError: boom" in entry["exception"]
+
+
+def test_queue_handler_delivers_in_listener_thread():
+    """ Test if records reach the handlers through the listener with message and traceback already resolved """
+    logger = logging.getLogger("reddit_sentiment_tracker.test_queue")
+    logger.propagate = False
+    collected = ListHandler()
+    listener = attach_queue_handler(logger, [collected])
+
+    args = ["p1"]
+    logger.warning("post %s skipped", args)
+    args.append("changed later")
+    try:
+        raise RuntimeError("db down")
+    except RuntimeError:
+        logger.exception("insert failed")
+    listener.stop()
+    logger.handlers.clear()
+
+    skipped, failed = collected.records
+    assert skipped.getMessage() == "post ['p1'] skipped"
+    assert failed.exc_info is None and "RuntimeError: db down" in failed.exc_text
+
+
+def test_worker_without_file_logging_keeps_console_only(monkeypatch, tmp_path):
+    """ Test if a restarted listener (worker after fork) drops and closes the file handlers when file logging is off """
+    name = "reddit_sentiment_tracker.test_fork"
+    logger = logging.getLogger(name)
+    logger.propagate = False
+    handlers = log_setup.build_handlers(name, log_dir=tmp_path)
+    monkeypatch.setattr(log_setup, "_listeners", {name: attach_queue_handler(logger, handlers)})
+
+    log_setup._listeners[name].stop()           # the master's thread doesn't exist in a forked worker
+    log_setup.restart_log_listeners(file_logging=False)
+    restarted = log_setup._listeners[name]
+    restarted.stop()
+    logger.handlers.clear()
+
+    assert [type(handler) for handler in restarted.handlers] == [logging.StreamHandler]
+    assert all(handler.stream is None for handler in handlers[1:])          # file handlers closed
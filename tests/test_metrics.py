@@ -0,0 +1,27 @@
+# ~/reddit_sentiment_tracker/tests/test_metrics.py
+
+from src.utils import metrics
+
+def test_counters_and_timings():
+    """ Test if counters add up and timings keep count, total, max and mean """
+    metrics.reset()
+    metrics.increment("requests")
+    metrics.increment("requests", 2)
+    metrics.observe("db_pool_wait.read", 0.5)
+    metrics.observe("db_pool_wait.read", 1.5)
+
+    result = metrics.snapshot()
+
+    assert result["counters"]["requests"] == 3
+    timing = result["timings"]["db_pool_wait.read"]
+    assert timing["count"] == 2
+    assert timing["total_seconds"] == 2.0
+    assert timing["max_seconds"] == 1.5
+    assert timing["mean_seconds"] == 1.0
+
+def test_reset():
+    """ Test if reset clears all metrics """
+    metrics.increment("requests")
+    metrics.reset()
+
+    assert metrics.snapshot() == {"counters": {}, "timings": {}}
@@ -0,0 +1,36 @@
+# ~/reddit_sentiment_tracker/tests/test_pagination.py
+
+import pytest
+from datetime import datetime
+from src.utils.pagination import encode_cursor, decode_cursor, InvalidCursorError
+
+def test_cursor_round_trip_datetime():
+    """ Test if a created_utc cursor decodes back to the same datetime and id """
+    created = datetime(2025, 10, 21, 14, 30, 0)
+    cursor = encode_cursor("created_utc", created, "abc123")
+
+    assert decode_cursor(cursor, "created_utc") == (created, "abc123")
+
+def test_cursor_round_trip_numeric():
+    """ Test if score and compound cursors keep their value types """
+    assert decode_cursor(encode_cursor("score", 42, "p1"), "score") == (42, "p1")
+    assert decode_cursor(encode_cursor("compound", -0.4215, "p2"), "compound") == (-0.4215, "p2")
+
+def test_cursor_is_url_safe():
+    """ Test if the token can be passed as a query parameter without escaping """
+    cursor = encode_cursor("created_utc", datetime(2025, 1, 1), "t3_??//++")
+
+    assert all(char.isalnum() or char in "-_" for char in cursor)
+
+def test_cursor_sort_mismatch():
+    """ Test if a cursor issued for another sort is rejected """
+    cursor = encode_cursor("score", 10, "p1")
+
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor, "created_utc")
+
+@pytest.mark.parametrize("cursor", ["", "not-a-cursor", "W10", "eyJhIjoxfQ"])
+def test_cursor_malformed(cursor):
+    """ Test if garbage tokens raise InvalidCursorError instead of leaking into the query """
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor, "score")
@@ -0,0 +1,95 @@
+# ~/reddit_sentiment_tracker/tests/test_password_executor.py
+
+import time
+import asyncio
+import threading
+import pytest
+from src.api import password_executor
+from src.api.password_executor import run_password_task, PasswordPoolSaturatedError
+
+
+def test_runs_function_in_worker_thread():
+    """ Test if the task runs outside the event loop thread and returns its result """
+    async def run():
+        return await run_password_task(lambda a, b: (a + b, threading.current_thread().name), 2, 3)
+
+    result, thread_name = asyncio.run(run())
+
+    assert result == 5
+    assert thread_name.startswith("password")
+
+def test_exceptions_propagate():
+    """ Test if errors of the task (e.g. weak password) reach the caller """
+    def weak(password):
+        raise ValueError("Weak password")
+
+    with pytest.raises(ValueError, match="Weak password"):
+        asyncio.run(run_password_task(weak, "1234"))
+
+def test_rejects_when_saturated(monkeypatch):
+    """ Test if jobs beyond workers + queue are rejected instead of queued """
+    monkeypatch.setattr(password_executor, "_capacity", 2)
+    release = threading.Event()
+
+    async def run():
+        blocked = [asyncio.ensure_future(run_password_task(release.wait, 5)) for _ in range(2)]
+        await asyncio.sleep(0)
+        try:
+            with pytest.raises(PasswordPoolSaturatedError):
+                await run_password_task(time.sleep, 0)
+        finally:
+            release.set()
+            await asyncio.gather(*blocked)
+
+        return await run_password_task(lambda: "accepted again")
+
+    assert asyncio.run(run()) == "accepted again"
+
+def test_event_loop_stays_responsive():
+    """ Test if the loop keeps running coroutines while a slow task occupies a worker """
+    async def run():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.005)
+
+        ticking = asyncio.ensure_future(ticker())
+        await run_password_task(time.sleep, 0.2)
+        ticking.cancel()
+        return ticks
+
+    assert asyncio.run(run()) >= 10
+
+def test_cancelled_request_keeps_slot_until_job_ends(monkeypatch):
+    """ Test if a cancelled caller doesn't free the slot of a job still running in a worker """
+    monkeypatch.setattr(password_executor, "_capacity", 1)
+    started, release = threading.Event(), threading.Event()
+
+    def job():
+        started.set()
+        release.wait(5)
+
+    async def run():
+        caller = asyncio.ensure_future(run_password_task(job))
+        await asyncio.to_thread(started.wait, 5)
+        caller.cancel()
+        await asyncio.sleep(0)
+        try:
+            with pytest.raises(PasswordPoolSaturatedError):
+                await run_password_task(time.sleep, 0)
+        finally:
+            release.set()
+        while password_executor.password_pool_status()["in_flight"]:     # released by the job's done callback
+            await asyncio.sleep(0.001)
+        return await run_password_task(lambda: "accepted again")
+
+    assert asyncio.run(run()) == "accepted again"
+
+def test_usable_after_shutdown():
+    """ Test if a new lifespan after shutdown_password_executor gets a fresh pool """
+    password_executor.shutdown_password_executor()
+
+    assert asyncio.run(run_password_task(lambda: "fresh pool")) == "fresh pool"
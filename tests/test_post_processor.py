@@ -3,6 +3,7 @@
 import pytest
 from unittest.mock import Mock
 from src.data_collection.post_processor import process_post
+from src.data_collection.records import PostRecord, SentimentScores
 
 @pytest.fixture
 def post_data():
@@ -23,40 +24,42 @@ def post_data():
 
     return mock_post
 
-def test_process_post_returns_dict(post_data):
-    """ Test if process_post returns a dictionary """
+def test_process_post_returns_record(post_data):
+    """ Test if process_post returns a slotted post record (no per-instance __dict__) """
     result = process_post(post_data)
 
     assert result is not None
-    assert isinstance(result, dict)
+    assert isinstance(result, PostRecord)
+    assert not hasattr(result, "__dict__")
 
 def test_process_post_correct_fields(post_data):
     """ Test if fields are present and contain the proper values """
     result = process_post(post_data)
 
     if result is not None:
-        assert result["id"] == "33333"
-        assert result["author"] == "Karl"
-        assert result["score"] == 15
-        assert result["flair"] == "Rant"
+        assert result.id == "33333"
+        assert result.author == "Karl"
+        assert result.score == 15
+        assert result.flair == "Rant"
 
 def test_process_post_sentiment_scores(post_data):
     """ Test if sentiment scores are attached in post_data """
     result = process_post(post_data)
 
-    assert "title_sentiment" in result
-    assert "body_sentiment" in result
+    assert result.title_sentiment is not None
+    assert result.body_sentiment is not None
 
-def test_process_post_sentiment_return_dict(post_data):
-    """ Test if sentiment scores are returned in a dictionary """
+def test_process_post_sentiment_return_scores(post_data):
+    """ Test if sentiment scores are returned as score records that serialize to the VADER dict """
     result = process_post(post_data)
 
     if result is not None:
-        title_sentiment_value = result["title_sentiment"]
-        body_sentiment_value = result["body_sentiment"]
+        title_sentiment_value = result.title_sentiment
+        body_sentiment_value = result.body_sentiment
 
-        assert isinstance(title_sentiment_value, dict)
-        assert isinstance(body_sentiment_value, dict)
+        assert isinstance(title_sentiment_value, SentimentScores)
+        assert isinstance(body_sentiment_value, SentimentScores)
+        assert set(title_sentiment_value.as_dict()) == {"neg", "neu", "pos", "compound"}
 
 def test_process_post_controversiality(post_data):
     """ Test if controversiality is calculated properly """
@@ -65,4 +68,4 @@ def test_process_post_controversiality(post_data):
     test_controversiality_result = (1 - 0.44) * 22   # (1 - upvote_ratio) * num_comments
 
     if result is not None:
-        assert result["controversiality"] == test_controversiality_result
+        assert result.controversiality == test_controversiality_result
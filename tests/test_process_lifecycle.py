@@ -0,0 +1,33 @@
+# ~/reddit_sentiment_tracker/tests/test_process_lifecycle.py
+
+import gc
+from src import process_lifecycle
+from src.storage import connection, redis_connection
+
+
+def test_preload_freezes_loaded_objects():
+    """ Test if preloading moves the loaded objects into the permanent GC generation """
+    try:
+        process_lifecycle.preload_shared_state()
+        assert gc.get_freeze_count() > 0
+    finally:
+        gc.unfreeze()
+
+
+def test_reset_after_fork_drops_inherited_pools(monkeypatch):
+    """ Test if a worker builds its own Redis client and disposes the engine pools without closing them """
+    for var in ("HOST_DB", "NAME_DB", "USER_DB", "PASSWORD_DB", "PORT_DB"):
+        monkeypatch.setenv(var, "5432" if var == "PORT_DB" else "test")
+    monkeypatch.setattr(connection, "_write_engine", None)
+    monkeypatch.setattr(connection, "_read_engine", None)
+    monkeypatch.setattr(redis_connection, "_redis_client", object())
+
+    engines = [connection.get_write_engine(), connection.get_read_engine()]     # created in the master
+    disposed = []
+    for engine in engines:
+        monkeypatch.setattr(engine.sync_engine, "dispose", lambda close=True, engine=engine: disposed.append((engine, close)))
+
+    process_lifecycle.reset_after_fork()
+
+    assert redis_connection._redis_client is None
+    assert disposed == [(engines[0], False), (engines[1], False)]
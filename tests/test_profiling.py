@@ -0,0 +1,105 @@
+# ~/reddit_sentiment_tracker/tests/test_profiling.py
+
+import json
+import time
+import pstats
+import asyncio
+from fastapi import FastAPI
+from src.api import request_profiling
+from src.api.request_profiling import ProfilingMiddleware
+from src.utils import profiling
+from src.utils.profiling import SamplingProfiler, profile_path, start_profile
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(ProfilingMiddleware)
+
+    def expensive_ranking() -> int:
+        return sum(i * i for i in range(20000))
+
+    @app.get("/items")
+    async def get_items() -> dict:
+        return {"total": expensive_ranking()}
+
+    return app
+
+
+def call(app: FastAPI, headers: dict):
+    """ In-process GET /items - returns (status, headers) """
+    scope = {"type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "scheme": "http",
+             "path": "/items", "raw_path": b"/items", "root_path": "", "query_string": b"",
+             "server": ("test", 80), "client": ("test", 50000),
+             "headers": [(key.lower().encode(), value.encode()) for key, value in headers.items()]}
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    return messages[0]["status"], {key.decode(): value.decode() for key, value in messages[0]["headers"]}
+
+
+def test_profiled_request_writes_pstats(monkeypatch, tmp_path):
+    """ Test if a request with a valid token is profiled, the stats contain the endpoint's work and the id resolves """
+    monkeypatch.setattr(request_profiling, "PROFILE_ADMIN_TOKEN", "secret")
+    monkeypatch.setattr(profiling, "PROFILE_DIR", tmp_path)
+
+    status, headers = call(build_app(), {"X-Profile": "cprofile", "X-Profile-Token": "secret"})
+
+    assert status == 200
+    path = profile_path(headers["x-profile-id"])
+    assert path is not None and path.suffix == ".pstats"
+    functions = {name for _, _, name in pstats.Stats(str(path)).stats}
+    assert "expensive_ranking" in functions
+
+
+def test_profile_header_needs_admin_token(monkeypatch, tmp_path):
+    """ Test if a wrong token is rejected, and requests without the header are served unprofiled """
+    monkeypatch.setattr(request_profiling, "PROFILE_ADMIN_TOKEN", "secret")
+    monkeypatch.setattr(profiling, "PROFILE_DIR", tmp_path)
+    app = build_app()
+
+    rejected, _ = call(app, {"X-Profile": "cprofile", "X-Profile-Token": "guess"})
+    plain, plain_headers = call(app, {})
+
+    assert rejected == 403
+    assert plain == 200 and "x-profile-id" not in plain_headers
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_sampling_profiler_speedscope():
+    """ Test if the sampler records root-first stacks of the profiled thread in speedscope format """
+    sampler = SamplingProfiler(interval=0.002)
+
+    def busy_loop() -> None:
+        # until the sampler caught this frame a few times - on a loaded runner that takes longer than the interval suggests
+        target = len(sampler.samples) + 5
+        deadline = time.perf_counter() + 10
+        while len(sampler.samples) < target and time.perf_counter() < deadline:
+            pass
+
+    sampler.start()
+    busy_loop()
+    sampler.stop()
+
+    document = json.loads(json.dumps(sampler.speedscope("test")))
+    frames = document["shared"]["frames"]
+    [profile] = document["profiles"]
+    assert profile["type"] == "sampled" and len(profile["samples"]) == len(profile["weights"]) >= 5
+    assert any(frames[stack[-1]]["name"].endswith("busy_loop") for stack in profile["samples"])
+
+
+def test_one_profile_at_a_time_and_ids_stay_in_directory():
+    """ Test if a second profile is refused while one runs, and malformed ids never resolve to a path """
+    first = start_profile("sample", "first")
+    try:
+        assert start_profile("cprofile", "second") is None
+    finally:
+        first.stop()
+
+    assert profile_path("../../etc/passwd") is None
+    assert profile_path("20261019-120000-x-abcdef/../secret") is None
@@ -0,0 +1,200 @@
+# ~/reddit_sentiment_tracker/tests/test_rate_limiting.py
+
+import asyncio
+import pytest
+from fastapi import HTTPException
+from src.api import rate_limiting
+from src.api.rate_limiting import LocalRateLimiter
+from src.config import RATE_LIMIT_Redis, WINDOW_SIZE_Redis
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def fresh_state(monkeypatch):
+    """ Empty local buckets and Redis marked available """
+    monkeypatch.setattr(rate_limiting, "local_limiter", LocalRateLimiter(RATE_LIMIT_Redis, WINDOW_SIZE_Redis))
+    monkeypatch.setattr(rate_limiting, "_redis_retry_at", 0.0)
+    monkeypatch.setattr(rate_limiting, "_gcra_script", None)
+
+
+@pytest.fixture
+def fake_redis(monkeypatch, fresh_state):
+    # the GCRA script runs inside Redis - fakeredis (with lupa for Lua) stands in for a server
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+
+    client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    monkeypatch.setattr(rate_limiting, "get_redis", lambda: client)
+    return client
+
+
+# local token buckets
+
+def test_local_bucket_burst_then_refill():
+    """ Test if the local bucket allows the full burst and refills one request per emission interval """
+    clock = FakeClock()
+    limiter = LocalRateLimiter(10, 60, clock)
+
+    assert all(limiter.consume("user1")[0] for _ in range(10))
+    allowed, retry_after = limiter.consume("user1")
+    assert not allowed
+    assert retry_after == pytest.approx(6.0)
+
+    clock.now += 6.0
+    assert limiter.consume("user1")[0]
+    assert not limiter.consume("user1")[0]
+
+def test_local_pending_tracking():
+    """ Test if admitted requests are counted for reconciliation and can be put back """
+    limiter = LocalRateLimiter(10, 60, FakeClock())
+    for _ in range(3):
+        limiter.consume("user1")
+    limiter.consume("user2", track=False)
+
+    taken = limiter.take_pending()
+    assert taken == {"user1": 3}
+    assert limiter.pending_count("user1") == 0
+
+    limiter.restore_pending(taken)
+    assert limiter.pending_count("user1") == 3
+
+def test_apply_remaining_only_lowers_local_allowance():
+    """ Test if the global allowance from Redis caps the bucket but never refills it """
+    limiter = LocalRateLimiter(10, 60, FakeClock())
+    limiter.consume("user1")
+
+    limiter.apply_remaining("user1", 20)
+    assert limiter.buckets["user1"].tokens == 9
+
+    limiter.apply_remaining("user1", 0)
+    assert not limiter.consume("user1")[0]
+
+def test_purge_idle_buckets():
+    """ Test if refilled buckets without pending requests are dropped """
+    clock = FakeClock()
+    limiter = LocalRateLimiter(10, 60, clock)
+    limiter.consume("user1", track=False)
+    limiter.consume("user2")
+
+    clock.now += 60
+    assert limiter.purge_idle() == 1
+    assert list(limiter.buckets) == ["user2"]
+
+
+# Redis (GCRA)
+
+def test_burst_up_to_limit_then_rejected(fake_redis):
+    """ Test if exactly RATE_LIMIT_Redis requests pass and the next one gets a retry time """
+    async def run():
+        return [await rate_limiting.gcra_consume("user1") for _ in range(RATE_LIMIT_Redis + 1)]
+
+    results = asyncio.run(run())
+
+    assert all(allowed for allowed, _, _ in results[:-1])
+    assert [remaining for _, remaining, _ in results[:-1]] == list(range(RATE_LIMIT_Redis - 1, -1, -1))
+
+    allowed, remaining, retry_after_ms = results[-1]
+    assert not allowed
+    assert remaining == 0
+    assert 0 < retry_after_ms <= rate_limiting.EMISSION_INTERVAL_US // 1000
+
+def test_users_are_limited_independently(fake_redis):
+    """ Test if one user's requests don't use up another user's allowance """
+    async def run():
+        for _ in range(RATE_LIMIT_Redis):
+            await rate_limiting.gcra_consume("user1")
+        return await rate_limiting.gcra_consume("user2")
+
+    assert asyncio.run(run())[0]
+
+def test_rejected_cost_does_not_consume_unless_saturating(fake_redis):
+    """ Test if a rejected charge leaves the state untouched, a saturating one uses up the allowance """
+    async def run():
+        rejected = await rate_limiting.gcra_consume("user1", RATE_LIMIT_Redis + 1)
+        accepted = await rate_limiting.gcra_consume("user1", RATE_LIMIT_Redis)
+        await rate_limiting.gcra_consume("user2", RATE_LIMIT_Redis + 1, saturate=True)
+        after_saturation = await rate_limiting.gcra_consume("user2")
+        return rejected, accepted, after_saturation
+
+    rejected, accepted, after_saturation = asyncio.run(run())
+
+    assert not rejected[0]
+    assert accepted[0]
+    assert not after_saturation[0]
+
+def test_rate_limit_check_raises_429_with_retry_after(fake_redis):
+    """ Test if the dependency rejects with 429 and a Retry-After header once the limit is used up """
+    async def run():
+        for _ in range(RATE_LIMIT_Redis):
+            assert await rate_limiting.rate_limit_check("user1") == "user1"
+        await rate_limiting.rate_limit_check("user1")
+
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(run())
+
+    assert exc_info.value.status_code == 429
+    assert int(exc_info.value.headers["Retry-After"]) >= 1
+
+def test_redis_unavailable_falls_back_to_local_limit(monkeypatch, fresh_state):
+    """ Test if requests are limited locally (not let through) when Redis is down """
+    def no_redis():
+        raise ValueError("REDIS_URL variable is required")
+    monkeypatch.setattr(rate_limiting, "get_redis", no_redis)
+
+    async def run():
+        for _ in range(RATE_LIMIT_Redis):
+            await rate_limiting.rate_limit_check("user1")
+        await rate_limiting.rate_limit_check("user1")
+
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(run())
+
+    assert exc_info.value.status_code == 429
+
+
+# hybrid mode
+
+def test_hybrid_reconciles_once_slack_is_reached(monkeypatch, fake_redis):
+    """ Test if requests are admitted locally up to the slack, then charged to Redis in one batch """
+    monkeypatch.setattr(rate_limiting, "RATE_LIMIT_MODE", "hybrid")
+    monkeypatch.setattr(rate_limiting, "RATE_LIMIT_SLACK", 3)
+
+    async def run():
+        for _ in range(3):
+            await rate_limiting.rate_limit_check("user1")
+        untouched = await fake_redis.get("rate_limit:user1")
+
+        await rate_limiting.rate_limit_check("user1")          # 4th request reconciles the first 3
+        _, remaining, _ = await rate_limiting.gcra_consume("user1", 0)
+        return untouched, remaining
+
+    untouched, remaining = asyncio.run(run())
+
+    assert untouched is None
+    assert remaining == RATE_LIMIT_Redis - 3
+    assert rate_limiting.local_limiter.pending_count("user1") == 1
+
+def test_hybrid_over_admission_bounded_by_slack(monkeypatch, fake_redis):
+    """ Test if a user that used up the allowance elsewhere gets at most the slack from this process """
+    monkeypatch.setattr(rate_limiting, "RATE_LIMIT_MODE", "hybrid")
+    monkeypatch.setattr(rate_limiting, "RATE_LIMIT_SLACK", 2)
+
+    async def run():
+        await rate_limiting.gcra_consume("user1", RATE_LIMIT_Redis)     # another process used everything
+        admitted = 0
+        for _ in range(RATE_LIMIT_Redis):
+            try:
+                await rate_limiting.rate_limit_check("user1")
+                admitted += 1
+            except HTTPException:
+                pass
+        return admitted
+
+    assert asyncio.run(run()) == 2
@@ -0,0 +1,58 @@
+# ~/reddit_sentiment_tracker/tests/test_register.py
+
+import asyncio
+import pytest
+from fastapi import HTTPException
+from src.api.models import RegisterRequest
+from src.storage import connection
+from src.storage.crud import db_session
+from src.storage.schema_manager import users
+
+pytest.importorskip("aiosqlite")
+
+
+@pytest.fixture
+def sqlite_db(monkeypatch, tmp_path):
+    """ Fresh SQLite database file as the storage backend """
+    monkeypatch.setenv("DATABASE_URL", f"sqlite+aiosqlite:///{tmp_path / 'tracker.db'}")
+    monkeypatch.setattr(connection, "_write_engine", None)
+    monkeypatch.setattr(connection, "_read_engine", None)
+
+
+def register(server, request: RegisterRequest) -> HTTPException:
+    """ Call the endpoint against the fresh schema - returns the HTTPException it raised """
+    async def run():
+        try:
+            await connection.initialize_database()
+            with pytest.raises(HTTPException) as error:
+                await server.register(request)
+            return error.value
+        finally:
+            for engine in connection.created_engines():
+                await engine.dispose()
+
+    return asyncio.run(run())
+
+
+def test_concurrent_duplicate_registration_is_400(server, sqlite_db, monkeypatch):
+    """ Test if a username taken between the duplicate check and the insert is rejected with 400, not 500 """
+    async def racing_password_task(func, *args):
+        if func is server.validate_password_strength:       # a concurrent registration commits meanwhile
+            async with db_session() as conn:
+                await conn.execute(users.insert().values(username="karl", email="karl@example.com",
+                                                         hashed_password="hash"))
+            return None
+        return "hash"
+
+    monkeypatch.setattr(server, "run_password_task", racing_password_task)
+
+    error = register(server, RegisterRequest(username="karl", email="karl@example.com", password="x7#Lq!vR2m$Tz"))
+
+    assert error.status_code == 400 and error.detail == "Username or email already exists"
+
+
+def test_weak_password_is_400(server, sqlite_db):
+    """ Test if the strength check's ValueError becomes a 400 with the zxcvbn feedback """
+    error = register(server, RegisterRequest(username="karl", email="karl@example.com", password="password"))
+
+    assert error.status_code == 400 and error.detail.startswith("Weak password")
@@ -0,0 +1,95 @@
+# ~/reddit_sentiment_tracker/tests/test_request_tracing.py
+
+import json
+import asyncio
+import logging
+from fastapi import Depends, FastAPI
+from src.api import request_tracing
+from src.api.request_tracing import TracingMiddleware, TracedRoute
+from src.utils.tracing import span, begin_trace, end_trace, to_otlp, current_trace, TraceExporter
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+    app.router.route_class = TracedRoute
+    app.add_middleware(TracingMiddleware)
+
+    async def user() -> str:
+        with span("auth"):
+            return "u1"
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: int, user_id: str = Depends(user)) -> dict:
+        with span("db"):
+            pass
+        with span("db"):
+            pass
+        return {"id": item_id, "user": user_id}
+
+    return app
+
+
+def call(app: FastAPI, path: str):
+    """ In-process GET - returns (status, headers, body) """
+    scope = {"type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "scheme": "http",
+             "path": path, "raw_path": path.encode(), "root_path": "", "query_string": b"",
+             "server": ("test", 80), "client": ("test", 50000), "headers": []}
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    headers = {key.decode(): value.decode() for key, value in messages[0]["headers"]}
+    return messages[0]["status"], headers, messages[1]["body"]
+
+
+def test_server_timing_header_breaks_down_request():
+    """ Test if the response carries every span of the request, repeated spans summed with their count """
+    status, headers, body = call(build_app(), "/items/7")
+
+    assert status == 200 and json.loads(body) == {"id": 7, "user": "u1"}
+    names = [entry.split(";")[0] for entry in headers["server-timing"].split(", ")]
+    assert names == ["auth", "endpoint", "db", "serialize", "total"]
+    assert 'db;dur=' in headers["server-timing"] and 'desc="2x"' in headers["server-timing"]
+
+
+def test_slow_request_logged_with_breakdown(monkeypatch, caplog):
+    """ Test if requests above the threshold are logged with route template, status and spans """
+    monkeypatch.setattr(request_tracing, "TRACE_SLOW_REQUEST_MS", 0.0)
+
+    with caplog.at_level(logging.WARNING, logger="reddit_sentiment_tracker"):
+        call(build_app(), "/items/7")
+
+    [record] = [r for r in caplog.records if r.getMessage().startswith("Slow request")]
+    assert "GET /items/{item_id} -> 200" in record.getMessage()
+    assert "auth=" in record.getMessage() and "db=" in record.getMessage()
+
+
+def test_span_outside_request_is_noop():
+    """ Test if spans outside of a traced request (collection pipeline, scripts) record nothing """
+    with span("db"):
+        pass
+    assert current_trace() is None
+
+
+def test_export_writes_otlp_json(tmp_path):
+    """ Test if exported traces are OTLP/JSON lines with the spans as children of the request span """
+    trace, token = begin_trace()
+    with span("db"):
+        pass
+    end_trace(token)
+
+    exporter = TraceExporter(str(tmp_path / "traces.jsonl"))
+    exporter.submit(to_otlp(trace, "GET /items/{item_id}", trace.start + 0.01, {"http.response.status_code": 200}))
+    exporter.close()
+
+    [line] = (tmp_path / "traces.jsonl").read_text().splitlines()
+    root, child = json.loads(line)["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    assert root["traceId"] == child["traceId"] == trace.trace_id
+    assert child["parentSpanId"] == root["spanId"] and child["name"] == "db" and child["kind"] == 3
+    assert abs(int(root["endTimeUnixNano"]) - int(root["startTimeUnixNano"]) - 10_000_000) <= 1
+    assert root["attributes"] == [{"key": "http.response.status_code", "value": {"intValue": "200"}}]
@@ -0,0 +1,201 @@
+# ~/reddit_sentiment_tracker/tests/test_response_cache.py
+
+import asyncio
+import pytest
+from datetime import datetime
+from redis.exceptions import ConnectionError as RedisConnectionError
+from src.api import response_cache
+from src.utils import metrics
+
+
+class FakePipeline:
+    """ Queues commands of a transaction and runs them on execute() """
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def set(self, *args, **kwargs):
+        self.commands.append(("set", args, kwargs))
+
+    def incr(self, *args, **kwargs):
+        self.commands.append(("incr", args, kwargs))
+
+    async def execute(self):
+        return [await getattr(self.client, name)(*args, **kwargs) for name, args, kwargs in self.commands]
+
+
+class FakeRedis:
+    """ In-memory stand-in for the few redis.asyncio commands the cache uses """
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def mget(self, keys):
+        return [self.data.get(key) for key in keys]
+
+    async def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.data:
+            return None
+        self.data[key] = str(value)
+        return True
+
+    async def incr(self, key):
+        self.data[key] = str(int(self.data.get(key, 0)) + 1)
+        return int(self.data[key])
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class BrokenRedis:
+    """ Every command fails like an unreachable server """
+    async def get(self, key):
+        raise RedisConnectionError("connection refused")
+
+    def pipeline(self, transaction=True):
+        raise RedisConnectionError("connection refused")
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    client = FakeRedis()
+    monkeypatch.setattr(response_cache, "get_redis", lambda: client)
+    metrics.reset()
+    return client
+
+
+def make_loader(calls):
+    """ Loader counting its calls, returning a payload with a datetime like the crud functions """
+    async def loader():
+        calls.append(1)
+        return {"items": [{"id": "p1", "created_utc": datetime(2025, 1, 1, 12, 0)}], "next_cursor": None}
+    return loader
+
+
+def test_second_request_is_served_from_cache(fake_redis):
+    """ Test if the loader only runs on the first request with the same parameters """
+    calls = []
+    loader = make_loader(calls)
+
+    first = asyncio.run(response_cache.cached_response("posts", "wien", {"limit": 5}, loader))
+    second = asyncio.run(response_cache.cached_response("posts", "wien", {"limit": 5}, loader))
+
+    assert len(calls) == 1
+    assert first["items"][0]["id"] == second["items"][0]["id"] == "p1"
+    assert second["items"][0]["created_utc"] == "2025-01-01T12:00:00"
+    assert response_cache.cache_stats()["hit_rate"] == 0.5
+
+def test_different_params_are_cached_separately(fake_redis):
+    """ Test if query parameters are part of the cache key """
+    calls = []
+    loader = make_loader(calls)
+
+    asyncio.run(response_cache.cached_response("posts", "wien", {"limit": 5}, loader))
+    asyncio.run(response_cache.cached_response("posts", "wien", {"limit": 10}, loader))
+
+    assert len(calls) == 2
+
+def test_invalidation_bypasses_cached_entries(fake_redis):
+    """ Test if bumping the subreddit generation forces a reload """
+    calls = []
+    loader = make_loader(calls)
+
+    asyncio.run(response_cache.cached_response("posts", "wien", {}, loader))
+    asyncio.run(response_cache.invalidate_subreddit("wien"))
+    asyncio.run(response_cache.cached_response("posts", "wien", {}, loader))
+
+    assert len(calls) == 2
+
+def test_invalidation_is_per_subreddit(fake_redis):
+    """ Test if writing data of one subreddit keeps the cache of others """
+    calls = []
+    loader = make_loader(calls)
+
+    asyncio.run(response_cache.cached_response("posts", "wien", {}, loader))
+    asyncio.run(response_cache.invalidate_subreddit("graz"))
+    asyncio.run(response_cache.cached_response("posts", "wien", {}, loader))
+
+    assert len(calls) == 1
+
+def test_not_found_is_not_cached(fake_redis):
+    """ Test if None results are reloaded every time """
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        return None
+
+    asyncio.run(response_cache.cached_response("subreddit_metadata", "wien", {}, loader))
+    asyncio.run(response_cache.cached_response("subreddit_metadata", "wien", {}, loader))
+
+    assert len(calls) == 2
+
+def test_redis_failure_falls_back_to_loader(monkeypatch):
+    """ Test if the endpoint still works (uncached) when Redis is down """
+    monkeypatch.setattr(response_cache, "get_redis", lambda: BrokenRedis())
+    calls = []
+
+    result = asyncio.run(response_cache.cached_response("posts", "wien", {}, make_loader(calls)))
+    asyncio.run(response_cache.invalidate_subreddit("wien"))      # must not raise
+
+    assert len(calls) == 1
+    assert result["items"][0]["id"] == "p1"
+
+def test_etag_changes_with_generation_and_params():
+    """ Test if the ETag identifies data generation and query parameters """
+    etag = response_cache.build_etag("posts", 7, {"limit": 5})
+
+    assert etag == response_cache.build_etag("posts", 7, {"limit": 5})
+    assert etag != response_cache.build_etag("posts", 8, {"limit": 5})
+    assert etag != response_cache.build_etag("posts", 7, {"limit": 10})
+    assert etag != response_cache.build_etag("comments", 7, {"limit": 5})
+
+def test_etag_matches():
+    """ Test If-None-Match parsing: lists, weak/strong prefixes, wildcard, missing header """
+    etag = response_cache.build_etag("posts", 7, {})
+
+    assert response_cache.etag_matches(etag, etag)
+    assert response_cache.etag_matches(etag[2:], etag)                     # strong form of the weak tag
+    assert response_cache.etag_matches(f'"other", {etag}', etag)
+    assert response_cache.etag_matches("*", etag)
+    assert not response_cache.etag_matches('"other"', etag)
+    assert not response_cache.etag_matches(None, etag)
+
+def test_loader_errors_are_not_retried(fake_redis):
+    """ Test if a ValueError of the loader (e.g. invalid cursor) propagates without a second DB call """
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        raise ValueError("Malformed cursor")
+
+    with pytest.raises(ValueError):
+        asyncio.run(response_cache.cached_response("posts", "wien", {}, loader))
+
+    assert len(calls) == 1
+    assert response_cache.cache_stats()["errors"] == 0
+
+def test_multi_response_invalidated_by_any_subreddit(fake_redis):
+    """ Test if a payload spanning several subreddits is reloaded when one of them gets new data """
+    calls = []
+    loader = make_loader(calls)
+
+    asyncio.run(response_cache.cached_multi_response("compare", ["wien", "graz"], {}, loader))
+    asyncio.run(response_cache.cached_multi_response("compare", ["graz", "wien"], {}, loader))     # order does not matter
+    assert len(calls) == 1
+
+    asyncio.run(response_cache.invalidate_subreddit("graz"))
+    asyncio.run(response_cache.cached_multi_response("compare", ["wien", "graz"], {}, loader))
+    assert len(calls) == 2
+
+    asyncio.run(response_cache.invalidate_subreddit("linz"))
+    asyncio.run(response_cache.cached_multi_response("compare", ["wien", "graz"], {}, loader))
+    assert len(calls) == 2
@@ -0,0 +1,50 @@
+# ~/reddit_sentiment_tracker/tests/test_snapshots.py
+
+from src.storage.snapshots import split_changed_snapshots, POST_SNAPSHOT_FIELDS, COMMENT_SNAPSHOT_FIELDS
+
+def post_snapshot(post_id, score=10, compound=0.5):
+    """ Snapshot row as built by insert_post_sentiment """
+    return {
+        "post_id": post_id,
+        "title_sentiment": {"neg": 0.0, "neu": 0.5, "pos": 0.5, "compound": compound},
+        "body_sentiment": {},
+        "score": score,
+        "upvote_ratio": 0.9,
+        "controversiality": 0.5,
+        "num_comments": 5,
+    }
+
+def test_unknown_posts_are_changed():
+    """ Test if posts without a previous snapshot are always written """
+    changed, unchanged = split_changed_snapshots([post_snapshot("a")], {}, "post_id", POST_SNAPSHOT_FIELDS)
+
+    assert [row["post_id"] for row in changed] == ["a"]
+    assert unchanged == []
+
+def test_identical_snapshot_is_deduplicated():
+    """ Test if a snapshot equal to the last known one is skipped """
+    previous = {"a": post_snapshot("a")}
+    changed, unchanged = split_changed_snapshots([post_snapshot("a")], previous, "post_id", POST_SNAPSHOT_FIELDS)
+
+    assert changed == []
+    assert unchanged == ["a"]
+
+def test_any_changed_field_is_written():
+    """ Test if a changed score or sentiment produces a new snapshot """
+    previous = {"a": post_snapshot("a"), "b": post_snapshot("b")}
+    new_rows = [post_snapshot("a", score=11), post_snapshot("b", compound=-0.2)]
+
+    changed, unchanged = split_changed_snapshots(new_rows, previous, "post_id", POST_SNAPSHOT_FIELDS)
+
+    assert [row["post_id"] for row in changed] == ["a", "b"]
+    assert unchanged == []
+
+def test_comment_fields_ignore_other_keys():
+    """ Test if only the snapshot fields are compared (e.g. measured_at differs every run) """
+    previous = {"c1": {"comment_id": "c1", "comment_sentiment": {"compound": 0.1}, "score": 3, "measured_at": 1}}
+    new_row = {"comment_id": "c1", "comment_sentiment": {"compound": 0.1}, "score": 3, "measured_at": 2}
+
+    changed, unchanged = split_changed_snapshots([new_row], previous, "comment_id", COMMENT_SNAPSHOT_FIELDS)
+
+    assert changed == []
+    assert unchanged == ["c1"]
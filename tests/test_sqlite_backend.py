@@ -0,0 +1,148 @@
+# ~/reddit_sentiment_tracker/tests/test_sqlite_backend.py
+
+import asyncio
+import pytest
+from datetime import datetime, timedelta
+from src.storage import connection, crud
+from src.data_collection.records import PostRecord, CommentRecord, SentimentScores
+
+pytest.importorskip("aiosqlite")
+
+NOW = datetime.now().replace(microsecond=0)
+
+
+def sentiment(compound):
+    return SentimentScores(neg=0.0, neu=0.5, pos=0.5, compound=compound)
+
+
+def post(i, title, body, compound, score):
+    return PostRecord(id=f"p{i}", author=f"user{i}", created_utc=NOW - timedelta(hours=i), num_comments=2,
+                      url="https://reddit.com/r/wien", awards=0, edited=False, flair=None, title=title,
+                      title_sentiment=sentiment(compound), selftext=body, body_sentiment=sentiment(0.0), score=score,
+                      upvote_ratio=0.9, controversiality=0.1)
+
+
+POSTS = [post(i, *values) for i, values in enumerate([
+    ("Schnee in Wien", "endlich Winter", 0.6, 300),
+    ("Regen und Schnee", "grauslich", -0.4, 200),
+    ("U-Bahn Ausfall", "schon wieder", -0.2, 100),
+])]
+
+COMMENTS = [
+    CommentRecord(id="c1", parent_id="t3_p0", depth=0, text="super Schnee", author="a", score=5, edited=False,
+                  created_utc=NOW, sentiment=sentiment(0.5)),
+    CommentRecord(id="c2", parent_id="t1_c1", depth=1, text="naja", author="b", score=-1, edited=False,
+                  created_utc=NOW, sentiment=sentiment(-0.1)),
+]
+
+
+@pytest.fixture
+def sqlite_db(monkeypatch, tmp_path):
+    """ Fresh SQLite database file as the storage backend """
+    monkeypatch.setenv("DATABASE_URL", f"sqlite+aiosqlite:///{tmp_path / 'tracker.db'}")
+    monkeypatch.setattr(connection, "_write_engine", None)
+    monkeypatch.setattr(connection, "_read_engine", None)
+
+
+async def with_backend(scenario):
+    """ Create the schema, collect r/wien, run scenario, dispose the engines (bound to this event loop) """
+    try:
+        await connection.initialize_database()
+        await crud.insert_subreddit_metadata({"id": "t5_wien", "name": "wien", "description": "Wien",
+                                              "subscriber_count": 1000, "created_utc": NOW})
+        await crud.insert_top_posts(POSTS, "t5_wien")
+        await crud.insert_rising_posts(POSTS[:1], "t5_wien")                  # already stored - skipped
+        await crud.insert_post_sentiment(POSTS, "t5_wien")
+        await crud.insert_comments(COMMENTS, "p0")
+        await crud.insert_comment_sentiment(COMMENTS, "p0")
+        return await scenario()
+    finally:
+        for engine in connection.created_engines():
+            await engine.dispose()
+
+
+def test_wal_mode_and_upsert(sqlite_db):
+    """ Test if connections run in WAL mode and a newer snapshot replaces the latest row through the SQLite upsert """
+    async def scenario():
+        async with connection.get_write_engine().connect() as conn:
+            journal_mode = (await conn.exec_driver_sql("PRAGMA journal_mode")).scalar()
+
+        changed = await crud.insert_post_sentiment([post(0, "Schnee in Wien", "endlich Winter", 0.6, 999)], "t5_wien")
+        page, _ = await crud.retrieve_posts_data("wien", 1, "score")
+        return journal_mode, changed, page
+
+    journal_mode, changed, page = asyncio.run(with_backend(scenario))
+
+    assert journal_mode == "wal"
+    assert [snapshot["post_id"] for snapshot in changed] == ["p0"]
+    assert page[0]["id"] == "p0" and page[0]["score"] == 999
+
+
+def test_latest_upsert_in_batches(sqlite_db, monkeypatch):
+    """ Test if snapshots beyond one upsert batch all reach the latest table """
+    monkeypatch.setattr(crud, "UPSERT_BATCH_SIZE", 2)
+
+    async def scenario():
+        page, _ = await crud.retrieve_posts_data("wien", 10, "score")
+        return page
+
+    page = asyncio.run(with_backend(scenario))
+
+    assert [post["id"] for post in page] == ["p0", "p1", "p2"]
+
+
+def test_timeseries_carries_unchanged_snapshots_forward(sqlite_db, monkeypatch):
+    """ Test if posts collected again unchanged still count in the later buckets (deduplicated history has no rows there) """
+    class Clock(datetime):
+        current = NOW
+
+        @classmethod
+        def now(cls, tz=None):
+            return cls.current
+
+    monkeypatch.setattr(crud, "datetime", Clock)
+
+    async def scenario():
+        Clock.current = NOW + timedelta(days=2)
+        changed = await crud.insert_post_sentiment(POSTS[1:] + [post(0, "Schnee in Wien", "endlich Winter", 0.1, 300)],
+                                                   "t5_wien")
+        series = await crud.retrieve_sentiment_timeseries("wien", "posts", "day", NOW - timedelta(days=1),
+                                                          NOW + timedelta(days=3))
+        return changed, series
+
+    changed, series = asyncio.run(with_backend(scenario))
+
+    day = NOW.replace(hour=0, minute=0, second=0)
+    assert [snapshot["post_id"] for snapshot in changed] == ["p0"]             # p1, p2 unchanged: no history rows
+    assert series["bucket"] == [day, day + timedelta(days=1), day + timedelta(days=2)]
+    assert series["count"] == [3, 3, 3]
+    assert series["mean"] == [0.0, 0.0, pytest.approx(-0.1667)]               # p0 changed on the last day only
+
+
+def test_read_paths(sqlite_db):
+    """ Test if the read API (pagination, search, comparison, time series, export) runs unchanged on SQLite """
+    async def scenario():
+        first, cursor = await crud.retrieve_posts_data("wien", 2, "score")
+        second, last = await crud.retrieve_posts_data("wien", 2, "score", cursor)
+        comments, _ = await crud.retrieve_comments_data("wien", 10, "compound")
+        found, summary, _ = await crud.search_posts("wien", "schnee -regen", 10)
+        comparison = await crud.compare_subreddits(["wien", "graz"])
+        series = await crud.retrieve_sentiment_timeseries("wien", "posts", "day", NOW - timedelta(days=1),
+                                                          NOW + timedelta(days=1))
+        exported = [row async for batch in crud.stream_export("t5_wien", "posts", 2) for row in batch]
+        return first, second, last, comments, found, summary, comparison, series, exported
+
+    first, second, last, comments, found, summary, comparison, series, exported = asyncio.run(with_backend(scenario))
+
+    assert [post["id"] for post in first + second] == ["p0", "p1", "p2"] and last is None
+    assert first[0]["title_sentiment"]["compound"] == 0.6 and isinstance(first[0]["created_utc"], datetime)
+    assert [comment["id"] for comment in comments] == ["c1", "c2"]
+    assert [post["id"] for post in found] == ["p0"] and summary["matches"] == 1
+    assert comparison == [{
+        "name": "wien", "post_count": 3, "comment_count": 2, "mean_compound": pytest.approx(0.0),
+        "median_compound": pytest.approx(-0.2), "positive_share": pytest.approx(1 / 3),
+        "negative_share": pytest.approx(2 / 3), "mean_controversiality": pytest.approx(0.1),
+        "mean_score": pytest.approx(200.0), "comment_mean_compound": pytest.approx(0.2),
+    }]
+    assert sum(series["count"]) == 3 and series["median"] == [-0.2] * len(series["median"])
+    assert len(exported) == 3 and exported[0]["post_type"] == "top"
@@ -0,0 +1,86 @@
+# ~/reddit_sentiment_tracker/tests/test_timeseries.py
+
+import pytest
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+from src.utils.timeseries import (resolve_time_range, rows_to_columns, to_naive_local, aggregate_buckets, carry_forward,
+                                  InvalidTimeRangeError)
+
+NOW = datetime(2025, 6, 1, 12, 0)
+
+
+def test_default_range():
+    """ Test if an open range ends now and starts default_days earlier """
+    start, end = resolve_time_range(None, None, "day", 7, 100, now=NOW)
+
+    assert end == NOW
+    assert start == NOW - timedelta(days=7)
+
+def test_start_only_range_ends_now():
+    start, end = resolve_time_range(datetime(2025, 5, 30), None, "hour", 7, 1000, now=NOW)
+    assert (start, end) == (datetime(2025, 5, 30), NOW)
+
+def test_aware_input_converted_to_naive_local():
+    """ Test if timezone aware input compares correctly with the naive local timestamps in the DB """
+    aware = datetime(2025, 6, 1, 10, 0, tzinfo=timezone.utc)
+    naive = to_naive_local(aware)
+
+    assert naive.tzinfo is None
+    assert naive == aware.astimezone().replace(tzinfo=None)
+
+def test_empty_range_rejected():
+    with pytest.raises(InvalidTimeRangeError):
+        resolve_time_range(NOW, NOW, "day", 7, 100)
+
+def test_too_many_buckets_rejected():
+    """ Test if ranges beyond max_buckets are rejected for the requested bucket size """
+    resolve_time_range(NOW - timedelta(days=90), NOW, "day", 7, 100)       # 90 day buckets: fine
+
+    with pytest.raises(InvalidTimeRangeError):
+        resolve_time_range(NOW - timedelta(days=90), NOW, "hour", 7, 100)  # 2160 hour buckets
+
+def test_rows_to_columns():
+    """ Test if rows become one array per field with rounded floats """
+    Row = namedtuple("Row", ["bucket", "count", "mean"])
+    rows = [Row(datetime(2025, 1, 1), 3, 0.123456), Row(datetime(2025, 1, 2), 1, -0.5)]
+
+    columns = rows_to_columns(rows, ["bucket", "count", "mean"])
+
+    assert columns == {
+        "bucket": [datetime(2025, 1, 1), datetime(2025, 1, 2)],
+        "count": [3, 1],
+        "mean": [0.1235, -0.5],
+    }
+
+def test_rows_to_columns_empty():
+    assert rows_to_columns([], ["bucket", "count"]) == {"bucket": [], "count": []}
+
+def test_aggregate_buckets_matches_percentile_cont():
+    """ Test if the in-Python aggregation (SQLite backend) interpolates percentiles like Postgres percentile_cont """
+    first, second = datetime(2025, 6, 1, 10), datetime(2025, 6, 1, 11)
+    samples = [(first, 0.1, 1), (first, 0.4, 3), (first, -0.2, 1), (first, 0.3, 1), (second, 0.5, 2)]
+
+    hour, single = aggregate_buckets(samples)
+
+    assert (hour.bucket, hour.count) == (first, 4)
+    assert hour.mean == pytest.approx(0.15)
+    assert hour.weighted_mean == pytest.approx((0.1 + 1.2 - 0.2 + 0.3) / 6)
+    assert (hour.p25, hour.median, hour.p75) == pytest.approx((0.025, 0.2, 0.325))
+    assert (single.count, single.median, single.p25) == (1, 0.5, 0.5)
+
+
+def test_carry_forward_until_next_snapshot_or_last_seen():
+    """ Test if snapshots stand for every bucket until the next one (the newest until last_seen_at), once per bucket """
+    day = datetime(2025, 6, 1)
+    seen = day + timedelta(hours=5, minutes=30)
+    snapshots = [
+        ("p1", day + timedelta(minutes=10), 0.5, 1, seen),
+        ("p1", day + timedelta(minutes=40), 0.6, 2, seen),          # same hour: replaces 0.5
+        ("p1", day + timedelta(hours=3), None, 1, seen),            # failed analysis: no sample from hour 3 on
+        ("p2", day - timedelta(hours=2), -0.2, 1, day + timedelta(hours=1)),
+    ]
+
+    samples = carry_forward(snapshots, "hour", day + timedelta(minutes=20), day + timedelta(hours=2))
+
+    assert samples == [(day, 0.6, 2), (day, -0.2, 1), (day + timedelta(hours=1), 0.6, 2),
+                       (day + timedelta(hours=1), -0.2, 1)]